@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Extraction Backends
+Registry of PDF text extractors that the pipeline can select by name.
+Every backend yields (page_number, text) pairs in page order.
+"""
+
+DEFAULT_BACKEND = "pymupdf"
+
+_BACKENDS = {}
+
+
+def register_backend(name):
+    """
+    Register an extraction backend under a name.
+    The decorated function is called as fn(pdf_path, workers=1, cache=None)
+    and must yield (page_number, text) for each page, page_number being 1-based.
+
+    Args:
+        name (str): Name used to select the backend
+
+    Returns:
+        callable: Decorator that registers and returns the function
+    """
+    def decorator(fn):
+        _BACKENDS[name] = fn
+        return fn
+    return decorator
+
+
+def get_backend(name):
+    """
+    Look up a registered extraction backend.
+
+    Args:
+        name (str): Backend name
+
+    Returns:
+        callable: The backend's page iterator function
+
+    Raises:
+        ValueError: If no backend is registered under that name
+    """
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown extraction backend '{name}'. "
+                         f"Available: {', '.join(available_backends())}")
+
+
+def available_backends():
+    """
+    List registered backend names.
+
+    Returns:
+        list: Sorted backend names
+    """
+    return sorted(_BACKENDS)
+
+
+@register_backend("pymupdf")
+def _pymupdf_pages(pdf_path, workers=1, cache=None):
+    """Raw PyMuPDF extraction from extract_pdf.py."""
+    from extract_pdf import iter_pdf_pages
+    return iter_pdf_pages(pdf_path, workers, cache)
+
+
+@register_backend("langchain")
+def _langchain_pages(pdf_path, workers=1, cache=None):
+    """LangChain PyMuPDFLoader extraction from extract_pdf_langchain.py (serial only)."""
+    # Imported here so pipelines using other backends don't pay for LangChain
+    from extract_pdf_langchain import iter_pdf_documents
+    for page_number, doc in enumerate(iter_pdf_documents(pdf_path, cache), start=1):
+        yield page_number, doc.page_content
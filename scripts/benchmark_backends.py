@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Extraction Backend Benchmark
+Runs every registered extraction backend over a corpus of PDFs and reports
+pages/sec, peak RSS and whether the backends produce the same text.
+"""
+
+import sys
+import os
+import time
+import hashlib
+import queue
+import resource
+import tempfile
+import multiprocessing
+
+# Add parent directory to path to import from scripts
+sys.path.insert(0, os.path.dirname(__file__))
+
+import fitz  # PyMuPDF
+
+from backends import DEFAULT_BACKEND, available_backends
+from cli_options import pop_option
+
+# Seconds a backend may take over the whole corpus before it is reported as failed
+DEFAULT_TIMEOUT = 600
+
+
+def generate_corpus(output_dir, num_docs=10, pages_per_doc=50, lines_per_page=40):
+    """
+    Generate synthetic text PDFs for benchmarking.
+
+    Args:
+        output_dir (str): Directory to write the PDFs to
+        num_docs (int): Number of PDFs to generate (default: 10)
+        pages_per_doc (int): Pages per PDF (default: 50)
+        lines_per_page (int): Text lines per page (default: 40)
+
+    Returns:
+        list: Paths of the generated PDFs
+    """
+    paths = []
+    for doc_num in range(num_docs):
+        doc = fitz.open()
+        for page_num in range(pages_per_doc):
+            page = doc.new_page()
+            lines = [f"Document {doc_num} page {page_num + 1} line {line_num}: "
+                     f"the quick brown fox jumps over the lazy dog {doc_num * line_num}"
+                     for line_num in range(lines_per_page)]
+            page.insert_text((40, 40), "\n".join(lines), fontsize=9)
+        path = os.path.join(output_dir, f"bench_{doc_num:03d}.pdf")
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+def _run_backend(backend, pdf_paths, result_queue):
+    """
+    Extract a corpus with one backend in a fresh process and report results.
+    Running each backend in its own process keeps peak RSS measurements
+    (including the backend's imports) independent of each other.
+    """
+    from backends import get_backend
+
+    iter_pages = get_backend(backend)
+
+    # Warm up so one-time imports are not counted as extraction time
+    pages = iter_pages(pdf_paths[0])
+    next(pages, None)
+    pages.close()
+
+    started = time.perf_counter()
+    total_pages = 0
+    digests = []
+    output_chars = 0
+    for pdf_path in pdf_paths:
+        digest = hashlib.sha1()
+        for _, text in iter_pages(pdf_path):
+            total_pages += 1
+            output_chars += len(text)
+            digest.update(text.encode('utf-8'))
+        digests.append(digest.hexdigest())
+    elapsed = time.perf_counter() - started
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result_queue.put({
+        'backend': backend,
+        'pages': total_pages,
+        'seconds': elapsed,
+        'peak_rss_mb': peak_rss_mb,
+        'output_chars': output_chars,
+        'digests': digests,
+    })
+
+
+def _wait_for_result(process, result_queue, timeout):
+    """
+    Wait for a backend process's result.
+
+    Returns:
+        tuple: (result dict, None) or (None, reason the backend failed)
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return result_queue.get(timeout=1), None
+        except queue.Empty:
+            pass
+        if not process.is_alive():
+            # The result may have been sent just before the process exited
+            try:
+                return result_queue.get(timeout=1), None
+            except queue.Empty:
+                return None, f"process exited with code {process.exitcode}"
+        if time.monotonic() > deadline:
+            process.terminate()
+            return None, f"timed out after {timeout:g} seconds"
+
+
+def benchmark_backends(pdf_paths, backends=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Benchmark extraction backends over a corpus.
+
+    Args:
+        pdf_paths (list): PDF files to extract
+        backends (list, optional): Backend names to run. If None, runs all registered
+            with the default backend first, which is the parity reference.
+        timeout (float): Seconds each backend may take before it is reported
+            as failed (default: 600)
+
+    Returns:
+        list: One result dict per backend with pages, seconds, pages_per_sec,
+            peak_rss_mb, output_chars and matching_docs (documents whose text
+            is identical to the first successful backend's output). A backend
+            whose process crashed, was killed or timed out has only backend
+            and error.
+    """
+    backends = backends or sorted(available_backends(), key=lambda name: name != DEFAULT_BACKEND)
+    context = multiprocessing.get_context('spawn')
+
+    results = []
+    for backend in backends:
+        result_queue = context.Queue()
+        process = context.Process(target=_run_backend, args=(backend, pdf_paths, result_queue))
+        process.start()
+        result, error = _wait_for_result(process, result_queue, timeout)
+        process.join()
+        if error:
+            results.append({'backend': backend, 'error': error})
+            continue
+        result['pages_per_sec'] = result['pages'] / result['seconds'] if result['seconds'] else 0.0
+        result['error'] = None
+        results.append(result)
+
+    # Output parity against the first backend that finished
+    finished = [result for result in results if result['error'] is None]
+    if finished:
+        reference = finished[0]['digests']
+        for result in finished:
+            result['matching_docs'] = sum(1 for a, b in zip(reference, result['digests']) if a == b)
+    return results
+
+
+def main():
+    """Main function to handle command-line usage."""
+    args = sys.argv[1:]
+    try:
+        num_docs = pop_option(args, "--docs", 10, int)
+        pages_per_doc = pop_option(args, "--pages", 50, int)
+        corpus_dir = pop_option(args, "--corpus")
+        backends = pop_option(args, "--backends", None, lambda value: value.split(','))
+        timeout = pop_option(args, "--timeout", DEFAULT_TIMEOUT, float)
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Usage: python benchmark_backends.py [--docs N] [--pages N] [--corpus DIR] "
+              "[--backends a,b] [--timeout SECONDS]")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if corpus_dir:
+            pdf_paths = sorted(os.path.join(corpus_dir, name) for name in os.listdir(corpus_dir)
+                               if name.lower().endswith('.pdf'))
+            print(f"Corpus: {len(pdf_paths)} PDFs from {corpus_dir}\n")
+        else:
+            pdf_paths = generate_corpus(tmp_dir, num_docs, pages_per_doc)
+            print(f"Corpus: {num_docs} generated PDFs x {pages_per_doc} pages\n")
+
+        results = benchmark_backends(pdf_paths, backends, timeout)
+
+    print(f"{'backend':<12} {'pages':>7} {'seconds':>9} {'pages/sec':>10} "
+          f"{'peak RSS MB':>12} {'chars':>11} {'parity':>9}")
+    for result in results:
+        if result['error']:
+            print(f"{result['backend']:<12} FAILED: {result['error']}")
+            continue
+        print(f"{result['backend']:<12} {result['pages']:>7} {result['seconds']:>9.2f} "
+              f"{result['pages_per_sec']:>10.1f} {result['peak_rss_mb']:>12.1f} "
+              f"{result['output_chars']:>11} {result['matching_docs']:>4}/{len(pdf_paths):<4}")
+
+
+if __name__ == "__main__":
+    main()
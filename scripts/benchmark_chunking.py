@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Chunking Benchmark
+Compares the throughput of the native chunker and the LangChain splitter on a
+large generated text, and measures what sizing chunks in tokens instead of
+characters costs. Their parity is tested in tests/test_chunk_parity.py.
+"""
+
+import sys
+import os
+import time
+import random
+
+# Add parent directory to path to import from scripts
+sys.path.insert(0, os.path.dirname(__file__))
+
+from chunk import Chunker, NativeChunker
+from cli_options import pop_option
+from token_length import get_token_counter, get_length_function
+
+# Building blocks for generated text, including the edge cases that decide
+# chunk boundaries: runs of separators, unicode whitespace and long unbroken words
+_WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "a", "consectetur", "\t", " ",
+          "\u3000", "\r\n", "  ", "x" * 40]
+
+
+def generate_text(rng, num_tokens, long_word_rate=0.01):
+    """
+    Generate random text with words, lines and paragraphs.
+
+    Args:
+        rng (random.Random): Random number generator
+        num_tokens (int): Number of words and separators to emit
+        long_word_rate (float): Probability of emitting a word with no break points
+
+    Returns:
+        str: Generated text
+    """
+    parts = []
+    for _ in range(num_tokens):
+        roll = rng.random()
+        if roll < long_word_rate:
+            parts.append("y" * rng.randint(1, 300))
+        elif roll < 0.70:
+            parts.append(rng.choice(_WORDS))
+        elif roll < 0.85:
+            parts.append(" ")
+        elif roll < 0.95:
+            parts.append("\n")
+        else:
+            parts.append("\n" * rng.randint(2, 4))
+        if rng.random() < 0.7:
+            parts.append(" ")
+    return "".join(parts)
+
+
+def benchmark_throughput(text, chunk_size=500, chunk_overlap=100, repeats=3):
+    """
+    Time both chunkers on the same text.
+
+    Args:
+        text (str): Text to chunk
+        chunk_size (int): Maximum size of each chunk (default: 500)
+        chunk_overlap (int): Overlap between chunks (default: 100)
+        repeats (int): Runs per chunker; the fastest is reported (default: 3)
+
+    Returns:
+        list: One result dict per chunker with name, seconds, mb_per_sec and chunks
+    """
+    size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    results = []
+    for name, chunker in [("langchain", Chunker(chunk_size, chunk_overlap)),
+                          ("native", NativeChunker(chunk_size, chunk_overlap))]:
+        best = None
+        for _ in range(repeats):
+            started = time.perf_counter()
+            chunks = chunker.split(text)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results.append({
+            'name': name,
+            'seconds': best,
+            'mb_per_sec': size_mb / best if best else 0.0,
+            'chunks': len(chunks),
+        })
+    return results
+
+
+def benchmark_sizing(text, tokenizer="words", chunk_size=500, chunk_overlap=100,
+                     chunk_tokens=100, overlap_tokens=20):
+    """
+    Compare chunking with character sizing against token sizing, with and
+    without the memoized length function.
+    
+    Args:
+        text (str): Text to chunk
+        tokenizer (str): Registered tokenizer name (default: "words")
+        chunk_size (int): Chunk size for character sizing (default: 500)
+        chunk_overlap (int): Overlap for character sizing (default: 100)
+        chunk_tokens (int): Chunk size for token sizing (default: 100)
+        overlap_tokens (int): Overlap for token sizing (default: 20)
+    
+    Returns:
+        list: One result dict per mode with name, seconds, chunks, max_tokens,
+            mean_tokens and hit_ratio (memoized mode only)
+    """
+    count_tokens = get_token_counter(tokenizer)
+    memoized = get_length_function(tokenizer)
+    memoized.cache_clear()
+    
+    modes = [
+        ("chars", Chunker(chunk_size, chunk_overlap)),
+        (f"{tokenizer}", Chunker(chunk_tokens, overlap_tokens, length_function=count_tokens)),
+        (f"{tokenizer}+lru", Chunker(chunk_tokens, overlap_tokens, tokenizer=tokenizer)),
+    ]
+    results = []
+    for name, chunker in modes:
+        started = time.perf_counter()
+        chunks = chunker.split(text)
+        elapsed = time.perf_counter() - started
+        
+        tokens = [count_tokens(chunk) for chunk in chunks]
+        result = {
+            'name': name,
+            'seconds': elapsed,
+            'chunks': len(chunks),
+            'max_tokens': max(tokens, default=0),
+            'mean_tokens': sum(tokens) / len(tokens) if tokens else 0.0,
+            'hit_ratio': None,
+        }
+        if chunker.length_function is memoized:
+            info = memoized.cache_info()
+            result['hit_ratio'] = info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0
+        results.append(result)
+    return results
+
+
+def measure_chunk_memory(text, chunk_size=500, chunk_overlap=100):
+    """
+    Compare memory held by chunks as strings versus as offsets.
+    
+    Args:
+        text (str): Text to chunk
+        chunk_size (int): Maximum size of each chunk (default: 500)
+        chunk_overlap (int): Overlap between chunks (default: 100)
+    
+    Returns:
+        dict: chunks, strings_bytes (list plus chunk strings) and offsets_bytes
+    """
+    spans = NativeChunker(chunk_size, chunk_overlap).split_offsets(text)
+    chunks = list(spans)
+    return {
+        'chunks': len(chunks),
+        'strings_bytes': sys.getsizeof(chunks) + sum(sys.getsizeof(chunk) for chunk in chunks),
+        'offsets_bytes': sys.getsizeof(spans.offsets),
+    }
+
+
+def main():
+    """Main function to handle command-line usage."""
+    args = sys.argv[1:]
+    try:
+        size_mb = pop_option(args, "--size-mb", 20, float)
+        text_path = pop_option(args, "--text")
+        tokenizer = pop_option(args, "--tokenizer", "words")
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Usage: python benchmark_chunking.py [--size-mb MB] [--text FILE] [--tokenizer NAME]")
+        sys.exit(1)
+
+    if text_path:
+        with open(text_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    else:
+        # Mostly prose with occasional long words; ~6 characters per token
+        text = generate_text(random.Random(1), int(size_mb * 1024 * 1024 / 6), long_word_rate=0.0005)
+    print(f"Throughput on {len(text.encode('utf-8')) / (1024 * 1024):.1f} MB of text "
+          f"(chunk_size=500, chunk_overlap=100):")
+
+    results = benchmark_throughput(text)
+    baseline = results[0]['seconds']
+    for result in results:
+        speedup = baseline / result['seconds'] if result['seconds'] else 0.0
+        print(f"  {result['name']:<10} {result['seconds']:>8.2f} s  {result['mb_per_sec']:>8.1f} MB/s  "
+              f"{result['chunks']:>8} chunks  {speedup:>5.2f}x")
+    
+    memory = measure_chunk_memory(text)
+    print(f"\nChunk memory for {memory['chunks']} chunks: "
+          f"{memory['strings_bytes'] / (1024 * 1024):.1f} MB as strings, "
+          f"{memory['offsets_bytes'] / (1024 * 1024):.2f} MB as offsets "
+          f"({memory['offsets_bytes'] / max(memory['chunks'], 1):.1f} bytes/chunk)")
+    
+    print(f"\nCharacter vs token sizing (500/100 characters, 100/20 {tokenizer} tokens):")
+    for result in benchmark_sizing(text, tokenizer):
+        hit_ratio = f"{result['hit_ratio']:.0%} cache hits" if result['hit_ratio'] is not None else ""
+        print(f"  {result['name']:<14} {result['seconds']:>8.2f} s  {result['chunks']:>8} chunks  "
+              f"{result['mean_tokens']:>6.1f} mean / {result['max_tokens']:>4} max tokens  {hit_ratio}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Vector Search Benchmark
+Measures recall@k, query latency and memory of the approximate indexes
+against the exact VectorIndex, on chunk embeddings or on generated clustered
+vectors.
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path to import from scripts
+sys.path.insert(0, os.path.dirname(__file__))
+
+from cli_options import pop_option
+from vector_index import VectorIndex, normalize_rows
+from hnsw_index import HNSWIndex, DEFAULT_M, DEFAULT_EF_CONSTRUCTION
+from ivfpq_index import IVFPQIndex, DEFAULT_NLIST, DEFAULT_M as DEFAULT_PQ_M
+
+# Search indexes the benchmark can run besides the exact baseline
+INDEXES = ("hnsw", "ivfpq")
+
+
+def generate_vectors(rng, count, dim=128, clusters=100, spread=1.5):
+    """
+    Generate normalized vectors grouped around random topics, roughly how
+    chunk embeddings of a document library are distributed.
+
+    Args:
+        rng (numpy.random.Generator): Random number generator
+        count (int): Number of vectors
+        dim (int): Vector dimensions (default: 128)
+        clusters (int): Number of topic centres (default: 100)
+        spread (float): Noise around each centre relative to its length (default: 1.5)
+
+    Returns:
+        numpy.ndarray: (count, dim) float32 unit vectors
+    """
+    centres = normalize_rows(rng.standard_normal((clusters, dim)))
+    vectors = centres[rng.integers(0, clusters, count)]
+    vectors = vectors + rng.standard_normal((count, dim)).astype(np.float32) * spread / np.sqrt(dim)
+    return normalize_rows(vectors)
+
+
+def recall_at_k(found_ids, true_ids):
+    """
+    Fraction of the true top-k ids that were found, averaged over queries.
+
+    Args:
+        found_ids (numpy.ndarray): (queries, k) ids returned by an index
+        true_ids (numpy.ndarray): (queries, k) ids from the exact index
+
+    Returns:
+        float: Recall between 0 and 1
+    """
+    hits = sum(len(np.intersect1d(found, true)) for found, true in zip(found_ids, true_ids))
+    return hits / true_ids.size if true_ids.size else 1.0
+
+
+def time_queries(search, queries, k):
+    """
+    Run queries one at a time, as interactive question answering does.
+
+    Args:
+        search (callable): search(query, k) returning (scores, ids)
+        queries (numpy.ndarray): (queries, dim) query vectors
+        k (int): Results per query
+
+    Returns:
+        tuple: (ids as a (queries, k) array, padded with -1 where a search
+            returned fewer than k results, mean milliseconds per query)
+    """
+    ids = np.full((len(queries), k), -1, dtype=np.int64)
+    started = time.perf_counter()
+    for i, query in enumerate(queries):
+        found = search(query, k)[1]
+        ids[i, :len(found)] = found
+    elapsed = time.perf_counter() - started
+    return ids, elapsed * 1000 / max(len(queries), 1)
+
+
+def benchmark_exact(vectors, queries, k=10):
+    """
+    Run the exact baseline.
+
+    Args:
+        vectors (numpy.ndarray): (n, dim) corpus vectors
+        queries (numpy.ndarray): (queries, dim) query vectors
+        k (int): Results per query (default: 10)
+
+    Returns:
+        dict: true_ids ((queries, k) exact results), ms and nbytes
+    """
+    exact = VectorIndex(vectors.shape[1])
+    exact.add(vectors)
+    true_ids, ms = time_queries(exact.search, queries, k)
+    return {'true_ids': true_ids, 'ms': ms, 'nbytes': exact.vectors.nbytes}
+
+
+def benchmark_hnsw(vectors, queries, true_ids, k=10, M=DEFAULT_M,
+                   ef_construction=DEFAULT_EF_CONSTRUCTION, ef_searches=(16, 32, 64, 128, 256)):
+    """
+    Measure HNSW recall and latency.
+
+    Args:
+        vectors (numpy.ndarray): (n, dim) corpus vectors
+        queries (numpy.ndarray): (queries, dim) query vectors
+        true_ids (numpy.ndarray): (queries, k) exact results
+        k (int): Results per query (default: 10)
+        M (int): HNSW links per node (default: 16)
+        ef_construction (int): HNSW build width (default: 100)
+        ef_searches (iterable): Query widths to measure
+
+    Returns:
+        dict: build_seconds and results, one dict per ef_search with name,
+            recall and ms
+    """
+    started = time.perf_counter()
+    hnsw = HNSWIndex(vectors.shape[1], M, ef_construction)
+    hnsw.add(vectors)
+    build_seconds = time.perf_counter() - started
+
+    results = []
+    for ef_search in ef_searches:
+        found_ids, ms = time_queries(lambda query, k: hnsw.search(query, k, ef_search), queries, k)
+        results.append({'name': f"hnsw ef={ef_search}", 'recall': recall_at_k(found_ids, true_ids),
+                        'ms': ms})
+    return {'build_seconds': build_seconds, 'results': results}
+
+
+def benchmark_ivfpq(vectors, queries, true_ids, k=10, nlist=DEFAULT_NLIST, m=DEFAULT_PQ_M,
+                    nprobes=(1, 4, 16), rerank=100, train_size=20000):
+    """
+    Measure IVF-PQ recall, latency and memory, with and without exact
+    re-ranking from the vectors memory-mapped from disk.
+
+    Args:
+        vectors (numpy.ndarray): (n, dim) corpus vectors
+        queries (numpy.ndarray): (queries, dim) query vectors
+        true_ids (numpy.ndarray): (queries, k) exact results
+        k (int): Results per query (default: 10)
+        nlist (int): Coarse clusters (default: 256)
+        m (int): Bytes per PQ code (default: 16)
+        nprobes (iterable): Clusters scanned per query to measure
+        rerank (int): ADC candidates re-scored exactly (default: 100)
+        train_size (int): Vectors sampled for training (default: 20000)
+
+    Returns:
+        dict: build_seconds, nbytes and results, one dict per nprobe and
+            re-rank setting with name, recall and ms
+    """
+    started = time.perf_counter()
+    ivfpq = IVFPQIndex(vectors.shape[1], nlist, m)
+    sample = np.random.default_rng(0).permutation(len(vectors))[:train_size]
+    ivfpq.train(vectors[sample])
+    ivfpq.add(vectors)
+    build_seconds = time.perf_counter() - started
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vectors_path = os.path.join(tmp_dir, "vectors.npy")
+        np.save(vectors_path, vectors)
+        ivfpq.attach_vectors(vectors_path)
+        for nprobe in nprobes:
+            for shortlist in (None, rerank):
+                found_ids, ms = time_queries(
+                    lambda query, k: ivfpq.search(query, k, nprobe, shortlist), queries, k)
+                name = f"ivfpq nprobe={nprobe}" + (f" +rerank {shortlist}" if shortlist else "")
+                results.append({'name': name, 'recall': recall_at_k(found_ids, true_ids), 'ms': ms})
+        # Release the memory map before the directory is removed
+        ivfpq.attach_vectors(vectors)
+    return {'build_seconds': build_seconds, 'nbytes': ivfpq.nbytes, 'results': results}
+
+
+def main():
+    """Main function to handle command-line usage."""
+    args = sys.argv[1:]
+    try:
+        vectors_path = pop_option(args, "--vectors")
+        size = pop_option(args, "--size", 20000, int)
+        dim = pop_option(args, "--dim", 128, int)
+        num_queries = pop_option(args, "--queries", 200, int)
+        k = pop_option(args, "--k", 10, int)
+        M = pop_option(args, "--M", DEFAULT_M, int)
+        ef_construction = pop_option(args, "--ef-construction", DEFAULT_EF_CONSTRUCTION, int)
+        ef_searches = pop_option(args, "--ef-search", "16,32,64,128,256")
+        ef_searches = [int(ef) for ef in ef_searches.split(",")]
+        nlist = pop_option(args, "--nlist", DEFAULT_NLIST, int)
+        pq_m = pop_option(args, "--pq-m", DEFAULT_PQ_M, int)
+        nprobes = [int(nprobe) for nprobe in pop_option(args, "--nprobe", "1,4,16").split(",")]
+        rerank = pop_option(args, "--rerank", 100, int)
+        indexes = pop_option(args, "--index", ",".join(INDEXES)).split(",")
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Usage: python benchmark_search.py [--vectors FILE.npy] [--size N] [--dim D] [--queries N]")
+        print("       [--k N] [--index hnsw,ivfpq] [--M N] [--ef-construction N] [--ef-search 16,32,64]")
+        print("       [--nlist N] [--pq-m N] [--nprobe 1,4,16] [--rerank N]")
+        sys.exit(1)
+    
+    unknown = [name for name in indexes if name not in INDEXES]
+    if unknown:
+        print(f"Error: Unknown index '{unknown[0]}'. Available: {', '.join(INDEXES)}")
+        sys.exit(1)
+
+    rng = np.random.default_rng(0)
+    if vectors_path:
+        # Hold out some chunk embeddings as queries
+        vectors = normalize_rows(np.load(vectors_path))
+        order = rng.permutation(len(vectors))
+        queries = vectors[order[:num_queries]]
+        vectors = vectors[order[num_queries:]]
+    else:
+        vectors = generate_vectors(rng, size + num_queries, dim)
+        queries, vectors = vectors[:num_queries], vectors[num_queries:]
+
+    print(f"Corpus: {len(vectors)} vectors x {vectors.shape[1]} dimensions, "
+          f"{len(queries)} queries, k={k}")
+    exact = benchmark_exact(vectors, queries, k)
+    rows = [{'name': "exact", 'recall': 1.0, 'ms': exact['ms']}]
+    
+    if "hnsw" in indexes:
+        report = benchmark_hnsw(vectors, queries, exact['true_ids'], k, M, ef_construction, ef_searches)
+        print(f"HNSW build (M={M}, ef_construction={ef_construction}): {report['build_seconds']:.1f} s "
+              f"({len(vectors) / report['build_seconds']:.0f} vectors/sec)")
+        rows.extend(report['results'])
+    
+    if "ivfpq" in indexes:
+        report = benchmark_ivfpq(vectors, queries, exact['true_ids'], k, nlist, pq_m, nprobes, rerank)
+        print(f"IVF-PQ build (nlist={nlist}, m={pq_m}): {report['build_seconds']:.1f} s, "
+              f"{report['nbytes'] / (1024 * 1024):.1f} MB vs {exact['nbytes'] / (1024 * 1024):.1f} MB "
+              f"of float32 vectors ({exact['nbytes'] / report['nbytes']:.1f}x smaller)")
+        rows.extend(report['results'])
+    
+    print(f"\n  {'index':<30} {'recall@' + str(k):>10} {'ms/query':>10} {'speedup':>8}")
+    for row in rows:
+        speedup = exact['ms'] / row['ms'] if row['ms'] else 0.0
+        print(f"  {row['name']:<30} {row['recall']:>10.3f} {row['ms']:>10.3f} {speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,709 @@ Splits text content into chunks with overlap.
 import sys
 import os
 import time
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from functools import lru_cache
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from cli_options import pop_option
+from token_length import get_length_function, available_tokenizers
+from chunk_records import ChunkRecord
+from chunk_output import OUTPUT_FORMATS, TextChunkWriter, write_chunk_output
 
-def chunk_text_content(text, chunk_size=500, chunk_overlap=100):
+
+# Separators tried in order by the recursive splitter
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ", "")
+
+# Characters read per block when streaming a text file
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=32)
+def _cached_text_splitter(chunk_size, chunk_overlap, separators, length_function):
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=length_function,
+        separators=list(separators)
+    )
+
+
+def get_text_splitter(chunk_size=500, chunk_overlap=100, separators=DEFAULT_SEPARATORS,
+                      length_function=len):
+    """
+    Get a RecursiveCharacterTextSplitter for the given settings.
+    Splitters are cached by (chunk_size, chunk_overlap, separators, length_function)
+    so repeated calls with the same settings reuse one instance.
+    
+    Args:
+        chunk_size (int): Maximum size of each chunk (default: 500 characters)
+        chunk_overlap (int): Overlap between chunks (default: 100 characters)
+        separators (sequence): Separators tried in order (default: DEFAULT_SEPARATORS)
+        length_function (callable): Function measuring chunk size (default: len)
+    
+    Returns:
+        RecursiveCharacterTextSplitter: Shared splitter instance
+    """
+    return _cached_text_splitter(chunk_size, chunk_overlap, tuple(separators), length_function)
+
+
+class Chunker:
+    """
+    Reusable text chunker for callers that split many documents with the
+    same settings, e.g. the pipeline's batch mode.
+    """
+    
+    def __init__(self, chunk_size=500, chunk_overlap=100, separators=DEFAULT_SEPARATORS,
+                 length_function=len, tokenizer=None):
+        """
+        Configure the chunker.
+        
+        Args:
+            chunk_size (int): Maximum size of each chunk (default: 500 characters)
+            chunk_overlap (int): Overlap between chunks (default: 100 characters)
+            separators (sequence): Separators tried in order (default: DEFAULT_SEPARATORS)
+            length_function (callable): Function measuring chunk size (default: len)
+            tokenizer (str, optional): Measure sizes in tokens of this registered
+                tokenizer with its memoized length function, instead of length_function
+        
+        Raises:
+            ValueError: If tokenizer is unknown
+        """
+        if tokenizer:
+            length_function = get_length_function(tokenizer)
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+        self.tokenizer = tokenizer
+        self.length_function = length_function
+        self.splitter = get_text_splitter(chunk_size, chunk_overlap, self.separators,
+                                          length_function)
+    
+    def split(self, text):
+        """
+        Chunk text content into smaller pieces with overlap.
+        
+        Args:
+            text (str): The text content to chunk
+        
+        Returns:
+            list: List of text chunks (strings)
+        
+        Raises:
+            Exception: For chunking errors
+        """
+        try:
+            return self.splitter.split_text(text)
+        except Exception as e:
+            raise Exception(f"Error chunking text: {e}")
+    
+    def split_offsets(self, text):
+        """
+        Chunk text content into a compact ChunkSpans sequence.
+        With length_function=len the offsets come from NativeChunker, which
+        produces the same chunks with exact positions. Otherwise each chunk
+        is searched for after the previous chunk's start, which can pick an
+        earlier copy in repetitive text.
+        
+        Args:
+            text (str): The text content to chunk
+        
+        Returns:
+            ChunkSpans: Chunks as offsets into text
+        
+        Raises:
+            Exception: For chunking errors
+        """
+        if self.length_function is len:
+            return NativeChunker(self.chunk_size, self.chunk_overlap,
+                                 self.separators).split_offsets(text)
+        
+        # Overlap is not measured in characters here, so the only safe lower
+        # bound for the next chunk is just past the previous chunk's start
+        offsets = array(ChunkSpans.typecode_for(len(text)))
+        search_from = 0
+        for chunk in self.split(text):
+            start = text.find(chunk, search_from)
+            offsets.append(start)
+            offsets.append(start + len(chunk))
+            search_from = start + 1
+        return ChunkSpans(text, offsets)
+
+
+class NativeChunker:
+    """
+    Built-in linear-time chunker producing the same chunks as Chunker
+    (RecursiveCharacterTextSplitter with keep_separator, strip_whitespace and
+    length_function=len), without LangChain's substring copies.
+    
+    Splits are tracked as (start, end) offsets into the original text. Because
+    separators are kept at the start of each split, merged pieces are always
+    contiguous, so a chunk is a single slice of the text and only final chunks
+    are materialized. Each separator level is located with one regex scan over
+    the spans that need it, so every character is visited at most once per level.
+    """
+    
+    def __init__(self, chunk_size=500, chunk_overlap=100, separators=DEFAULT_SEPARATORS):
+        """
+        Configure the chunker.
+        
+        Args:
+            chunk_size (int): Maximum size of each chunk (default: 500 characters)
+            chunk_overlap (int): Overlap between chunks (default: 100 characters)
+            separators (sequence): Separators tried in order (default: DEFAULT_SEPARATORS)
+        
+        Raises:
+            ValueError: If chunk_size or chunk_overlap are out of range
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+        if chunk_overlap < 0:
+            raise ValueError(f"chunk_overlap must be >= 0, got {chunk_overlap}")
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"Got a larger chunk overlap ({chunk_overlap}) than chunk size "
+                             f"({chunk_size}), should be smaller.")
+        
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+        self.tokenizer = None
+        self.length_function = len
+        self._patterns = [re.compile(re.escape(separator)) if separator else None
+                          for separator in self.separators]
+    
+    def split(self, text):
+        """
+        Chunk text content into smaller pieces with overlap.
+        
+        Args:
+            text (str): The text content to chunk
+        
+        Returns:
+            list: List of text chunks (strings)
+        """
+        return list(self.split_offsets(text))
+    
+    def split_spans(self, text):
+        """
+        Chunk text content, returning offsets instead of strings.
+        
+        Args:
+            text (str): The text content to chunk
+        
+        Returns:
+            list: List of (start, end) offsets so that text[start:end] is each chunk
+        """
+        return list(self.split_offsets(text).spans())
+    
+    def split_offsets(self, text):
+        """
+        Chunk text content into a compact ChunkSpans sequence.
+        Offsets are stored in a flat array instead of one string per chunk,
+        so chunks are only copied out of the text when they are accessed.
+        
+        Args:
+            text (str): The text content to chunk
+        
+        Returns:
+            ChunkSpans: Chunks as offsets into text
+        """
+        offsets = array(ChunkSpans.typecode_for(len(text)))
+        self._split_span(text, 0, len(text), 0, offsets)
+        return ChunkSpans(text, offsets)
+    
+    def _split_span(self, text, start, end, level, spans):
+        """
+        Recursively split text[start:end] using separators from level onwards,
+        appending each chunk's start and end offsets to spans.
+        """
+        separators = self.separators
+        
+        # Pick the first separator present in the span
+        pattern = self._patterns[-1]
+        next_level = len(separators)
+        for i in range(level, len(separators)):
+            if not separators[i]:
+                pattern = None
+                break
+            if self._patterns[i].search(text, start, end):
+                pattern = self._patterns[i]
+                next_level = i + 1
+                break
+        
+        # Cut before every separator occurrence, keeping it at the start of the
+        # following split; empty splits are dropped
+        if pattern is None:
+            bounds = range(start, end + 1)
+        else:
+            bounds = [start]
+            bounds.extend(match.start() for match in pattern.finditer(text, start, end))
+            bounds.append(end)
+        
+        # Runs of consecutive splits shorter than chunk_size are merged; longer
+        # splits are split again with the next separator
+        run = None
+        prev = start
+        for bound in bounds:
+            if bound <= prev:
+                continue
+            if bound - prev < self.chunk_size:
+                if run is None:
+                    run = [prev]
+                run.append(bound)
+            else:
+                if run is not None:
+                    self._merge_run(text, run, spans)
+                    run = None
+                if next_level >= len(separators):
+                    spans.append(prev)
+                    spans.append(bound)
+                else:
+                    self._split_span(text, prev, bound, next_level, spans)
+            prev = bound
+        
+        if run is not None:
+            self._merge_run(text, run, spans)
+    
+    def _merge_run(self, text, bounds, spans):
+        """
+        Merge a run of contiguous splits into chunks.
+        Mirrors TextSplitter._merge_splits with an empty separator. Since the
+        splits are contiguous, the size of a window of splits is just the
+        distance between its outer boundaries, so window edges are found by
+        binary search over the boundaries instead of split by split.
+        
+        Args:
+            text (str): The full text
+            bounds (list): Increasing split boundaries, split i is bounds[i]:bounds[i + 1]
+            spans (array): Output array the chunk offsets are appended to
+        """
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        last = len(bounds) - 1
+        window_start = 0
+        i = 1
+        while True:
+            # Next split that no longer fits in the current window
+            i = bisect_right(bounds, bounds[window_start] + chunk_size, i)
+            if i > last:
+                break
+            
+            # Emit the window, then drop splits from its front until it is
+            # within the overlap and leaves room for the new split
+            self._append_stripped(text, spans, bounds[window_start], bounds[i - 1])
+            window_start = max(
+                bisect_left(bounds, bounds[i - 1] - chunk_overlap, window_start),
+                min(bisect_left(bounds, bounds[i] - chunk_size, window_start), i - 1),
+            )
+            i += 1
+        
+        if window_start < last:
+            self._append_stripped(text, spans, bounds[window_start], bounds[last])
+    
+    @staticmethod
+    def _append_stripped(text, spans, start, end):
+        """Append the offsets of text[start:end] with surrounding whitespace trimmed, unless empty."""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if end > start:
+            spans.append(start)
+            spans.append(end)
+
+
+class ChunkSpans(Sequence):
+    """
+    Chunks stored as (start, end) offsets into the original text.
+    
+    Offsets live in one flat array('I') (two 4-byte integers per chunk) rather
+    than as separate strings, so overlapping chunks don't duplicate the text.
+    Indexing or iterating materializes chunk strings on demand; span() gives
+    the exact source position of a chunk without copying it.
+    """
+    
+    def __init__(self, text, offsets):
+        """
+        Wrap chunk offsets.
+        
+        Args:
+            text (str): The text the offsets point into
+            offsets (array): Flat start, end, start, end, ... offsets
+        """
+        self.text = text
+        self.offsets = offsets
+    
+    @staticmethod
+    def typecode_for(text_length):
+        """
+        Pick the smallest array typecode that can hold offsets into a text.
+        
+        Args:
+            text_length (int): Length of the text in characters
+        
+        Returns:
+            str: 'I' for texts up to 4 GiB characters, 'Q' otherwise
+        """
+        return 'I' if text_length < 2 ** 32 else 'Q'
+    
+    def __len__(self):
+        return len(self.offsets) // 2
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        start, end = self.span(index)
+        return self.text[start:end]
+    
+    def span(self, index):
+        """
+        Get the offsets of one chunk.
+        
+        Args:
+            index (int): Chunk index, negative values count from the end
+        
+        Returns:
+            tuple: (start, end) so that text[start:end] is the chunk
+        
+        Raises:
+            IndexError: If index is out of range
+        """
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("chunk index out of range")
+        return self.offsets[2 * index], self.offsets[2 * index + 1]
+    
+    def spans(self):
+        """
+        Iterate over chunk offsets without materializing any chunk.
+        
+        Yields:
+            tuple: (start, end) for each chunk in order
+        """
+        offsets = iter(self.offsets)
+        return zip(offsets, offsets)
+    
+    @property
+    def nbytes(self):
+        """Memory used by the offsets array, in bytes."""
+        return self.offsets.itemsize * len(self.offsets)
+
+
+class _StreamLevel:
+    """Split state of one separator level of a ChunkStream."""
+
+    def __init__(self, pattern, next_level, separator_length, start):
+        # Separator regex, None to split between every character
+        self.pattern = pattern
+        # Level that splits reaching chunk_size are split again with; past the
+        # last separator they are kept whole
+        self.next_level = next_level
+        self.separator_length = separator_length
+        # Start of the split being read, it ends at the next separator match
+        self.open_start = start
+        # End of the last separator match, the next one is searched from here
+        self.cursor = start
+        # No separator match starts between cursor and searched_to
+        self.searched_to = start
+        # (start, end) of the next separator match once found
+        self.found = None
+        # Boundaries of the current run of short splits and the resume point
+        # of its merge loop, see NativeChunker._merge_run
+        self.bounds = None
+        self.window_start = 0
+        self.next_bound = 1
+
+
+class ChunkStream:
+    """
+    Incremental NativeChunker: text fed in pieces gives exactly the chunks
+    split_offsets would give for the concatenated text.
+
+    The recursive split is replayed one separator level at a time as text
+    arrives. A split ends at the next separator match of its level; once it
+    is complete it is merged with its neighbours if short, or split again
+    with the deeper separators if not. A split still being read is handed
+    to the next level as soon as it is known to reach chunk_size, since it
+    will be split again whatever follows. A level whose separator never
+    occurs then holds one long split, which leads to the same chunks as the
+    splitter skipping straight to the next separator present.
+
+    Only the open split of the deepest level and the current merge window
+    are kept, so memory stays around two chunk_size windows plus the piece
+    being fed. The exception is text without any of the separators when
+    the last one isn't "": it is one chunk however long it gets.
+    """
+
+    def __init__(self, chunk_size=500, chunk_overlap=100, separators=DEFAULT_SEPARATORS):
+        """
+        Configure the stream.
+
+        Args:
+            chunk_size (int): Maximum size of each chunk (default: 500 characters)
+            chunk_overlap (int): Overlap between chunks (default: 100 characters)
+            separators (sequence): Separators tried in order (default: DEFAULT_SEPARATORS)
+
+        Raises:
+            ValueError: If chunk_size or chunk_overlap are out of range
+        """
+        self.chunker = NativeChunker(chunk_size, chunk_overlap, separators)
+        # Unconsumed text, starting at offset _base of the stream
+        self._text = ""
+        self._base = 0
+        # A match this close to the end of the text may still grow or be
+        # preceded by a match of a longer separator
+        self._margin = max([len(separator) for separator in self.chunker.separators] + [1]) - 1
+        self._levels = [self._new_level(0, 0)]
+        self._chunks = []
+
+    def feed(self, piece):
+        """
+        Add the next piece of text.
+
+        Args:
+            piece (str): Text continuing the stream
+
+        Returns:
+            list: (chunk, start, end) for each chunk completed by the piece,
+                start and end being offsets into the whole stream
+        """
+        if piece:
+            self._text += piece
+            self._advance(final=False)
+        return self._take()
+
+    def finish(self):
+        """
+        End the stream.
+
+        Returns:
+            list: (chunk, start, end) for the remaining chunks
+        """
+        self._advance(final=True)
+        self._close_split(self._levels[-1], self._base + len(self._text))
+        for level in reversed(self._levels):
+            self._flush_run(level)
+        return self._take()
+
+    def _new_level(self, level, start):
+        separators = self.chunker.separators
+        if separators[level]:
+            return _StreamLevel(self.chunker._patterns[level], level + 1, len(separators[level]), start)
+        return _StreamLevel(None, len(separators), 0, start)
+
+    def _advance(self, final):
+        """Consume the text as far as it can be split without knowing what follows."""
+        while True:
+            end = self._base + len(self._text)
+            limit = end if final else end - self._margin
+
+            # Earliest separator match that closes the open split of an outer
+            # level. A match running past limit may yet turn out different,
+            # so nothing is consumed beyond its start until it is settled.
+            event = None
+            for level in self._levels[:-1]:
+                found = self._next_match(level, end)
+                if found is None or found[0] >= limit:
+                    continue
+                if found[1] <= limit:
+                    event = level
+                    limit = found[0]
+                elif event is None:
+                    limit = found[0]
+
+            deepest = self._levels[-1]
+            self._split_to(deepest, limit)
+
+            if event is not None:
+                # The match ends the open split of every level below it too
+                self._close_split(deepest, limit)
+                while self._levels[-1] is not event:
+                    self._flush_run(self._levels.pop())
+                event.open_start = limit
+                event.cursor = event.searched_to = event.found[1]
+                event.found = None
+                continue
+
+            # Hand the open split to the next level once it reaches chunk_size
+            known_end = limit - max(deepest.separator_length - 1, 0)
+            if (deepest.next_level < len(self.chunker.separators)
+                    and known_end - deepest.open_start >= self.chunker.chunk_size):
+                self._flush_run(deepest)
+                self._levels.append(self._new_level(deepest.next_level, deepest.open_start))
+                continue
+            break
+
+        # Drop text no level can return to
+        keep = deepest.open_start
+        if deepest.bounds is not None:
+            keep = min(keep, deepest.bounds[deepest.window_start])
+        for level in self._levels[:-1]:
+            if level.found is None:
+                keep = min(keep, max(level.cursor, level.searched_to))
+        if keep - self._base > len(self._text) // 2:
+            self._text = self._text[keep - self._base:]
+            self._base = keep
+
+    def _next_match(self, level, end):
+        """Find, and cache, the next separator match of an outer level."""
+        if level.found is None:
+            start = max(level.cursor, level.searched_to)
+            match = level.pattern.search(self._text, start - self._base)
+            if match:
+                level.found = (match.start() + self._base, match.end() + self._base)
+            else:
+                level.searched_to = max(start, end - level.separator_length + 1)
+        return level.found
+
+    def _split_to(self, level, limit):
+        """Close every split of the deepest level whose separator match ends by limit."""
+        if level.pattern is None:
+            # Every character is a split of its own
+            if limit <= level.open_start:
+                return
+            if self.chunker.chunk_size > 1:
+                if level.bounds is None:
+                    level.bounds = [level.open_start]
+                level.bounds.extend(range(level.open_start + 1, limit + 1))
+                self._merge(level)
+            else:
+                for position in range(level.open_start + 1, limit + 1):
+                    self._close_split(level, position)
+            level.open_start = level.cursor = level.searched_to = limit
+            return
+
+        base = self._base
+        start = max(level.cursor, level.searched_to)
+        for match in level.pattern.finditer(self._text, start - base, max(limit - base, 0)):
+            self._close_split(level, match.start() + base)
+            level.cursor = match.end() + base
+        level.searched_to = max(start, level.cursor, limit - level.separator_length + 1)
+        level.found = None
+        self._merge(level)
+
+    def _close_split(self, level, position):
+        """End the open split of a level at position and start the next one there."""
+        start = level.open_start
+        level.open_start = position
+        if position <= start:
+            return
+
+        if position - start < self.chunker.chunk_size:
+            if level.bounds is None:
+                level.bounds = [start]
+            level.bounds.append(position)
+            return
+
+        self._flush_run(level)
+        if level.next_level >= len(self.chunker.separators):
+            self._emit(start, position)
+            return
+        spans = array('Q')
+        self.chunker._split_span(self._text, start - self._base, position - self._base,
+                                 level.next_level, spans)
+        offsets = iter(spans)
+        for chunk_start, chunk_end in zip(offsets, offsets):
+            self._emit(chunk_start + self._base, chunk_end + self._base)
+
+    def _merge(self, level):
+        """Emit the chunks of a level's run that no later split can change."""
+        bounds = level.bounds
+        if bounds is None:
+            return
+        chunk_size = self.chunker.chunk_size
+        chunk_overlap = self.chunker.chunk_overlap
+        last = len(bounds) - 1
+        window_start = level.window_start
+        i = level.next_bound
+        # Same loop as NativeChunker._merge_run, stopping where the run does
+        while True:
+            i = bisect_right(bounds, bounds[window_start] + chunk_size, i)
+            if i > last:
+                break
+            self._emit_stripped(bounds[window_start], bounds[i - 1])
+            window_start = max(
+                bisect_left(bounds, bounds[i - 1] - chunk_overlap, window_start),
+                min(bisect_left(bounds, bounds[i] - chunk_size, window_start), i - 1),
+            )
+            i += 1
+
+        if window_start > 1024:
+            del bounds[:window_start]
+            i -= window_start
+            window_start = 0
+        level.window_start = window_start
+        level.next_bound = i
+
+    def _flush_run(self, level):
+        """End a level's run of short splits, emitting its last window."""
+        if level.bounds is None:
+            return
+        self._merge(level)
+        bounds = level.bounds
+        if level.window_start < len(bounds) - 1:
+            self._emit_stripped(bounds[level.window_start], bounds[-1])
+        level.bounds = None
+        level.window_start = 0
+        level.next_bound = 1
+
+    def _emit(self, start, end):
+        self._chunks.append((self._text[start - self._base:end - self._base], start, end))
+
+    def _emit_stripped(self, start, end):
+        spans = []
+        NativeChunker._append_stripped(self._text, spans, start - self._base, end - self._base)
+        if spans:
+            self._emit(spans[0] + self._base, spans[1] + self._base)
+
+    def _take(self):
+        chunks = self._chunks
+        self._chunks = []
+        return chunks
+
+
+# Chunking engines selectable by name
+CHUNK_ENGINES = ("langchain", "native")
+
+
+def make_chunker(chunk_size=500, chunk_overlap=100, engine="langchain", tokenizer=None):
+    """
+    Create a reusable chunker for an engine.
+    
+    Args:
+        chunk_size (int): Maximum size of each chunk (default: 500 characters)
+        chunk_overlap (int): Overlap between chunks (default: 100 characters)
+        engine (str): "langchain" for RecursiveCharacterTextSplitter or "native"
+            for the built-in NativeChunker (default: "langchain")
+        tokenizer (str, optional): Measure chunk_size and chunk_overlap in tokens
+            of this tokenizer (see token_length.available_tokenizers()) instead
+            of characters. Requires the "langchain" engine.
+    
+    Returns:
+        Chunker or NativeChunker: Chunker with a split(text) method
+    
+    Raises:
+        ValueError: If engine or tokenizer is unknown, or tokenizer is used
+            with the native engine
+    """
+    if tokenizer:
+        if engine != "langchain":
+            raise ValueError(f"The {engine} chunking engine only measures characters; "
+                             f"use the langchain engine with a tokenizer")
+        return Chunker(chunk_size, chunk_overlap, tokenizer=tokenizer)
+    if engine == "langchain":
+        return Chunker(chunk_size, chunk_overlap)
+    if engine == "native":
+        return NativeChunker(chunk_size, chunk_overlap)
+    raise ValueError(f"Unknown chunking engine '{engine}'. Available: {', '.join(CHUNK_ENGINES)}")
+
+
+def chunk_text_content(text, chunk_size=500, chunk_overlap=100, engine="langchain", offsets=False,
+                       tokenizer=None):
     """
     Chunk text content into smaller pieces with overlap.
     This function is designed to be imported and used in other modules.
@@ -19,31 +718,110 @@ def chunk_text_content(text, chunk_size=500, chunk_overlap=100):
         text (str): The text content to chunk
         chunk_size (int): Maximum size of each chunk (default: 500 characters)
         chunk_overlap (int): Overlap between chunks (default: 100 characters)
+        engine (str): "langchain" or "native"; both produce the same chunks
+            (default: "langchain")
+        offsets (bool): Return a ChunkSpans of offsets into text instead of
+            copied strings (default: False)
+        tokenizer (str, optional): Size chunks in tokens of this tokenizer
+            instead of characters (langchain engine only)
     
     Returns:
-        list: List of text chunks (strings)
+        list or ChunkSpans: List of text chunks (strings), or their offsets
+            if offsets is True
     
     Raises:
         Exception: For chunking errors
     """
     try:
-        # Initialize text splitter
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
-        )
-        
-        # Split text into chunks
-        chunks = text_splitter.split_text(text)
-        return chunks
+        # Chunkers reuse the cached splitter for these settings
+        chunker = make_chunker(chunk_size, chunk_overlap, engine, tokenizer)
+        if offsets:
+            return chunker.split_offsets(text)
+        return chunker.split(text)
     
     except Exception as e:
         raise Exception(f"Error chunking text: {e}")
 
 
-def chunk_text(text_path, chunk_size=500, chunk_overlap=100):
+def iter_chunk_spans(pieces, chunker):
+    """
+    Chunk a stream of text pieces (file blocks, lines, PDF pages) incrementally.
+    The chunks and offsets are exactly those chunker.split_offsets gives for
+    the concatenated pieces. Character-sized chunkers feed the pieces to a
+    ChunkStream, so memory stays at a couple of chunk_size windows plus the
+    current piece however long the stream is. Token counts don't add up over
+    pieces of text the way lengths do, so chunkers sizing chunks in tokens
+    buffer the whole stream and split it once.
+    
+    Args:
+        pieces (iterable): Text pieces in order, concatenated they form the text
+        chunker (Chunker or NativeChunker): Chunker providing the settings
+    
+    Yields:
+        tuple: (chunk, start, end) for each chunk in order, where start and end
+            are offsets into the concatenated pieces
+    """
+    if chunker.length_function is not len:
+        chunks = chunker.split_offsets("".join(pieces))
+        for i in range(len(chunks)):
+            start, end = chunks.span(i)
+            yield chunks[i], start, end
+        return
+    
+    stream = ChunkStream(chunker.chunk_size, chunker.chunk_overlap, chunker.separators)
+    for piece in pieces:
+        yield from stream.feed(piece)
+    yield from stream.finish()
+
+
+def iter_chunks(pieces, chunker):
+    """
+    Chunk a stream of text pieces incrementally, see iter_chunk_spans.
+    
+    Args:
+        pieces (iterable): Text pieces in order, concatenated they form the text
+        chunker (Chunker or NativeChunker): Chunker providing the settings
+    
+    Yields:
+        str: Text chunks in order
+    """
+    for chunk, _, _ in iter_chunk_spans(pieces, chunker):
+        yield chunk
+
+
+def iter_chunk_text(text_path, chunk_size=500, chunk_overlap=100, engine="langchain",
+                    block_size=STREAM_BLOCK_SIZE, tokenizer=None):
+    """
+    Chunk a text file without reading it into memory at once.
+    
+    Args:
+        text_path (str): Path to the text file
+        chunk_size (int): Maximum size of each chunk (default: 500 characters)
+        chunk_overlap (int): Overlap between chunks (default: 100 characters)
+        engine (str): "langchain" or "native" (default: "langchain")
+        block_size (int): Characters read per block (default: 1 MB)
+        tokenizer (str, optional): Size chunks in tokens of this tokenizer
+    
+    Yields:
+        str: Text chunks in order
+    
+    Raises:
+        FileNotFoundError: If text file doesn't exist
+        Exception: For other chunking errors
+    """
+    if not os.path.exists(text_path):
+        raise FileNotFoundError(f"Text file '{text_path}' not found.")
+    
+    chunker = make_chunker(chunk_size, chunk_overlap, engine, tokenizer)
+    try:
+        with open(text_path, 'r', encoding='utf-8') as f:
+            yield from iter_chunks(iter(lambda: f.read(block_size), ""), chunker)
+    except Exception as e:
+        raise Exception(f"Error chunking text: {e}")
+
+
+def chunk_text(text_path, chunk_size=500, chunk_overlap=100, engine="langchain", offsets=False,
+               tokenizer=None):
     """
     Chunk text content from a file into smaller pieces with overlap.
     This function reads a file and chunks its content.
@@ -52,9 +830,13 @@ def chunk_text(text_path, chunk_size=500, chunk_overlap=100):
         text_path (str): Path to the text file
         chunk_size (int): Maximum size of each chunk (default: 500 characters)
         chunk_overlap (int): Overlap between chunks (default: 100 characters)
+        engine (str): "langchain" or "native" (default: "langchain")
+        offsets (bool): Return a ChunkSpans of offsets instead of strings (default: False)
+        tokenizer (str, optional): Size chunks in tokens of this tokenizer
     
     Returns:
-        list: List of text chunks (strings)
+        list or ChunkSpans: List of text chunks (strings), or their offsets
+            if offsets is True
     
     Raises:
         FileNotFoundError: If text file doesn't exist
@@ -69,7 +851,7 @@ def chunk_text(text_path, chunk_size=500, chunk_overlap=100):
             text = f.read()
         
         # Use the reusable function to chunk the text
-        return chunk_text_content(text, chunk_size, chunk_overlap)
+        return chunk_text_content(text, chunk_size, chunk_overlap, engine, offsets, tokenizer)
     
     except Exception as e:
         raise Exception(f"Error chunking text: {e}")
@@ -78,38 +860,68 @@ def chunk_text(text_path, chunk_size=500, chunk_overlap=100):
 
 def main():
     """Main function to handle command-line usage."""
-    if len(sys.argv) < 2:
-        print("Usage: python chunk.py <text_file> [output_file] [chunk_size] [chunk_overlap]")
+    args = sys.argv[1:]
+    try:
+        engine = pop_option(args, "--chunk-engine", "langchain")
+        tokenizer = pop_option(args, "--tokenizer")
+        output_format = pop_option(args, "--format", "text")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if len(args) < 1:
+        print("Usage: python chunk.py <text_file> [output_file] [chunk_size] [chunk_overlap] "
+              "[--chunk-engine NAME] [--tokenizer NAME] [--format text|jsonl|parquet|arrow]")
         print("Example: python chunk.py document.txt output.txt 500 100")
+        print("Example: python chunk.py document.txt output.txt --chunk-engine native")
+        print("Example: python chunk.py document.txt output.txt 128 32 --tokenizer words")
+        print("Example: python chunk.py document.txt chunks.jsonl --format jsonl")
         print("\nDefault values:")
         print("  chunk_size: 500 characters (range: 200-500)")
         print("  chunk_overlap: 100 characters (range: 50-100)")
+        print(f"  chunk-engine: langchain (available: {', '.join(CHUNK_ENGINES)})")
+        print(f"  tokenizer: none, sizes are in characters (available: {', '.join(available_tokenizers())})")
+        print("  format: text; jsonl, parquet and arrow stream rows with id, text and offsets")
         sys.exit(1)
     
-    text_path = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].isdigit() else None
+    if engine not in CHUNK_ENGINES:
+        print(f"Error: Unknown chunking engine '{engine}'. Available: {', '.join(CHUNK_ENGINES)}")
+        sys.exit(1)
+    if tokenizer and tokenizer not in available_tokenizers():
+        print(f"Error: Unknown tokenizer '{tokenizer}'. Available: {', '.join(available_tokenizers())}")
+        sys.exit(1)
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+    unit = "tokens" if tokenizer else "characters"
+    
+    text_path = args[0]
+    output_path = args[1] if len(args) > 1 and not args[1].isdigit() else None
+    if output_format != "text" and not output_path:
+        print(f"Error: The {output_format} format needs an output_file")
+        sys.exit(1)
     
     # Parse chunk_size and chunk_overlap
-    if len(sys.argv) > 3:
+    if len(args) > 2:
         try:
-            chunk_size = int(sys.argv[3] if not sys.argv[2].isdigit() else sys.argv[2])
+            chunk_size = int(args[2] if not args[1].isdigit() else args[1])
         except ValueError:
             chunk_size = 500
     else:
         chunk_size = 500
     
-    if len(sys.argv) > 4:
+    if len(args) > 3:
         try:
-            chunk_overlap = int(sys.argv[4] if not sys.argv[2].isdigit() else sys.argv[3])
+            chunk_overlap = int(args[3] if not args[1].isdigit() else args[2])
         except ValueError:
             chunk_overlap = 100
     else:
         chunk_overlap = 100
     
-    # Validate ranges
-    if not (200 <= chunk_size <= 500):
+    # Validate ranges (recommended ranges are in characters)
+    if not tokenizer and not (200 <= chunk_size <= 500):
         print(f"Warning: chunk_size {chunk_size} is outside recommended range (200-500). Using anyway.")
-    if not (50 <= chunk_overlap <= 100):
+    if not tokenizer and not (50 <= chunk_overlap <= 100):
         print(f"Warning: chunk_overlap {chunk_overlap} is outside recommended range (50-100). Using anyway.")
     
     # Check if text file exists
@@ -123,36 +935,52 @@ def main():
     print(f"Starting chunking at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
     
     try:
-        # Chunk the text using the reusable function
-        chunks = chunk_text(text_path, chunk_size, chunk_overlap)
+        if output_format != "text":
+            # Stream rows straight from file blocks to the output file
+            chunker = make_chunker(chunk_size, chunk_overlap, engine, tokenizer)
+            with open(text_path, 'r', encoding='utf-8') as f:
+                blocks = iter(lambda: f.read(STREAM_BLOCK_SIZE), "")
+                records = (ChunkRecord(chunk, start, end, None, None)
+                           for chunk, start, end in iter_chunk_spans(blocks, chunker))
+                total_chunks = write_chunk_output(records, output_path, output_format)
+            
+            print(f"Total chunks created: {total_chunks}")
+            print(f"Chunk size: {chunk_size} {unit}")
+            print(f"Chunk overlap: {chunk_overlap} {unit}\n")
+            print(f"Chunked text saved to: {output_path}")
+            
+            end_time = time.time()
+            elapsed_time = end_time - start_time
+            print(f"\nChunking completed at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))}")
+            print(f"Total time taken: {elapsed_time:.2f} seconds")
+            return
+        
+        # Every header shows the total, so count the chunks in a first pass
+        # over the file and write them in a second, both streamed in blocks
+        total_chunks = sum(1 for _ in iter_chunk_text(text_path, chunk_size, chunk_overlap, engine,
+                                                      tokenizer=tokenizer))
+        chunks = iter_chunk_text(text_path, chunk_size, chunk_overlap, engine, tokenizer=tokenizer)
         
         # Display chunk statistics
-        total_chunks = len(chunks)
         print(f"Total chunks created: {total_chunks}")
-        print(f"Chunk size: {chunk_size} characters")
-        print(f"Chunk overlap: {chunk_overlap} characters\n")
-        
-        # Prepare output
-        output_lines = []
-        for i, chunk in enumerate(chunks):
-            chunk_header = f"=== Chunk {i + 1}/{total_chunks} ==="
-            chunk_length = f"Length: {len(chunk)} characters"
-            
-            output_lines.append(chunk_header)
-            output_lines.append(chunk_length)
-            output_lines.append("-" * 50)
-            output_lines.append(chunk)
-            output_lines.append("\n")
-        
-        full_output = "\n".join(output_lines)
+        print(f"Chunk size: {chunk_size} {unit}")
+        print(f"Chunk overlap: {chunk_overlap} {unit}\n")
         
         # Save or print the chunked text
         if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(full_output)
+            with TextChunkWriter(output_path, total_chunks) as writer:
+                for chunk in chunks:
+                    writer.write(ChunkRecord(chunk, None, None, None, None))
             print(f"Chunked text saved to: {output_path}")
         else:
-            print(full_output)
+            if not total_chunks:
+                print()
+            for i, chunk in enumerate(chunks):
+                print(f"=== Chunk {i + 1}/{total_chunks} ===")
+                print(f"Length: {len(chunk)} characters")
+                print("-" * 50)
+                print(chunk)
+                print("\n")
         
         end_time = time.time()
         elapsed_time = end_time - start_time
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Chunk Output Writers
+Write chunks as they are produced, either in the decorated text format or
+as machine-readable JSONL, Parquet or Arrow rows with the chunk id, text,
+character offsets and pages.
+"""
+
+import json
+import os
+
+# Output formats selectable by name, and the file extension used for each
+OUTPUT_FORMATS = ("text", "jsonl", "parquet", "arrow")
+OUTPUT_EXTENSIONS = {"text": ".txt", "jsonl": ".jsonl", "parquet": ".parquet", "arrow": ".arrow"}
+
+# Rows buffered per Parquet row group / Arrow record batch
+DEFAULT_BATCH_ROWS = 4096
+
+
+def chunk_row(chunk_id, chunk):
+    """
+    Build the output row for a chunk.
+
+    Args:
+        chunk_id (int): 1-based chunk number
+        chunk (ChunkRecord): Chunk with its offsets; page_start and page_end
+            may be None for text that did not come from pages
+
+    Returns:
+        dict: Row with id, text, start, end, page_start and page_end
+    """
+    return {
+        'id': chunk_id,
+        'text': chunk.text,
+        'start': chunk.start,
+        'end': chunk.end,
+        'page_start': chunk.page_start,
+        'page_end': chunk.page_end,
+    }
+
+
+class TextChunkWriter:
+    """
+    Writes the decorated text format ("=== Chunk i/N ===", length, dashes,
+    text) one chunk at a time. The total must be known up front since it is
+    part of every header.
+    """
+
+    def __init__(self, output_path, total_chunks):
+        """
+        Open the output file.
+
+        Args:
+            output_path (str): Path to output text file
+            total_chunks (int): Number of chunks that will be written
+        """
+        self.total_chunks = total_chunks
+        self.count = 0
+        self._file = open(output_path, 'w', encoding='utf-8')
+        self._first_line = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_line(self, line):
+        # Same layout as joining all lines with "\n", without building the string
+        if not self._first_line:
+            self._file.write("\n")
+        self._file.write(line)
+        self._first_line = False
+
+    def write(self, chunk):
+        """
+        Write one chunk.
+
+        Args:
+            chunk (ChunkRecord): Chunk to write
+        """
+        self.count += 1
+        self._write_line(f"=== Chunk {self.count}/{self.total_chunks} ===")
+        self._write_line(f"Length: {len(chunk.text)} characters")
+        self._write_line("-" * 50)
+        self._write_line(chunk.text)
+        self._write_line("\n")
+
+    def write_skipped_pages(self, skipped_pages):
+        """
+        Record pages that could not be extracted after the chunks.
+
+        Args:
+            skipped_pages (list): {"page": page_number, "reason": str} entries
+        """
+        if skipped_pages:
+            self._write_line("=== Skipped pages ===")
+            for skipped in skipped_pages:
+                self._write_line(f"Page {skipped['page']}: {skipped['reason']}")
+
+    def close(self):
+        """Close the output file."""
+        self._file.close()
+
+
+class JsonlChunkWriter:
+    """Writes one JSON object per line, flushed as chunks arrive."""
+
+    def __init__(self, output_path):
+        """
+        Open the output file.
+
+        Args:
+            output_path (str): Path to output .jsonl file
+        """
+        self.count = 0
+        self._file = open(output_path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, chunk):
+        """
+        Write one chunk.
+
+        Args:
+            chunk (ChunkRecord): Chunk to write
+        """
+        self.count += 1
+        self._file.write(json.dumps(chunk_row(self.count, chunk), ensure_ascii=False))
+        self._file.write("\n")
+
+    def close(self):
+        """Close the output file."""
+        self._file.close()
+
+
+class ArrowChunkWriter:
+    """
+    Writes columnar Parquet or Arrow IPC files. Rows are buffered per column
+    and written as one row group / record batch every batch_rows chunks, so
+    memory stays bounded by the batch size. Requires pyarrow.
+    """
+
+    def __init__(self, output_path, file_format="parquet", batch_rows=DEFAULT_BATCH_ROWS):
+        """
+        Open the output file.
+
+        Args:
+            output_path (str): Path to output .parquet or .arrow file
+            file_format (str): "parquet" or "arrow" (default: "parquet")
+            batch_rows (int): Rows per row group or record batch (default: 4096)
+
+        Raises:
+            ImportError: If pyarrow is not installed
+            ValueError: If file_format is unknown
+        """
+        # Imported here so the text and JSONL formats don't require pyarrow
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(f"The {file_format} output format requires pyarrow: pip install pyarrow")
+
+        self._pa = pa
+        self.schema = pa.schema([
+            ('id', pa.int64()),
+            ('text', pa.string()),
+            ('start', pa.int64()),
+            ('end', pa.int64()),
+            ('page_start', pa.int32()),
+            ('page_end', pa.int32()),
+        ])
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(output_path, self.schema)
+        elif file_format == "arrow":
+            self._writer = pa.ipc.new_file(output_path, self.schema)
+        else:
+            raise ValueError(f"Unknown columnar format '{file_format}'. Available: parquet, arrow")
+
+        self.batch_rows = batch_rows
+        self.count = 0
+        self._columns = {name: [] for name in self.schema.names}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, chunk):
+        """
+        Buffer one chunk, writing a batch when enough rows are buffered.
+
+        Args:
+            chunk (ChunkRecord): Chunk to write
+        """
+        self.count += 1
+        for name, value in chunk_row(self.count, chunk).items():
+            self._columns[name].append(value)
+        if len(self._columns['id']) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._columns['id']:
+            return
+        batch = self._pa.record_batch([self._columns[name] for name in self.schema.names],
+                                      schema=self.schema)
+        self._writer.write_batch(batch)
+        self._columns = {name: [] for name in self.schema.names}
+
+    def close(self):
+        """Write any buffered rows and close the output file."""
+        self._flush()
+        self._writer.close()
+
+
+def open_chunk_writer(output_path, output_format="jsonl", batch_rows=DEFAULT_BATCH_ROWS):
+    """
+    Open a streaming writer for a machine-readable format.
+
+    Args:
+        output_path (str): Path to the output file
+        output_format (str): "jsonl", "parquet" or "arrow" (default: "jsonl")
+        batch_rows (int): Rows per batch for the columnar formats (default: 4096)
+
+    Returns:
+        JsonlChunkWriter or ArrowChunkWriter: Writer with write(chunk) and close()
+
+    Raises:
+        ValueError: If output_format is unknown or "text", which needs the
+            chunk count up front (use TextChunkWriter)
+        ImportError: If a columnar format is requested without pyarrow
+    """
+    if output_format == "jsonl":
+        return JsonlChunkWriter(output_path)
+    if output_format in ("parquet", "arrow"):
+        return ArrowChunkWriter(output_path, output_format, batch_rows)
+    if output_format == "text":
+        raise ValueError("The text format needs the chunk count up front; use TextChunkWriter")
+    raise ValueError(f"Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+
+
+def write_chunk_output(chunks, output_path, output_format="text", stats=None):
+    """
+    Write chunks in any output format.
+    Machine-readable formats consume chunks as they are produced, so a
+    generator is never materialized; the text format needs the full list.
+
+    Args:
+        chunks (iterable): ChunkRecord instances, a list for the text format
+        output_path (str): Path to the output file
+        output_format (str): One of OUTPUT_FORMATS (default: "text")
+        stats (dict, optional): Stats filled in while chunks are produced; its
+            "skipped_pages" are recorded at the end of the text format
+
+    Returns:
+        int: Number of chunks written
+    
+    Raises:
+        Exception: Whatever producing or writing the chunks raised; a partly
+            written machine-readable file is removed first
+    """
+    if output_format == "text":
+        chunks = list(chunks)
+        with TextChunkWriter(output_path, len(chunks)) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+            writer.write_skipped_pages((stats or {}).get('skipped_pages'))
+            return writer.count
+
+    try:
+        with open_chunk_writer(output_path, output_format) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+            return writer.count
+    except Exception:
+        # Don't leave a truncated file behind when producing chunks fails
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Chunk Records
+Chunks with their provenance: character offsets into the extracted document
+text and the page(s) each chunk came from, for citations.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+
+class ChunkRecord(namedtuple('ChunkRecord', ['text', 'start', 'end', 'page_start', 'page_end'])):
+    """
+    A chunk and where it came from.
+    
+    start and end are character offsets into the document text, i.e. the
+    page texts concatenated in order, so that document_text[start:end] is the
+    chunk. page_start and page_end are the 1-based first and last pages the
+    chunk spans (equal for chunks within a single page).
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def pages(self):
+        """range: Page numbers the chunk spans."""
+        return range(self.page_start, self.page_end + 1)
+
+
+class PageIndex:
+    """
+    Offsets at which each page starts in the document text.
+    Built while pages are streamed, then used to map chunk offsets back to
+    pages by binary search instead of re-scanning any text.
+    """
+    
+    def __init__(self):
+        """Create an empty index."""
+        self.page_starts = array('Q')
+        self.page_numbers = array('I')
+        self.length = 0
+    
+    def add_page(self, page_number, text):
+        """
+        Append the next page of the document.
+        
+        Args:
+            page_number (int): 1-based page number
+            text (str): Page text
+        """
+        self.page_starts.append(self.length)
+        self.page_numbers.append(page_number)
+        self.length += len(text)
+    
+    def track(self, pages):
+        """
+        Index pages as they are consumed.
+        
+        Args:
+            pages (iterable): (page_number, text) pairs in page order
+        
+        Yields:
+            str: Each page's text
+        """
+        for page_number, text in pages:
+            self.add_page(page_number, text)
+            yield text
+    
+    def page_at(self, offset):
+        """
+        Find the page containing a character offset.
+        
+        Args:
+            offset (int): Offset into the document text
+        
+        Returns:
+            int: 1-based page number
+        
+        Raises:
+            IndexError: If no pages have been added
+        """
+        # Empty pages share their start with the next page; the last page
+        # starting at or before the offset is the one that holds it
+        index = bisect_right(self.page_starts, offset) - 1
+        if index < 0:
+            raise IndexError("offset precedes the first page")
+        return self.page_numbers[index]
+    
+    def record(self, text, start, end):
+        """
+        Build the record for a chunk.
+        
+        Args:
+            text (str): Chunk text
+            start (int): Offset of the chunk in the document text
+            end (int): Offset just past the chunk
+        
+        Returns:
+            ChunkRecord: Chunk with its page range
+        """
+        return ChunkRecord(text, start, end, self.page_at(start), self.page_at(max(start, end - 1)))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Command-line option helpers
+Pulls optional "--flag value" arguments out of an argument list so the
+scripts can keep their positional usage.
+"""
+
+
+def pop_option(args, name, default=None, cast=str):
+    """
+    Remove an option and its value from an argument list.
+    Supports both "--name value" and "--name=value" forms.
+
+    Args:
+        args (list): Argument list to modify in place (e.g. sys.argv[1:])
+        name (str): Option name including dashes (e.g. "--workers")
+        default: Value returned when the option is absent
+        cast (callable): Conversion applied to the option value
+
+    Returns:
+        The converted option value, or default if the option is absent
+
+    Raises:
+        ValueError: If the option has no value or the value cannot be converted
+    """
+    for i, arg in enumerate(args):
+        if arg == name:
+            if i + 1 >= len(args):
+                raise ValueError(f"Option {name} requires a value")
+            value = args[i + 1]
+            del args[i:i + 2]
+            return cast(value)
+        if arg.startswith(name + "="):
+            del args[i]
+            return cast(arg[len(name) + 1:])
+    return default
+
+
+def pop_flag(args, name):
+    """
+    Remove a boolean flag from an argument list.
+
+    Args:
+        args (list): Argument list to modify in place (e.g. sys.argv[1:])
+        name (str): Flag name including dashes (e.g. "--incremental")
+
+    Returns:
+        bool: True if the flag was present
+    """
+    if name in args:
+        args.remove(name)
+        return True
+    return False
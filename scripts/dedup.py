@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Chunk Removal
+Drops chunks that are nearly identical to an earlier chunk (repeated headers,
+footers, disclaimers) using MinHash signatures and LSH banding, so each chunk
+is compared only against the few earlier chunks sharing a band with it
+instead of against every other chunk.
+"""
+
+import re
+
+import numpy as np
+
+# Default estimated Jaccard similarity above which a chunk counts as a duplicate
+DEFAULT_THRESHOLD = 0.85
+
+# Default number of hash permutations per signature
+DEFAULT_NUM_PERM = 128
+
+# Characters per shingle
+DEFAULT_SHINGLE_SIZE = 5
+
+# Probability that a pair right at the threshold becomes an LSH candidate;
+# bands are chosen as selective as possible while keeping this recall
+_BAND_RECALL = 0.95
+
+# Shingles are hashed as polynomials in their code points, folded to 32 bits
+_SHINGLE_BASE = np.uint64(1000003)
+
+# Permutations are multiply-shift hashes (a * x + b) >> 32 of 32-bit shingle
+# hashes, which need no modulo and stay within uint64 arithmetic
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHIFT = np.uint64(32)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def choose_bands(threshold, num_perm):
+    """
+    Pick the LSH banding for a similarity threshold.
+
+    Args:
+        threshold (float): Similarity that should reliably produce candidates
+        num_perm (int): Number of permutations in a signature
+
+    Returns:
+        tuple: (bands, rows) with bands * rows <= num_perm
+    """
+    # More rows per band means fewer false candidates but lower recall;
+    # take the most rows that still catch pairs at the threshold
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= _BAND_RECALL:
+            return bands, rows
+    return num_perm, 1
+
+
+class MinHashDeduplicator:
+    """
+    Streaming near-duplicate filter. The first occurrence of a chunk is kept
+    and later chunks whose estimated similarity to a kept chunk reaches the
+    threshold are dropped.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        """
+        Configure the filter.
+
+        Args:
+            threshold (float): Estimated Jaccard similarity of character
+                shingles at which a chunk is a duplicate (default: 0.85)
+            num_perm (int): Permutations per MinHash signature (default: 128)
+            shingle_size (int): Characters per shingle (default: 5)
+            seed (int): Seed for the permutations (default: 1)
+
+        Raises:
+            ValueError: If threshold is not in (0, 1]
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+        self.dropped = 0
+
+        rng = np.random.RandomState(seed)
+        # Odd multipliers, as multiply-shift hashing requires
+        self._a = rng.randint(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = []
+
+    def signature(self, text):
+        """
+        Compute the MinHash signature of a text.
+        Case and whitespace runs are normalized first.
+
+        Args:
+            text (str): Text to sign
+
+        Returns:
+            numpy.ndarray: num_perm uint64 minimum hashes
+        """
+        normalized = _WHITESPACE.sub(" ", text.lower()).strip()
+        codes = np.frombuffer(normalized.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        if len(codes) == 0:
+            codes = np.zeros(1, dtype=np.uint64)
+
+        # Hash every window of shingle_size code points at once; texts shorter
+        # than a shingle are one shingle
+        size = min(self.shingle_size, len(codes))
+        count = len(codes) - size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            hashes = hashes * _SHINGLE_BASE + codes[offset:offset + count]
+        hashes = np.unique((hashes ^ (hashes >> _SHIFT)) & _MAX_HASH)
+
+        permuted = (np.outer(hashes, self._a) + self._b) >> _SHIFT
+        return permuted.min(axis=0)
+
+    def is_duplicate(self, text):
+        """
+        Check a chunk against the chunks kept so far, remembering it if new.
+
+        Args:
+            text (str): Chunk text
+
+        Returns:
+            bool: True if the chunk is a near duplicate of a kept chunk
+        """
+        signature = self.signature(text)
+        keys = [signature[band * self.rows:(band + 1) * self.rows].tobytes()
+                for band in range(self.bands)]
+
+        # Candidates share at least one band; confirm on the full signature
+        checked = set()
+        for band, key in enumerate(keys):
+            for index in self._buckets[band].get(key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                if np.mean(self._signatures[index] == signature) >= self.threshold:
+                    self.dropped += 1
+                    return True
+
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(index)
+        return False
+
+
+def drop_near_duplicates(chunks, threshold=DEFAULT_THRESHOLD, stats=None, key=None):
+    """
+    Yield the chunks that are not near duplicates of earlier ones.
+
+    Args:
+        chunks (iterable): Chunks in order
+        threshold (float): Estimated similarity at which a chunk is dropped (default: 0.85)
+        stats (dict, optional): Receives "duplicate_chunks", the number of chunks
+            dropped so far
+        key (callable, optional): Gets the text from a chunk, e.g. for
+            ChunkRecord (default: the chunk itself)
+
+    Yields:
+        Each kept chunk, unchanged
+    """
+    deduplicator = MinHashDeduplicator(threshold)
+    if stats is not None:
+        stats['duplicate_chunks'] = 0
+    for chunk in chunks:
+        if not deduplicator.is_duplicate(key(chunk) if key else chunk):
+            yield chunk
+        elif stats is not None:
+            stats['duplicate_chunks'] = deduplicator.dropped
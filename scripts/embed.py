@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Chunk Embedding
+Encode chunks into float32 vectors in batches. Encoders are pluggable
+through a registry; the built-in "hashing" encoder is deterministic and
+dependency-free, and "sentence-transformers" runs a local model when that
+package is installed. Vectors are stored as one contiguous array whose row i
+belongs to chunk id i + 1.
+"""
+
+import sys
+import os
+import re
+import time
+import zlib
+from operator import attrgetter
+
+import numpy as np
+
+# Add parent directory to path to import from scripts
+sys.path.insert(0, os.path.dirname(__file__))
+
+from cli_options import pop_option
+from token_length import get_length_function, available_tokenizers
+from embedding_cache import EmbeddingCache, text_key
+
+DEFAULT_ENCODER = "hashing"
+
+# Chunks per encoder call
+DEFAULT_BATCH_SIZE = 64
+
+# Dimensions of the hashing encoder's vectors
+DEFAULT_HASHING_DIM = 256
+
+_ENCODERS = {}
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def register_encoder(name):
+    """
+    Register an encoder under a name.
+    The decorated function is called with the encoder's keyword options and
+    must return an object with encoder_id, dim and encode(texts), where
+    encode returns a float32 array with one row per text.
+
+    Args:
+        name (str): Name used to select the encoder
+
+    Returns:
+        callable: Decorator that registers and returns the function
+    """
+    def decorator(fn):
+        _ENCODERS[name] = fn
+        return fn
+    return decorator
+
+
+def available_encoders():
+    """
+    List registered encoder names.
+
+    Returns:
+        list: Sorted encoder names
+    """
+    return sorted(_ENCODERS)
+
+
+def get_encoder(name=DEFAULT_ENCODER, **options):
+    """
+    Create a registered encoder.
+
+    Args:
+        name (str): Encoder name (default: "hashing")
+        **options: Encoder specific options, e.g. dim for "hashing"
+
+    Returns:
+        Encoder with encoder_id, dim and encode(texts)
+
+    Raises:
+        ValueError: If no encoder is registered under that name
+        ImportError: If the encoder's optional dependency is not installed
+    """
+    try:
+        factory = _ENCODERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown encoder '{name}'. Available: {', '.join(available_encoders())}")
+    return factory(**options)
+
+
+class HashingEncoder:
+    """
+    Feature-hashing encoder: each lowercased word adds +1 or -1 to one of dim
+    buckets, chosen by a CRC32 of the word, and vectors are L2-normalized.
+    Texts sharing words get similar vectors, with no model or randomness
+    involved, so results are identical across runs and machines.
+    """
+
+    def __init__(self, dim=DEFAULT_HASHING_DIM, seed=0):
+        """
+        Configure the encoder.
+
+        Args:
+            dim (int): Vector dimensions (default: 256)
+            seed (int): Changes the word-to-bucket mapping (default: 0)
+        """
+        self.dim = dim
+        self.seed = seed
+        self.encoder_id = f"hashing-{dim}-{seed}"
+
+    def encode(self, texts):
+        """
+        Encode a batch of texts.
+
+        Args:
+            texts (list): Texts to encode
+
+        Returns:
+            numpy.ndarray: (len(texts), dim) float32 unit vectors; empty texts
+                give zero vectors
+        """
+        rows = []
+        hashes = []
+        for row, text in enumerate(texts):
+            for word in _WORD_PATTERN.findall(text.lower()):
+                rows.append(row)
+                hashes.append(zlib.crc32(word.encode('utf-8'), self.seed))
+
+        # Scatter every word of the batch at once
+        hashes = np.array(hashes, dtype=np.uint32)
+        signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vectors, (np.array(rows, dtype=np.intp), (hashes >> 1) % self.dim), signs)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+@register_encoder("hashing")
+def _hashing_encoder(dim=DEFAULT_HASHING_DIM, seed=0):
+    """Deterministic local encoder, see HashingEncoder."""
+    return HashingEncoder(dim, seed)
+
+
+class SentenceTransformerEncoder:
+    """Local sentence-transformers model (optional dependency)."""
+
+    def __init__(self, model_name="all-MiniLM-L6-v2"):
+        """
+        Load the model.
+
+        Args:
+            model_name (str): Model name or path (default: "all-MiniLM-L6-v2")
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        # Imported here so the other encoders don't require sentence-transformers
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError("The 'sentence-transformers' encoder requires sentence-transformers: "
+                              "pip install sentence-transformers")
+        self._model = SentenceTransformer(model_name)
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.encoder_id = f"sentence-transformers/{model_name}"
+
+    def encode(self, texts):
+        """
+        Encode a batch of texts.
+
+        Args:
+            texts (list): Texts to encode
+
+        Returns:
+            numpy.ndarray: (len(texts), dim) float32 unit vectors
+        """
+        vectors = self._model.encode(list(texts), batch_size=max(len(texts), 1),
+                                     convert_to_numpy=True, normalize_embeddings=True)
+        return vectors.astype(np.float32, copy=False)
+
+
+@register_encoder("sentence-transformers")
+def _sentence_transformer_encoder(model_name="all-MiniLM-L6-v2"):
+    """Local sentence-transformers model, see SentenceTransformerEncoder."""
+    return SentenceTransformerEncoder(model_name)
+
+
+class BatchEmbedder:
+    """
+    Collects texts, encodes them a batch at a time and keeps the vectors in
+    one growing float32 array, so chunks can be embedded while they stream
+    through the pipeline. With a cache, only texts not embedded before are
+    sent to the encoder.
+    """
+
+    def __init__(self, encoder, batch_size=DEFAULT_BATCH_SIZE, max_batch_tokens=None,
+                 tokenizer=None, cache_dir=None):
+        """
+        Configure batching.
+
+        Args:
+            encoder: Encoder instance, or a registered encoder name
+            batch_size (int): Maximum chunks per encoder call (default: 64)
+            max_batch_tokens (int, optional): Maximum characters per batch, or
+                tokens when tokenizer is given
+            tokenizer (str, optional): Measure max_batch_tokens in tokens of this tokenizer
+            cache_dir (str, optional): Embedding cache directory (see EmbeddingCache)
+        """
+        self.encoder = get_encoder(encoder) if isinstance(encoder, str) else encoder
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.length_function = get_length_function(tokenizer) if tokenizer else len
+        self.cache = EmbeddingCache(cache_dir, self.encoder.encoder_id, self.encoder.dim) if cache_dir else None
+        self.stats = {'chunks': 0, 'batches': 0, 'seconds': 0.0, 'chunks_per_sec': 0.0,
+                      'cache_hits': 0, 'cache_misses': 0, 'hit_ratio': None}
+
+        self._pending = []
+        self._pending_tokens = 0
+        self._vectors = np.empty((max(batch_size, 1), self.encoder.dim), dtype=np.float32)
+
+    def add(self, text):
+        """
+        Queue one text, encoding the pending batch first if the text doesn't fit.
+
+        Args:
+            text (str): Chunk text
+        """
+        tokens = self.length_function(text) if self.max_batch_tokens else 0
+        if self._pending and (len(self._pending) >= self.batch_size or
+                              (self.max_batch_tokens and
+                               self._pending_tokens + tokens > self.max_batch_tokens)):
+            self._encode_pending()
+        self._pending.append(text)
+        self._pending_tokens += tokens
+
+    def tap(self, chunks, key=attrgetter('text')):
+        """
+        Pass chunks through unchanged while queueing their texts.
+
+        Args:
+            chunks (iterable): Chunks in order
+            key (callable): Gets the text from a chunk (default: ChunkRecord.text)
+
+        Yields:
+            Each chunk, after its text is queued
+        """
+        for chunk in chunks:
+            self.add(key(chunk))
+            yield chunk
+
+    def _encode_pending(self):
+        started = time.perf_counter()
+        if self.cache is not None:
+            vectors = self._encode_cached(self._pending)
+        else:
+            vectors = self.encoder.encode(self._pending)
+        self.stats['seconds'] += time.perf_counter() - started
+
+        count = self.stats['chunks']
+        if count + len(vectors) > len(self._vectors):
+            # Double the capacity so appending stays amortized O(1) per chunk
+            grown = np.empty((max(2 * len(self._vectors), count + len(vectors)), self.encoder.dim),
+                             dtype=np.float32)
+            grown[:count] = self._vectors[:count]
+            self._vectors = grown
+        self._vectors[count:count + len(vectors)] = vectors
+
+        self.stats['chunks'] += len(vectors)
+        self.stats['batches'] += 1
+        self._pending = []
+        self._pending_tokens = 0
+
+    def _encode_cached(self, texts):
+        keys = [text_key(text) for text in texts]
+        rows = self.cache.find(keys)
+        missing = np.flatnonzero(rows < 0)
+        
+        if len(missing):
+            # Encode each new text once, even if it repeats within the batch
+            new_keys = {}
+            for i in missing:
+                new_keys.setdefault(keys[i], texts[i])
+            new_rows = self.cache.append(list(new_keys), self.encoder.encode(list(new_keys.values())))
+            row_of = dict(zip(new_keys, new_rows))
+            rows[missing] = [row_of[keys[i]] for i in missing]
+        
+        self.stats['cache_hits'] += len(texts) - len(missing)
+        self.stats['cache_misses'] += len(missing)
+        return self.cache.vectors(rows)
+
+    def finish(self):
+        """
+        Encode any pending texts and return all vectors.
+
+        Returns:
+            numpy.ndarray: Contiguous (chunks, dim) float32 array in the order
+                texts were added
+        """
+        if self._pending:
+            self._encode_pending()
+        seconds = self.stats['seconds']
+        self.stats['chunks_per_sec'] = self.stats['chunks'] / seconds if seconds > 0 else 0.0
+        if self.cache is not None and self.stats['chunks']:
+            self.stats['hit_ratio'] = self.stats['cache_hits'] / self.stats['chunks']
+        return self._vectors[:self.stats['chunks']].copy()
+
+
+def embed_texts(texts, encoder=DEFAULT_ENCODER, batch_size=DEFAULT_BATCH_SIZE,
+                max_batch_tokens=None, tokenizer=None, stats=None, cache_dir=None):
+    """
+    Embed texts in batches.
+
+    Args:
+        texts (iterable): Texts in order
+        encoder: Encoder instance or registered name (default: "hashing")
+        batch_size (int): Maximum texts per encoder call (default: 64)
+        max_batch_tokens (int, optional): Maximum characters per batch, or
+            tokens when tokenizer is given
+        tokenizer (str, optional): Measure max_batch_tokens in tokens of this tokenizer
+        stats (dict, optional): Receives chunks, batches, seconds, chunks_per_sec
+            and, with a cache, cache_hits, cache_misses and hit_ratio
+        cache_dir (str, optional): Embedding cache directory; only uncached texts are encoded
+
+    Returns:
+        numpy.ndarray: Contiguous (len(texts), dim) float32 array
+    """
+    embedder = BatchEmbedder(encoder, batch_size, max_batch_tokens, tokenizer, cache_dir)
+    for text in texts:
+        embedder.add(text)
+    vectors = embedder.finish()
+    if stats is not None:
+        stats.update(embedder.stats)
+    return vectors
+
+
+def embed_chunks(chunks, encoder=DEFAULT_ENCODER, batch_size=DEFAULT_BATCH_SIZE,
+                 max_batch_tokens=None, tokenizer=None, stats=None, cache_dir=None):
+    """
+    Embed ChunkRecords, e.g. from rag_pipeline.preprocess or load_chunks.
+
+    Args:
+        chunks (iterable): ChunkRecords in id order
+        encoder: Encoder instance or registered name (default: "hashing")
+        batch_size (int): Maximum chunks per encoder call (default: 64)
+        max_batch_tokens (int, optional): Maximum characters per batch, or
+            tokens when tokenizer is given
+        tokenizer (str, optional): Measure max_batch_tokens in tokens of this tokenizer
+        stats (dict, optional): Receives chunks, batches, seconds, chunks_per_sec
+            and, with a cache, cache_hits, cache_misses and hit_ratio
+        cache_dir (str, optional): Embedding cache directory; only uncached texts are encoded
+
+    Returns:
+        numpy.ndarray: (chunks, dim) float32 array; row i belongs to chunk id i + 1
+    """
+    return embed_texts((chunk.text for chunk in chunks), encoder, batch_size,
+                       max_batch_tokens, tokenizer, stats, cache_dir)
+
+
+def save_embeddings(vectors, output_path):
+    """
+    Save vectors as a .npy file.
+
+    Args:
+        vectors (numpy.ndarray): (chunks, dim) float32 array
+        output_path (str): Path to the .npy file
+    """
+    np.save(output_path, np.ascontiguousarray(vectors, dtype=np.float32))
+
+
+def load_embeddings(path, mmap=True):
+    """
+    Load vectors saved by save_embeddings.
+
+    Args:
+        path (str): Path to the .npy file
+        mmap (bool): Memory-map the file instead of reading it (default: True)
+
+    Returns:
+        numpy.ndarray: (chunks, dim) float32 array, read-only when mapped
+    """
+    return np.load(path, mmap_mode='r' if mmap else None)
+
+
+def benchmark_batch_sizes(texts, encoder=DEFAULT_ENCODER, batch_sizes=(1, 8, 32, 64, 128, 512)):
+    """
+    Measure embedding throughput for several batch sizes.
+
+    Args:
+        texts (list): Texts to embed
+        encoder: Encoder instance or registered name (default: "hashing")
+        batch_sizes (iterable): Batch sizes to try
+
+    Returns:
+        list: One result dict per batch size with batch_size, batches,
+            seconds and chunks_per_sec
+    """
+    encoder = get_encoder(encoder) if isinstance(encoder, str) else encoder
+    results = []
+    for batch_size in batch_sizes:
+        stats = {}
+        embed_texts(texts, encoder, batch_size, stats=stats)
+        results.append({'batch_size': batch_size, 'batches': stats['batches'],
+                        'seconds': stats['seconds'], 'chunks_per_sec': stats['chunks_per_sec']})
+    return results
+
+
+def main():
+    """Main function to handle command-line usage."""
+    args = sys.argv[1:]
+    try:
+        encoder_name = pop_option(args, "--encoder", DEFAULT_ENCODER)
+        batch_size = pop_option(args, "--batch-size", DEFAULT_BATCH_SIZE, int)
+        max_batch_tokens = pop_option(args, "--batch-budget", None, int)
+        tokenizer = pop_option(args, "--tokenizer")
+        benchmark = pop_option(args, "--benchmark")
+        cache_dir = pop_option(args, "--cache-dir")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if len(args) < 1 or (len(args) < 2 and not benchmark):
+        print("Usage: python embed.py <chunk_file> <vectors.npy> [--encoder NAME] [--batch-size N]")
+        print("       [--batch-budget N] [--tokenizer NAME] [--cache-dir DIR]")
+        print("       python embed.py <chunk_file> --benchmark 1,8,32,128")
+        print("Example: python embed.py output/chunks_1700000000.txt vectors.npy")
+        print("Example: python embed.py chunks.parquet vectors.npy --batch-size 128 --batch-budget 20000")
+        print("\nDefault values:")
+        print(f"  encoder: {DEFAULT_ENCODER} (available: {', '.join(available_encoders())})")
+        print(f"  batch-size: {DEFAULT_BATCH_SIZE} chunks")
+        print("  batch-budget: none; otherwise maximum characters (or tokens) per batch")
+        print(f"  tokenizer: none (available: {', '.join(available_tokenizers())})")
+        print("  cache-dir: none; otherwise only chunks not embedded before are encoded")
+        sys.exit(1)
+
+    if encoder_name not in available_encoders():
+        print(f"Error: Unknown encoder '{encoder_name}'. Available: {', '.join(available_encoders())}")
+        sys.exit(1)
+    if tokenizer and tokenizer not in available_tokenizers():
+        print(f"Error: Unknown tokenizer '{tokenizer}'. Available: {', '.join(available_tokenizers())}")
+        sys.exit(1)
+
+    # Imported here so the embedding API doesn't depend on the chunk file formats
+    from load_chunks import load_chunks
+
+    chunk_path = args[0]
+    start_time = time.time()
+    try:
+        encoder = get_encoder(encoder_name)
+
+        if benchmark:
+            texts = [chunk.text for chunk in load_chunks(chunk_path)]
+            batch_sizes = [int(size) for size in benchmark.split(",")]
+            print(f"Embedding throughput for {len(texts)} chunks with {encoder.encoder_id}:")
+            for result in benchmark_batch_sizes(texts, encoder, batch_sizes):
+                print(f"  batch size {result['batch_size']:>5}  {result['batches']:>7} batches  "
+                      f"{result['seconds']:>8.2f} s  {result['chunks_per_sec']:>10.1f} chunks/sec")
+            return
+
+        output_path = args[1]
+        stats = {}
+        vectors = embed_chunks(load_chunks(chunk_path), encoder, batch_size, max_batch_tokens,
+                               tokenizer, stats, cache_dir)
+        save_embeddings(vectors, output_path)
+
+        print(f"Embedded {stats['chunks']} chunks with {encoder.encoder_id} ({encoder.dim} dimensions)")
+        print(f"Batch size {batch_size}: {stats['batches']} batches, "
+              f"{stats['chunks_per_sec']:.1f} chunks/sec")
+        if stats['hit_ratio'] is not None:
+            print(f"Embedding cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses "
+                  f"({stats['hit_ratio']:.1%} hit ratio)")
+        print(f"Vectors saved to: {output_path}")
+        print(f"Total time taken: {time.time() - start_time:.2f} seconds")
+
+    except Exception as e:
+        print(f"Error embedding chunks: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
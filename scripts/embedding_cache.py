@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Embedding Cache
+Persistent cache of chunk embeddings keyed by (encoder id, SHA-1 of the
+chunk text), so re-ingesting a document only encodes chunks whose text
+changed.
+"""
+
+import os
+import json
+import hashlib
+
+import numpy as np
+
+# Bytes of a SHA-1 digest, the size of every record in the keys file
+KEY_BYTES = 20
+
+
+def text_key(text):
+    """
+    Hash a chunk text for cache lookups.
+
+    Args:
+        text (str): Chunk text
+
+    Returns:
+        bytes: 20-byte SHA-1 digest of the UTF-8 text
+    """
+    return hashlib.sha1(text.encode('utf-8')).digest()
+
+
+class EmbeddingCache:
+    """
+    Append-only embedding store for one encoder.
+    Vectors are appended as raw float32 rows to a .vectors file that is read
+    through a memory map, and their text digests to a .keys file in the same
+    order; an in-memory hash index maps digests to rows. Files are named after
+    the encoder id, so one cache_dir can hold several encoders. A single
+    process should write to a cache at a time.
+    """
+
+    def __init__(self, cache_dir, encoder_id, dim):
+        """
+        Open the cache, creating its files if needed.
+
+        Args:
+            cache_dir (str): Directory holding the cache files
+            encoder_id (str): Id of the encoder producing the vectors
+            dim (int): Vector dimensions
+
+        Raises:
+            ValueError: If the cache holds vectors of a different dimension
+        """
+        self.cache_dir = cache_dir
+        self.encoder_id = encoder_id
+        self.dim = dim
+        os.makedirs(cache_dir, exist_ok=True)
+
+        name = hashlib.sha1(encoder_id.encode('utf-8')).hexdigest()[:16]
+        self.meta_path = os.path.join(cache_dir, f"{name}.json")
+        self.keys_path = os.path.join(cache_dir, f"{name}.keys")
+        self.vectors_path = os.path.join(cache_dir, f"{name}.vectors")
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['dim'] != dim:
+                raise ValueError(f"Cache for {encoder_id} holds {meta['dim']}-dimensional vectors, not {dim}")
+        else:
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'encoder_id': encoder_id, 'dim': dim}, f)
+
+        self._index = {}
+        self._rows = self._recover()
+        self._mapped = None
+        self._mapped_rows = 0
+
+    def _recover(self):
+        # An interrupted append can leave one file ahead of the other; keep
+        # only rows present in both
+        row_bytes = self.dim * 4
+        key_rows = os.path.getsize(self.keys_path) // KEY_BYTES if os.path.exists(self.keys_path) else 0
+        vector_rows = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        rows = min(key_rows, vector_rows)
+        for path, size in ((self.keys_path, rows * KEY_BYTES), (self.vectors_path, rows * row_bytes)):
+            with open(path, 'ab') as f:
+                f.truncate(size)
+
+        with open(self.keys_path, 'rb') as f:
+            data = f.read()
+        for row in range(rows):
+            self._index[data[row * KEY_BYTES:(row + 1) * KEY_BYTES]] = row
+        return rows
+
+    def __len__(self):
+        return self._rows
+
+    def find(self, keys):
+        """
+        Look up rows for text digests.
+
+        Args:
+            keys (list): Digests from text_key
+
+        Returns:
+            numpy.ndarray: Row per key, -1 for misses
+        """
+        return np.array([self._index.get(key, -1) for key in keys], dtype=np.int64)
+
+    def vectors(self, rows):
+        """
+        Read cached vectors.
+
+        Args:
+            rows (numpy.ndarray): Rows from find or append, all valid
+
+        Returns:
+            numpy.ndarray: (len(rows), dim) float32 copy of the vectors
+        """
+        if self._mapped_rows != self._rows:
+            # Remap after appends; the file only grows, so old rows stay valid
+            self._mapped = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                     shape=(self._rows, self.dim)) if self._rows else None
+            self._mapped_rows = self._rows
+        if len(rows) == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return self._mapped[rows]
+
+    def append(self, keys, vectors):
+        """
+        Add vectors for new text digests.
+
+        Args:
+            keys (list): Digests from text_key, not already cached
+            vectors (numpy.ndarray): (len(keys), dim) float32 vectors
+
+        Returns:
+            numpy.ndarray: Rows the vectors were stored at
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        # Vectors first: a key is only ever written once its vector is on disk
+        with open(self.vectors_path, 'ab') as f:
+            f.write(vectors.tobytes())
+        with open(self.keys_path, 'ab') as f:
+            f.write(b"".join(keys))
+
+        rows = np.arange(self._rows, self._rows + len(keys), dtype=np.int64)
+        for key, row in zip(keys, rows):
+            self._index[key] = int(row)
+        self._rows += len(keys)
+        return rows
@@ -7,16 +7,422 @@ Extracts text content from PDF files.
 import fitz  # PyMuPDF
 import sys
 import os
+import re
 import time
+import json
+import math
+import hashlib
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 
+from cli_options import pop_option, pop_flag
+from pdf_source import check_source, is_in_memory, open_document
 
-def read_pdf_content(pdf_path):
+# Cache entries are keyed by extractor name and version; bump the version
+# whenever the extracted text would change for the same PDF bytes
+EXTRACTOR_NAME = "pymupdf"
+EXTRACTOR_VERSION = f"1-{fitz.VersionBind}"
+
+# Non-blank lines at the top and bottom of each page checked for running
+# headers and footers
+HEADER_FOOTER_LINES = 3
+
+# Fraction of pages a top/bottom line must appear on to be stripped
+HEADER_FOOTER_MIN_FRACTION = 0.5
+
+# Pages looked at before deciding which lines repeat, when pages are streamed
+HEADER_FOOTER_SAMPLE_PAGES = 50
+
+_DIGITS = re.compile(r"\d+")
+
+
+def _extract_page_range(task):
+    """
+    Extract text from a contiguous range of pages in a worker process.
+    Each worker opens its own document handle since fitz documents
+    cannot be shared across processes.
+    
+    Args:
+        task (tuple): (pdf_path, start_page, end_page) with end_page exclusive
+    
+    Returns:
+        list: Text of each page in the range, in page order
+    """
+    pdf_path, start_page, end_page = task
+    doc = fitz.open(pdf_path)
+    try:
+        return [doc[page_num].get_text() for page_num in range(start_page, end_page)]
+    finally:
+        doc.close()
+
+
+def _split_page_range(total_pages, workers):
+    """
+    Split pages into contiguous ranges, one per worker.
+    
+    Args:
+        total_pages (int): Number of pages in the document
+        workers (int): Number of worker processes
+    
+    Returns:
+        list: List of (start_page, end_page) tuples covering all pages in order
+    """
+    batch_size, remainder = divmod(total_pages, workers)
+    ranges = []
+    start_page = 0
+    for i in range(workers):
+        end_page = start_page + batch_size + (1 if i < remainder else 0)
+        if end_page > start_page:
+            ranges.append((start_page, end_page))
+        start_page = end_page
+    return ranges
+
+
+class PDFSession:
+    """
+    An open PDF document that serves page count, metadata and text
+    from a single handle, so the file is opened and parsed only once.
+    Use as a context manager or call close() when done.
+    """
+    
+    def __init__(self, pdf_path):
+        """
+        Open the PDF document.
+        
+        Args:
+            pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+                itself as bytes, bytearray, memoryview or mmap
+        
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            Exception: For other PDF opening errors
+        """
+        check_source(pdf_path)
+        
+        self.pdf_path = pdf_path
+        self.doc = open_document(pdf_path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @property
+    def page_count(self):
+        """int: Number of pages in the document."""
+        return len(self.doc)
+    
+    @property
+    def metadata(self):
+        """dict: PDF metadata."""
+        return self.doc.metadata
+    
+    def iter_pages(self, workers=1):
+        """
+        Yield pages one at a time as they are read.
+        
+        Args:
+            workers (int): Number of worker processes used to extract pages
+                in parallel (default: 1, extract serially from this handle).
+                In-memory sources are always extracted serially.
+        
+        Yields:
+            tuple: (page_number, text) for each page in order, page_number is 1-based
+        """
+        total_pages = self.page_count
+        
+        if workers > 1 and total_pages > 1 and not is_in_memory(self.pdf_path):
+            # Extract page ranges in parallel, each worker opens its own handle
+            # and results come back in page order
+            tasks = [(self.pdf_path, start, end)
+                     for start, end in _split_page_range(total_pages, workers)]
+            page_num = 0
+            with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+                for texts in executor.map(_extract_page_range, tasks):
+                    for text in texts:
+                        page_num += 1
+                        yield page_num, text
+        else:
+            for page_num in range(total_pages):
+                page = self.doc[page_num]
+                yield page_num + 1, page.get_text()
+    
+    def page_fingerprint(self, page_index):
+        """
+        Fingerprint a page by hashing its content stream and the streams of
+        the forms and images it draws.
+        Much cheaper than text extraction, so unchanged pages can be
+        detected without calling get_text().
+        
+        Args:
+            page_index (int): 0-based page index
+        
+        Returns:
+            str: Hex SHA-1 digest of the page's content and XObject streams
+        """
+        page = self.doc[page_index]
+        digest = hashlib.sha1(page.read_contents())
+        
+        # Pages with identical content streams can still differ in what they
+        # draw, e.g. "q /fzFrm0 Do Q" wrappers from show_pdf_page or scanned
+        # pages that each show their own image
+        xobjects = [(xref, name) for xref, name, *_ in page.get_xobjects()]
+        xobjects += [(image[0], image[7]) for image in page.get_images(full=True)]
+        seen = set()
+        for xref, name in xobjects:
+            if xref in seen:
+                continue
+            seen.add(xref)
+            digest.update(name.encode('utf-8'))
+            digest.update(hashlib.sha1(self.doc.xref_stream_raw(xref) or b"").digest())
+        return digest.hexdigest()
+    
+    def read_text(self, workers=1):
+        """
+        Read the text of all pages.
+        
+        Args:
+            workers (int): Number of worker processes for page extraction (default: 1)
+        
+        Returns:
+            str: Extracted text content from all pages
+        """
+        return "".join(text for _, text in self.iter_pages(workers))
+    
+    def close(self):
+        """Close the underlying document."""
+        if not self.doc.is_closed:
+            self.doc.close()
+
+
+def iter_pdf_pages(pdf_path, workers=1, cache=None):
+    """
+    Yield PDF pages one at a time as they are read.
+    This function is designed to be imported and used in other modules.
+    
+    Args:
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
+        workers (int): Number of worker processes used to extract pages
+            in parallel (default: 1, extract serially)
+        cache (ExtractionCache, optional): Cache of previously extracted pages.
+            On a hit the PDF is not opened at all.
+    
+    Yields:
+        tuple: (page_number, text) for each page in order, page_number is 1-based
+    
+    Raises:
+        FileNotFoundError: If PDF file doesn't exist
+        Exception: For other PDF reading errors
+    """
+    if cache is None:
+        with PDFSession(pdf_path) as session:
+            yield from session.iter_pages(workers)
+        return
+    
+    check_source(pdf_path)
+    
+    # Serve pages from the cache when this exact file was extracted before
+    key = cache.make_key(pdf_path, EXTRACTOR_NAME, EXTRACTOR_VERSION)
+    cached_pages = cache.get(key)
+    if cached_pages is not None:
+        for page_num, text in enumerate(cached_pages, start=1):
+            yield page_num, text
+        return
+    
+    pages = []
+    with PDFSession(pdf_path) as session:
+        for page_num, text in session.iter_pages(workers):
+            pages.append(text)
+            yield page_num, text
+    cache.put(key, pages)
+
+
+def load_page_state(state_path):
+    """
+    Load per-page fingerprints and text saved by a previous extraction.
+    
+    Args:
+        state_path (str): Path to the page state file
+    
+    Returns:
+        dict: Page state with a "pages" list, or None if the file is missing,
+            unreadable or was written by a different extractor version
+    """
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if state.get('extractor_version') != EXTRACTOR_VERSION:
+        return None
+    return state
+
+
+def save_page_state(state_path, state):
+    """
+    Save per-page fingerprints and text for the next incremental run.
+    
+    Args:
+        state_path (str): Path to the page state file
+        state (dict): Page state with a "pages" list
+    """
+    state = dict(state, extractor_version=EXTRACTOR_VERSION)
+    
+    # Write to a temporary file first so an interrupted run keeps the old state
+    state_dir = os.path.dirname(os.path.abspath(state_path))
+    fd, tmp_path = tempfile.mkstemp(dir=state_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def extract_pages_incremental(session, previous_pages=None):
+    """
+    Extract pages, re-reading only those whose fingerprint changed.
+    Unchanged pages reuse their previous entry, including any extra data
+    stored on it (e.g. chunks), so callers can splice old and new results.
+    
+    Args:
+        session (PDFSession): Open document to extract from
+        previous_pages (list, optional): "pages" list from load_page_state
+    
+    Returns:
+        tuple: (pages, changed_pages) where pages is a list of dicts with
+            "fingerprint" and "text" in page order, and changed_pages lists
+            the 1-based page numbers that were re-extracted
+    """
+    # Match by fingerprint rather than position so inserted or removed
+    # pages don't invalidate everything after them
+    previous_by_fingerprint = {}
+    for entry in previous_pages or []:
+        previous_by_fingerprint.setdefault(entry['fingerprint'], entry)
+    
+    pages = []
+    changed_pages = []
+    for page_index in range(session.page_count):
+        fingerprint = session.page_fingerprint(page_index)
+        previous_entry = previous_by_fingerprint.get(fingerprint)
+        if previous_entry is not None:
+            pages.append(dict(previous_entry))
+        else:
+            text = session.doc[page_index].get_text()
+            pages.append({'fingerprint': fingerprint, 'text': text})
+            changed_pages.append(page_index + 1)
+    
+    return pages, changed_pages
+
+
+def _edge_line_key(line):
+    """Compare header/footer lines with numbers masked, so "Page 3 of 9" matches "Page 4 of 9"."""
+    return _DIGITS.sub("#", line.strip())
+
+
+def _edge_line_indices(lines, edge_lines):
+    """Indices of the first and last edge_lines non-blank lines."""
+    nonblank = [i for i, line in enumerate(lines) if line.strip()]
+    return set(nonblank[:edge_lines] + nonblank[-edge_lines:])
+
+
+def find_repeated_lines(page_texts, edge_lines=HEADER_FOOTER_LINES,
+                        min_fraction=HEADER_FOOTER_MIN_FRACTION):
+    """
+    Find running headers and footers: lines near the top or bottom of a page
+    that appear on a large fraction of pages. Only the first and last
+    edge_lines non-blank lines of each page are counted, so body text is
+    never scanned.
+    
+    Args:
+        page_texts (list): Text of each page
+        edge_lines (int): Lines counted at the top and at the bottom (default: 3)
+        min_fraction (float): Fraction of pages a line must appear on (default: 0.5)
+    
+    Returns:
+        set: Repeated lines, stripped and with digits replaced by "#"
+    """
+    counts = Counter()
+    for text in page_texts:
+        lines = text.split("\n")
+        # Count each line once per page
+        counts.update({_edge_line_key(lines[i]) for i in _edge_line_indices(lines, edge_lines)})
+    
+    # A line on a single page is never boilerplate
+    min_pages = max(2, math.ceil(min_fraction * len(page_texts)))
+    return {line for line, count in counts.items() if count >= min_pages}
+
+
+def strip_repeated_lines(text, repeated, edge_lines=HEADER_FOOTER_LINES):
+    """
+    Remove repeated header/footer lines from the top and bottom of a page.
+    
+    Args:
+        text (str): Page text
+        repeated (set): Lines from find_repeated_lines
+        edge_lines (int): Lines checked at the top and at the bottom (default: 3)
+    
+    Returns:
+        str: Page text without its running header and footer lines
+    """
+    if not repeated:
+        return text
+    lines = text.split("\n")
+    drop = {i for i in _edge_line_indices(lines, edge_lines) if _edge_line_key(lines[i]) in repeated}
+    if not drop:
+        return text
+    return "\n".join(line for i, line in enumerate(lines) if i not in drop)
+
+
+def iter_stripped_pages(pages, edge_lines=HEADER_FOOTER_LINES,
+                        min_fraction=HEADER_FOOTER_MIN_FRACTION,
+                        sample_pages=HEADER_FOOTER_SAMPLE_PAGES):
+    """
+    Strip running headers and footers from a stream of pages.
+    Repeated lines are learned from the first sample_pages pages, which are
+    buffered, and then removed from every page.
+    
+    Args:
+        pages (iterable): (page_number, text) pairs in page order
+        edge_lines (int): Lines checked at the top and at the bottom (default: 3)
+        min_fraction (float): Fraction of sampled pages a line must appear on (default: 0.5)
+        sample_pages (int, optional): Pages to learn from; None uses every page,
+            buffering the whole document (default: 50)
+    
+    Yields:
+        tuple: (page_number, text) with headers and footers removed
+    """
+    pages = iter(pages)
+    sample = list(islice(pages, sample_pages) if sample_pages else pages)
+    repeated = find_repeated_lines([text for _, text in sample], edge_lines, min_fraction)
+    for page_number, text in chain(sample, pages):
+        yield page_number, strip_repeated_lines(text, repeated, edge_lines)
+
+
+def read_pdf_content(pdf_path, workers=1, cache=None, state_path=None, strip_headers=False):
     """
     Read and return PDF content without printing or saving.
     This function is designed to be imported and used in other modules.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
+        workers (int): Number of worker processes used to extract pages
+            in parallel (default: 1, extract serially)
+        cache (ExtractionCache, optional): Cache of previously extracted pages.
+            On a hit the PDF is not opened at all.
+        state_path (str, optional): Page state file. When given, only pages
+            whose fingerprint changed since the last run are re-extracted,
+            and the file is updated afterwards.
+        strip_headers (bool): Remove running headers and footers (lines at the
+            top or bottom of at least half of the pages) (default: False)
     
     Returns:
         str: Extracted text content from all pages
@@ -25,39 +431,42 @@ def read_pdf_content(pdf_path):
         FileNotFoundError: If PDF file doesn't exist
         Exception: For other PDF reading errors
     """
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(f"PDF file '{pdf_path}' not found.")
+    check_source(pdf_path)
     
     try:
-        # Open the PDF file
-        doc = fitz.open(pdf_path)
-        
-        # Extract text from all pages
-        text_content = []
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            text_content.append(text)
+        if state_path:
+            # Re-extract changed pages only and splice in the rest
+            state = load_page_state(state_path)
+            with PDFSession(pdf_path) as session:
+                pages, _ = extract_pages_incremental(session, state['pages'] if state else None)
+            save_page_state(state_path, dict(state or {}, pages=pages))
+            pages = [(page_number, page['text']) for page_number, page in enumerate(pages, start=1)]
+        else:
+            # Open the PDF file once (or not at all on a cache hit)
+            pages = iter_pdf_pages(pdf_path, workers, cache)
         
-        # Close the document
-        doc.close()
+        # All pages are joined anyway, so learn headers and footers from all of them
+        if strip_headers:
+            pages = iter_stripped_pages(pages, sample_pages=None)
         
-        # Combine all text
-        full_text = "".join(text_content)
+        # Combine text from all pages
+        full_text = "".join(text for _, text in pages)
         return full_text
     
     except Exception as e:
         raise Exception(f"Error reading PDF: {e}")
 
 
-def save_pdf_content(pdf_path, output_path):
+def save_pdf_content(pdf_path, output_path, workers=1):
     """
     Extract PDF content and save it to a text file.
     This function is designed to be imported and used in other modules.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
         output_path (str): Path to save the extracted text
+        workers (int): Number of worker processes for page extraction (default: 1)
     
     Returns:
         str: Path to the output file
@@ -67,7 +476,7 @@ def save_pdf_content(pdf_path, output_path):
         Exception: For other PDF reading or writing errors
     """
     # Read PDF content
-    content = read_pdf_content(pdf_path)
+    content = read_pdf_content(pdf_path, workers)
     
     # Save to output file
     try:
@@ -78,13 +487,20 @@ def save_pdf_content(pdf_path, output_path):
         raise Exception(f"Error saving content to file: {e}")
 
 
-def extract_text_from_pdf(pdf_path, output_path=None):
+def extract_text_from_pdf(pdf_path, output_path=None, workers=1, session=None, state_path=None,
+                          strip_headers=False):
     """
     Extract text content from a PDF file.
     
     Args:
         pdf_path (str): Path to the PDF file
         output_path (str, optional): Path to save extracted text. If None, prints to console.
+        workers (int): Number of worker processes for page extraction (default: 1)
+        session (PDFSession, optional): Already open document to read from.
+            If None, the PDF is opened here and closed when done.
+        state_path (str, optional): Page state file for incremental extraction.
+            When given, only pages that changed since the last run are re-extracted.
+        strip_headers (bool): Remove running headers and footers (default: False)
     
     Returns:
         str: Extracted text content
@@ -92,16 +508,29 @@ def extract_text_from_pdf(pdf_path, output_path=None):
     start_time = time.time()
     print(f"Starting extraction at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
     
+    owns_session = session is None
     try:
-        # Open the PDF file to get page count
-        doc = fitz.open(pdf_path)
-        total_pages = len(doc)
-        doc.close()
+        # Open the PDF file once for both page count and content
+        if owns_session:
+            session = PDFSession(pdf_path)
+        total_pages = session.page_count
         
         print(f"Total pages: {total_pages}\n")
         
-        # Use the reusable function to read content
-        full_text = read_pdf_content(pdf_path)
+        if state_path:
+            # Re-extract changed pages only and splice in the rest
+            state = load_page_state(state_path)
+            pages, changed_pages = extract_pages_incremental(
+                session, state['pages'] if state else None)
+            save_page_state(state_path, dict(state or {}, pages=pages))
+            print(f"Re-extracted {len(changed_pages)} of {total_pages} pages\n")
+            pages = [(page_number, page['text']) for page_number, page in enumerate(pages, start=1)]
+        else:
+            pages = session.iter_pages(workers)
+        
+        if strip_headers:
+            pages = iter_stripped_pages(pages, sample_pages=None)
+        full_text = "".join(text for _, text in pages)
         
         # Save or print the extracted text
         if output_path:
@@ -121,23 +550,29 @@ def extract_text_from_pdf(pdf_path, output_path=None):
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return None
+    
+    finally:
+        if owns_session and session is not None:
+            session.close()
 
 
-def extract_metadata(pdf_path):
+def extract_metadata(pdf_path, session=None):
     """
     Extract metadata from a PDF file.
     
     Args:
         pdf_path (str): Path to the PDF file
+        session (PDFSession, optional): Already open document to read from.
+            If None, the PDF is opened here and closed when done.
     
     Returns:
         dict: PDF metadata
     """
     try:
-        doc = fitz.open(pdf_path)
-        metadata = doc.metadata
-        doc.close()
-        return metadata
+        if session is not None:
+            return session.metadata
+        with PDFSession(pdf_path) as session:
+            return session.metadata
     except Exception as e:
         print(f"Error extracting metadata: {e}")
         return None
@@ -145,30 +580,57 @@ def extract_metadata(pdf_path):
 
 def main():
     """Main function to handle command-line usage."""
-    if len(sys.argv) < 2:
-        print("Usage: python extract_pdf.py <pdf_file> [output_file]")
+    args = sys.argv[1:]
+    try:
+        workers = pop_option(args, "--workers", 1, int)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    incremental = pop_flag(args, "--incremental")
+    strip_headers = pop_flag(args, "--strip-headers")
+    
+    if len(args) < 1:
+        print("Usage: python extract_pdf.py <pdf_file> [output_file] [--workers N] [--incremental] [--strip-headers]")
         print("Example: python extract_pdf.py document.pdf output.txt")
+        print("Example: python extract_pdf.py document.pdf output.txt --workers 4")
+        print("Example: python extract_pdf.py document.pdf output.txt --incremental")
+        print("\n--incremental keeps page fingerprints in <output_file>.pages.json and")
+        print("re-extracts only pages that changed since the last run.")
+        print("--strip-headers removes running headers, footers and page numbers.")
         sys.exit(1)
     
-    pdf_path = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+    pdf_path = args[0]
+    output_path = args[1] if len(args) > 1 else None
+    
+    if incremental and not output_path:
+        print("Error: --incremental requires an output_file.")
+        sys.exit(1)
+    state_path = f"{output_path}.pages.json" if incremental else None
     
     # Check if PDF file exists
     if not os.path.exists(pdf_path):
         print(f"Error: PDF file '{pdf_path}' not found.")
         sys.exit(1)
     
-    # Extract and display metadata
+    # Open the PDF once for metadata, page count and text
     print(f"Processing: {pdf_path}\n")
-    metadata = extract_metadata(pdf_path)
-    if metadata:
-        print("PDF Metadata:")
-        for key, value in metadata.items():
-            print(f"  {key}: {value}")
-        print()
-    
-    # Extract text content
-    extract_text_from_pdf(pdf_path, output_path)
+    try:
+        session = PDFSession(pdf_path)
+    except Exception as e:
+        print(f"Error opening PDF: {e}")
+        sys.exit(1)
+    
+    with session:
+        # Extract and display metadata
+        metadata = extract_metadata(pdf_path, session)
+        if metadata:
+            print("PDF Metadata:")
+            for key, value in metadata.items():
+                print(f"  {key}: {value}")
+            print()
+        
+        # Extract text content
+        extract_text_from_pdf(pdf_path, output_path, workers, session, state_path, strip_headers)
 
 
 if __name__ == "__main__":
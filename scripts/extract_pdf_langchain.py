@@ -7,59 +7,139 @@ Extracts text content from PDF files using LangChain document loaders.
 import sys
 import os
 import time
+from importlib.metadata import version
 from langchain_community.document_loaders import PyMuPDFLoader
+from langchain_community.document_loaders.parsers import PyMuPDFParser
+from langchain_core.documents import Document
+from langchain_core.documents.base import Blob
 
+from pdf_source import check_source, is_in_memory, source_buffer
 
-def load_pdf_documents(pdf_path):
+# Cache entries are keyed by extractor name and version; bump the version
+# whenever the loaded documents would change for the same PDF bytes
+EXTRACTOR_NAME = "langchain-pymupdf"
+EXTRACTOR_VERSION = f"2-{version('langchain-community')}"
+
+# Metadata naming where the PDF was read from; cache entries are keyed by
+# content, so these are not stored and are set from the current source instead
+SOURCE_METADATA_KEYS = ('source', 'file_path')
+
+
+def source_metadata(pdf_path):
     """
-    Load PDF and return LangChain Document objects without printing or saving.
+    Get the path-specific metadata the loader sets for a PDF source.
+
+    Args:
+        pdf_path (str or bytes-like): Path to the PDF file or its content
+
+    Returns:
+        dict: source and file_path; the loader stores "None" for content
+            without a path
+    """
+    source = str(None if is_in_memory(pdf_path) else pdf_path)
+    return {key: source for key in SOURCE_METADATA_KEYS}
+
+
+def iter_pdf_documents(pdf_path, cache=None):
+    """
+    Lazily load PDF pages as LangChain Document objects, one at a time.
+    Only the current page is held in memory unless a cache is given, in
+    which case pages are collected so they can be stored once loading ends.
     This function is designed to be imported and used in other modules.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
+        cache (ExtractionCache, optional): Cache of previously loaded documents.
+            On a hit the PDF is not opened at all.
     
-    Returns:
-        list: List of LangChain Document objects (one per page)
+    Yields:
+        Document: LangChain Document for each page in order
     
     Raises:
         FileNotFoundError: If PDF file doesn't exist
         Exception: For other PDF loading errors
     """
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(f"PDF file '{pdf_path}' not found.")
+    check_source(pdf_path)
     
     try:
-        loader = PyMuPDFLoader(pdf_path)
-        documents = loader.load()
-        return documents
+        # Serve documents from the cache when this exact file was loaded before
+        if cache is not None:
+            key = cache.make_key(pdf_path, EXTRACTOR_NAME, EXTRACTOR_VERSION)
+            cached_documents = cache.get(key)
+            if cached_documents is not None:
+                source = source_metadata(pdf_path)
+                for doc in cached_documents:
+                    yield Document(page_content=doc['page_content'],
+                                   metadata={**doc['metadata'], **source})
+                return
+        
+        if is_in_memory(pdf_path):
+            # Parse the content with the loader's own parser, no temporary file
+            # needed. A Blob holds bytes, so other buffers (mmap, memoryview,
+            # bytearray) are copied once here; the pymupdf backend reads them
+            # in place
+            blob = Blob.from_data(bytes(source_buffer(pdf_path)), mime_type="application/pdf")
+            documents = PyMuPDFParser().lazy_parse(blob)
+        else:
+            loader = PyMuPDFLoader(pdf_path)
+            documents = loader.lazy_load()
+        
+        if cache is None:
+            yield from documents
+            return
+        
+        cached_documents = []
+        for doc in documents:
+            metadata = {key: value for key, value in doc.metadata.items()
+                        if key not in SOURCE_METADATA_KEYS}
+            cached_documents.append({'page_content': doc.page_content, 'metadata': metadata})
+            yield doc
+        cache.put(key, cached_documents)
     except Exception as e:
         raise Exception(f"Error loading PDF: {e}")
 
 
-def read_pdf_content(pdf_path):
+def load_pdf_documents(pdf_path, cache=None):
     """
-    Read and return PDF content as a string without printing or saving.
+    Load PDF and return LangChain Document objects without printing or saving.
     This function is designed to be imported and used in other modules.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
+        cache (ExtractionCache, optional): Cache of previously loaded documents.
+            On a hit the PDF is not opened at all.
     
     Returns:
-        str: Extracted text content from all pages
+        list: List of LangChain Document objects (one per page)
     
     Raises:
         FileNotFoundError: If PDF file doesn't exist
         Exception: For other PDF loading errors
     """
-    documents = load_pdf_documents(pdf_path)
+    return list(iter_pdf_documents(pdf_path, cache))
+
+
+def read_pdf_content(pdf_path, cache=None):
+    """
+    Read and return PDF content as a string without printing or saving.
+    This function is designed to be imported and used in other modules.
+    
+    Args:
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
+        cache (ExtractionCache, optional): Cache of previously loaded documents
     
-    # Extract and combine text from all pages
-    text_content = []
-    for doc in documents:
-        text_content.append(doc.page_content)
+    Returns:
+        str: Extracted text content from all pages
     
-    # Combine all text
-    full_text = "".join(text_content)
+    Raises:
+        FileNotFoundError: If PDF file doesn't exist
+        Exception: For other PDF loading errors
+    """
+    # Extract and combine text from all pages, one page in memory at a time
+    full_text = "".join(doc.page_content for doc in iter_pdf_documents(pdf_path, cache))
     return full_text
 
 
@@ -122,12 +202,17 @@ def extract_metadata(pdf_path):
         pdf_path (str): Path to the PDF file
     
     Returns:
-        dict: PDF metadata from first page
+        dict: PDF metadata from first page (only the first page is loaded)
     """
     try:
-        documents = load_pdf_documents(pdf_path)
-        if documents:
-            return documents[0].metadata
+        # Only the first page is loaded; closing the generator releases the PDF
+        documents = iter_pdf_documents(pdf_path)
+        try:
+            first_document = next(documents, None)
+        finally:
+            documents.close()
+        if first_document is not None:
+            return first_document.metadata
         return None
     except Exception as e:
         print(f"Error extracting metadata: {e}")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Extraction Cache
+Content-addressed on-disk cache for extracted PDF content, keyed by a hash
+of the file bytes plus the extractor name and version.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+
+from pdf_source import hash_source
+
+# Default upper bound on the total size of cached entries (512 MB)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class ExtractionCache:
+    """
+    Size-bounded on-disk cache of extraction results.
+    Each entry is a JSON file named after its key; entries are evicted
+    least recently used first once the total size exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Create the cache, making cache_dir if needed.
+
+        Args:
+            cache_dir (str): Directory holding the cache entries
+            max_bytes (int): Maximum total size of all entries in bytes
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, pdf_path, extractor, version):
+        """
+        Build the cache key for a PDF and extractor.
+
+        Args:
+            pdf_path: Path to the PDF file or its content as bytes-like
+            extractor (str): Name of the extractor producing the entry
+            version (str): Version of the extractor; bump to invalidate entries
+
+        Returns:
+            str: Hex digest identifying the entry
+        """
+        key_source = f"{hash_source(pdf_path)}\0{extractor}\0{version}"
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        """
+        Store an entry, then evict old entries if the cache is over size.
+
+        Args:
+            key (str): Cache key from make_key
+            value: JSON-serializable value to store
+        """
+        # Write to a temporary file first so readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = []
+        total_bytes = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.json'):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except OSError:
+                pass
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+HNSW Vector Search
+Approximate cosine similarity search with a Hierarchical Navigable Small
+World graph (Malkov & Yashunin). Every vector is a node linked to its near
+neighbours on layer 0 and, with exponentially decreasing probability, on
+sparser upper layers; a query walks greedily down the layers and then runs a
+best-first search of width ef_search on layer 0, so it visits a small part
+of the corpus instead of scoring every chunk.
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+from vector_index import normalize_rows
+
+# Neighbours per node on the upper layers; layer 0 allows twice as many
+DEFAULT_M = 16
+
+# Search width while inserting; higher builds a better graph more slowly
+DEFAULT_EF_CONSTRUCTION = 100
+
+# Search width while querying; the recall / latency knob
+DEFAULT_EF_SEARCH = 64
+
+
+class HNSWIndex:
+    """
+    HNSW graph over L2-normalized float32 vectors with cosine similarity.
+    Vectors can be added at any time, e.g. as new PDFs are processed, and
+    ids default to continuing after the largest id so far, like VectorIndex.
+    """
+
+    def __init__(self, dim, M=DEFAULT_M, ef_construction=DEFAULT_EF_CONSTRUCTION,
+                 ef_search=DEFAULT_EF_SEARCH, seed=0):
+        """
+        Create an empty index.
+
+        Args:
+            dim (int): Vector dimensions
+            M (int): Neighbours per node on upper layers, 2 * M on layer 0 (default: 16)
+            ef_construction (int): Candidate list size while inserting (default: 100)
+            ef_search (int): Candidate list size while querying, at least k (default: 64)
+            seed (int): Seed for the random node levels (default: 0)
+        """
+        self.dim = dim
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+        # Level multiplier from the paper, so each layer has ~1/M of the nodes below it
+        self._level_mult = 1 / math.log(M)
+        self._rng = np.random.default_rng(seed)
+
+        self._vectors = np.empty((16, dim), dtype=np.float32)
+        self._ids = np.empty(16, dtype=np.int64)
+        self._count = 0
+        # _links[node][level] lists the node's neighbours on that level
+        self._links = []
+        self._entry = None
+        self._max_level = -1
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def vectors(self):
+        """numpy.ndarray: (n, dim) normalized vectors in insertion order."""
+        return self._vectors[:self._count]
+
+    @property
+    def ids(self):
+        """numpy.ndarray: Id of each vector in insertion order."""
+        return self._ids[:self._count]
+
+    def _max_links(self, level):
+        return 2 * self.M if level == 0 else self.M
+
+    def _random_level(self):
+        return int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+
+    def _search_layer(self, query, entry_points, ef, level):
+        """Best-first search of one layer; returns [(distance, node)] nearest first."""
+        vectors = self._vectors
+        visited = set(entry_points)
+        distances = (1.0 - vectors[entry_points] @ query).tolist()
+        candidates = list(zip(distances, entry_points))
+        heapq.heapify(candidates)
+        # Max-heap of the ef best nodes found so far, by negated distance
+        results = [(-distance, node) for distance, node in candidates]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        links = self._links
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if distance > -results[0][0]:
+                break
+            neighbors = [n for n in links[node][level] if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            # Score all unvisited neighbours with one product
+            worst = -results[0][0]
+            for neighbor_distance, neighbor in zip((1.0 - vectors[neighbors] @ query).tolist(), neighbors):
+                if len(results) < ef or neighbor_distance < worst:
+                    heapq.heappush(candidates, (neighbor_distance, neighbor))
+                    heapq.heappush(results, (-neighbor_distance, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+                    worst = -results[0][0]
+        return sorted((-distance, node) for distance, node in results)
+
+    def _select_neighbors(self, candidates, m):
+        """
+        Pick up to m neighbours from [(distance, node)] sorted nearest first.
+        A candidate closer to an already selected neighbour than to the base
+        node is skipped at first, which keeps links spread across directions;
+        skipped candidates then fill any remaining slots.
+        """
+        if len(candidates) <= m:
+            return [node for _, node in candidates]
+        
+        nodes = [node for _, node in candidates]
+        distances = np.array([distance for distance, _ in candidates], dtype=np.float32)
+        vectors = self._vectors[nodes]
+        # closer[i, j]: candidate j is closer to candidate i than to the base node
+        closer = (1.0 - vectors @ vectors.T) < distances
+        
+        alive = np.ones(len(nodes), dtype=bool)
+        selected = []
+        for i in range(len(nodes)):
+            if alive[i]:
+                selected.append(i)
+                if len(selected) >= m:
+                    break
+                alive &= ~closer[i]
+        skipped = [j for j in range(i + 1) if j not in selected]
+        selected.extend(skipped[:m - len(selected)])
+        return [nodes[i] for i in selected]
+
+    def _insert(self, node):
+        query = self._vectors[node]
+        level = self._random_level()
+        self._links.append([[] for _ in range(level + 1)])
+        if self._entry is None:
+            self._entry = node
+            self._max_level = level
+            return
+
+        # Greedy descent through the layers above the new node's level
+        entry_points = [self._entry]
+        for layer in range(self._max_level, level, -1):
+            entry_points = [self._search_layer(query, entry_points, 1, layer)[0][1]]
+
+        for layer in range(min(level, self._max_level), -1, -1):
+            found = self._search_layer(query, entry_points, self.ef_construction, layer)
+            neighbors = self._select_neighbors(found, self.M)
+            self._links[node][layer] = neighbors
+
+            max_links = self._max_links(layer)
+            for neighbor in neighbors:
+                links = self._links[neighbor][layer]
+                links.append(node)
+                if len(links) > max_links:
+                    # Re-pick the neighbour's links among its old ones and the new node
+                    distances = (1.0 - self._vectors[links] @ self._vectors[neighbor]).tolist()
+                    self._links[neighbor][layer] = self._select_neighbors(
+                        sorted(zip(distances, links)), max_links)
+            entry_points = [n for _, n in found]
+
+        if level > self._max_level:
+            self._entry = node
+            self._max_level = level
+
+    def add(self, vectors, ids=None):
+        """
+        Insert vectors into the graph.
+
+        Args:
+            vectors (numpy.ndarray): (n, dim) vectors; normalized on the way in
+            ids (iterable, optional): One id per vector (default: continue
+                from the largest id so far, starting at 1)
+
+        Returns:
+            numpy.ndarray: Ids of the added vectors
+
+        Raises:
+            ValueError: If the dimensions or the number of ids don't match
+        """
+        vectors = normalize_rows(vectors)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of shape (n, {self.dim}), got {vectors.shape}")
+        if ids is None:
+            start = int(self.ids.max()) + 1 if self._count else 1
+            ids = np.arange(start, start + len(vectors), dtype=np.int64)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            if len(ids) != len(vectors):
+                raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+
+        needed = self._count + len(vectors)
+        if needed > len(self._vectors):
+            # Double the capacity so incremental inserts stay amortized O(1)
+            capacity = max(2 * len(self._vectors), needed)
+            grown = np.empty((capacity, self.dim), dtype=np.float32)
+            grown[:self._count] = self.vectors
+            grown_ids = np.empty(capacity, dtype=np.int64)
+            grown_ids[:self._count] = self.ids
+            self._vectors, self._ids = grown, grown_ids
+
+        self._vectors[self._count:needed] = vectors
+        self._ids[self._count:needed] = ids
+        for node in range(self._count, needed):
+            self._count = node + 1
+            self._insert(node)
+        return ids
+
+    def search(self, query, k=5, ef_search=None):
+        """
+        Find approximately the most similar vectors to a query.
+
+        Args:
+            query (numpy.ndarray): (dim,) query vector
+            k (int): Number of results (default: 5)
+            ef_search (int, optional): Search width for this query (default:
+                the index's ef_search); raised to k if smaller
+
+        Returns:
+            tuple: (scores, ids), at most k each, most similar first
+        """
+        if self._entry is None:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        query = normalize_rows(query)
+        ef = max(ef_search or self.ef_search, k)
+
+        entry_points = [self._entry]
+        for layer in range(self._max_level, 0, -1):
+            entry_points = [self._search_layer(query, entry_points, 1, layer)[0][1]]
+        found = self._search_layer(query, entry_points, ef, 0)[:k]
+
+        scores = np.array([1.0 - distance for distance, _ in found], dtype=np.float32)
+        return scores, self._ids[[node for _, node in found]]
+
+    def search_batch(self, queries, k=5, ef_search=None):
+        """
+        Run search for each query.
+
+        Args:
+            queries (numpy.ndarray): (queries, dim) query vectors
+            k (int): Results per query (default: 5)
+            ef_search (int, optional): Search width (default: the index's ef_search)
+
+        Returns:
+            tuple: (scores, ids), both (queries, min(k, len(index)))
+        """
+        k = min(k, self._count)
+        all_scores = np.empty((len(queries), k), dtype=np.float32)
+        all_ids = np.empty((len(queries), k), dtype=np.int64)
+        for i, query in enumerate(queries):
+            all_scores[i], all_ids[i] = self.search(query, k, ef_search)
+        return all_scores, all_ids
+
+    def save(self, path):
+        """
+        Save the index as an .npz file.
+        Links are stored flattened: one count per (node, level) in node order,
+        followed by all neighbour lists concatenated.
+
+        Args:
+            path (str): Output path
+        """
+        levels = np.array([len(node_links) - 1 for node_links in self._links], dtype=np.int32)
+        counts = np.array([len(links) for node_links in self._links for links in node_links],
+                          dtype=np.int32)
+        neighbors = np.array([n for node_links in self._links for links in node_links for n in links],
+                             dtype=np.int32)
+        params = np.array([self.M, self.ef_construction, self.ef_search, self.seed,
+                           -1 if self._entry is None else self._entry, self._max_level], dtype=np.int64)
+        np.savez(path, vectors=self.vectors, ids=self.ids, levels=levels, counts=counts,
+                 neighbors=neighbors, params=params)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index written by save. More vectors can be added afterwards.
+
+        Args:
+            path (str): Path to the .npz file
+
+        Returns:
+            HNSWIndex: The loaded index
+        """
+        with np.load(path) as data:
+            M, ef_construction, ef_search, seed, entry, max_level = data['params'].tolist()
+            vectors = data['vectors']
+            index = cls(vectors.shape[1], M, ef_construction, ef_search, seed)
+            # Continue the level sequence rather than repeating it
+            index._rng = np.random.default_rng([seed, len(vectors)])
+            index._vectors = vectors.copy()
+            index._ids = data['ids'].copy()
+            index._count = len(vectors)
+            index._entry = None if entry < 0 else entry
+            index._max_level = max_level
+
+            counts = data['counts'].tolist()
+            neighbors = data['neighbors'].tolist()
+            position = 0
+            slot = 0
+            for level in data['levels'].tolist():
+                node_links = []
+                for _ in range(level + 1):
+                    node_links.append(neighbors[position:position + counts[slot]])
+                    position += counts[slot]
+                    slot += 1
+                index._links.append(node_links)
+        return index
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+IVF-PQ Vector Search
+Compressed approximate cosine similarity search. An inverted file (IVF)
+splits the vectors into nlist clusters with k-means, and only the nprobe
+clusters closest to a query are scanned. Within the clusters, each vector's
+residual from its centroid is product-quantized (PQ): split into m
+subvectors, each stored as the uint8 id of its nearest codebook entry, so a
+vector takes m bytes instead of 4 * dim. Queries score codes with
+asymmetric distance (ADC) lookup tables and can re-rank the best candidates
+exactly from the original vectors on disk.
+"""
+
+import numpy as np
+
+from vector_index import normalize_rows, top_k
+
+# Coarse clusters; about sqrt(n) suits most corpora
+DEFAULT_NLIST = 256
+
+# Subquantizers, i.e. bytes per vector; must divide the dimension
+DEFAULT_M = 16
+
+# Clusters scanned per query
+DEFAULT_NPROBE = 8
+
+# Entries per PQ codebook, so every code fits in one uint8
+CODEBOOK_SIZE = 256
+
+# Vectors assigned per distance computation in k-means, bounding its memory
+_ASSIGN_BLOCK = 8192
+
+
+def _nearest(data, centroids):
+    """Index of the nearest centroid (L2) for each row of data."""
+    centroid_norms = (centroids ** 2).sum(axis=1)
+    assignments = np.empty(len(data), dtype=np.int64)
+    for start in range(0, len(data), _ASSIGN_BLOCK):
+        block = data[start:start + _ASSIGN_BLOCK]
+        # ||x - c||^2 without the ||x||^2 term, which doesn't change the argmin
+        assignments[start:start + _ASSIGN_BLOCK] = np.argmin(centroid_norms - 2 * block @ centroids.T, axis=1)
+    return assignments
+
+
+def kmeans(data, k, iterations=20, seed=0):
+    """
+    Cluster rows with Lloyd's k-means.
+
+    Args:
+        data (numpy.ndarray): (n, dim) float32 training rows
+        k (int): Number of clusters; at most n
+        iterations (int): Assignment/update rounds (default: 20)
+        seed (int): Seed for the initial centroids (default: 0)
+
+    Returns:
+        numpy.ndarray: (k, dim) float32 centroids
+    """
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest(data, centroids)
+        counts = np.bincount(assignments, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, data)
+        # Re-seed empty clusters with random rows instead of dropping them
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, np.newaxis]
+        centroids[empty] = data[rng.choice(len(data), int(empty.sum()))]
+    return centroids
+
+
+class IVFPQIndex:
+    """
+    IVF-PQ index over L2-normalized float32 vectors with cosine similarity.
+    train() must be called on a sample before adding vectors. Ids default to
+    continuing after the largest id so far, like VectorIndex. For re-ranking,
+    attach the original vectors (e.g. the embeddings .npy file) with rows in
+    the order they were added.
+    """
+
+    def __init__(self, dim, nlist=DEFAULT_NLIST, m=DEFAULT_M, nprobe=DEFAULT_NPROBE):
+        """
+        Create an untrained index.
+
+        Args:
+            dim (int): Vector dimensions
+            nlist (int): Number of coarse clusters (default: 256)
+            m (int): Subquantizers, i.e. bytes per stored vector (default: 16)
+            nprobe (int): Clusters scanned per query (default: 8)
+
+        Raises:
+            ValueError: If m does not divide dim
+        """
+        if dim % m:
+            raise ValueError(f"m ({m}) must divide the dimension ({dim})")
+        self.dim = dim
+        self.nlist = nlist
+        self.m = m
+        self.nprobe = nprobe
+        self.centroids = None
+        self.codebooks = None
+
+        self.codes = np.empty((0, m), dtype=np.uint8)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.lists = np.empty(0, dtype=np.int32)
+        self._members = None
+        self._rerank_vectors = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def is_trained(self):
+        """bool: Whether the quantizers have been trained."""
+        return self.centroids is not None
+
+    @property
+    def nbytes(self):
+        """int: Bytes held by the stored codes, ids and cluster assignments."""
+        return self.codes.nbytes + self.ids.nbytes + self.lists.nbytes
+
+    def _split(self, vectors):
+        return vectors.reshape(len(vectors), self.m, self.dim // self.m)
+
+    def train(self, sample, iterations=20, seed=0):
+        """
+        Train the coarse quantizer and the PQ codebooks.
+
+        Args:
+            sample (numpy.ndarray): (n, dim) training vectors, ideally drawn
+                from the corpus; n must be at least nlist and 256
+            iterations (int): k-means rounds (default: 20)
+            seed (int): Random seed (default: 0)
+
+        Raises:
+            ValueError: If the sample is too small
+        """
+        sample = normalize_rows(sample)
+        if len(sample) < max(self.nlist, CODEBOOK_SIZE):
+            raise ValueError(f"Need at least {max(self.nlist, CODEBOOK_SIZE)} training vectors, "
+                             f"got {len(sample)}")
+
+        self.centroids = kmeans(sample, self.nlist, iterations, seed)
+        residuals = self._split(sample - self.centroids[_nearest(sample, self.centroids)])
+        self.codebooks = np.stack([kmeans(np.ascontiguousarray(residuals[:, sub]), CODEBOOK_SIZE,
+                                          iterations, seed + 1 + sub)
+                                   for sub in range(self.m)])
+
+    def encode(self, vectors):
+        """
+        Assign vectors to clusters and quantize their residuals.
+
+        Args:
+            vectors (numpy.ndarray): (n, dim) normalized vectors
+
+        Returns:
+            tuple: (lists, codes) with lists (n,) int32 and codes (n, m) uint8
+        """
+        lists = _nearest(vectors, self.centroids)
+        residuals = self._split(vectors - self.centroids[lists])
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for sub in range(self.m):
+            codes[:, sub] = _nearest(np.ascontiguousarray(residuals[:, sub]), self.codebooks[sub])
+        return lists.astype(np.int32), codes
+
+    def add(self, vectors, ids=None):
+        """
+        Encode and store vectors.
+        Attached re-rank vectors no longer cover the index afterwards, so
+        they are detached; attach the full set again to keep re-ranking.
+
+        Args:
+            vectors (numpy.ndarray): (n, dim) vectors; normalized on the way in
+            ids (iterable, optional): One id per vector (default: continue
+                from the largest id so far, starting at 1)
+
+        Returns:
+            numpy.ndarray: Ids of the added vectors
+
+        Raises:
+            ValueError: If the index is untrained, or the dimensions or the
+                number of ids don't match
+        """
+        if not self.is_trained:
+            raise ValueError("Train the index before adding vectors")
+        vectors = normalize_rows(vectors)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of shape (n, {self.dim}), got {vectors.shape}")
+        if ids is None:
+            start = int(self.ids.max()) + 1 if len(self.ids) else 1
+            ids = np.arange(start, start + len(vectors), dtype=np.int64)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            if len(ids) != len(vectors):
+                raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+
+        lists, codes = self.encode(vectors)
+        self.lists = np.concatenate([self.lists, lists])
+        self.codes = np.concatenate([self.codes, codes])
+        self.ids = np.concatenate([self.ids, ids])
+        self._members = None
+        self._rerank_vectors = None
+        return ids
+
+    def attach_vectors(self, vectors):
+        """
+        Attach the original vectors used for exact re-ranking.
+
+        Args:
+            vectors: (n, dim) array, or the path of a .npy file which is
+                memory-mapped so the vectors stay on disk; row i must be
+                the i-th vector added
+
+        Raises:
+            ValueError: If the row count doesn't match the index
+        """
+        if isinstance(vectors, str):
+            vectors = np.load(vectors, mmap_mode='r')
+        if len(vectors) != len(self):
+            raise ValueError(f"Got {len(vectors)} vectors for an index of {len(self)}")
+        self._rerank_vectors = vectors
+
+    def _list_members(self):
+        # Rows of each cluster, rebuilt lazily after adds
+        if self._members is None:
+            order = np.argsort(self.lists, kind='stable')
+            bounds = np.searchsorted(self.lists[order], np.arange(self.nlist + 1))
+            self._members = [order[bounds[i]:bounds[i + 1]] for i in range(self.nlist)]
+        return self._members
+
+    def search(self, query, k=5, nprobe=None, rerank=None):
+        """
+        Find approximately the most similar vectors to a query.
+
+        Args:
+            query (numpy.ndarray): (dim,) query vector
+            k (int): Number of results (default: 5)
+            nprobe (int, optional): Clusters to scan (default: the index's nprobe)
+            rerank (int, optional): Re-score this many of the best ADC
+                candidates exactly with the attached vectors (at least k)
+
+        Returns:
+            tuple: (scores, ids), at most k each, most similar first
+
+        Raises:
+            ValueError: If rerank is requested without attached vectors, or
+                vectors were added since they were attached
+        """
+        if rerank and self._rerank_vectors is None:
+            raise ValueError("Re-ranking needs the original vectors; call attach_vectors first")
+        if not len(self):
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        query = normalize_rows(query)
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+
+        # ADC lookup table: similarity of each query subvector to every codebook entry
+        table = np.einsum('sd,scd->sc', self._split(query[np.newaxis, :])[0], self.codebooks)
+        coarse = self.centroids @ query
+        probed = np.argpartition(-coarse, nprobe - 1)[:nprobe]
+
+        members = self._list_members()
+        rows = np.concatenate([members[cluster] for cluster in probed])
+        if not len(rows):
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        # q . (centroid + residual) = q . centroid + sum of table entries for the codes
+        scores = coarse[self.lists[rows]] + table[np.arange(self.m), self.codes[rows]].sum(axis=1)
+
+        candidates = max(rerank or 0, k)
+        best_scores, positions = top_k(scores[np.newaxis, :], min(candidates, len(rows)))
+        best_scores, best_rows = best_scores[0], rows[positions[0]]
+
+        if rerank:
+            # Exact scores for the shortlist, read from the (possibly mapped) vectors
+            order = np.argsort(best_rows)
+            exact = normalize_rows(np.asarray(self._rerank_vectors[best_rows[order]])) @ query
+            best_scores, positions = top_k(exact[np.newaxis, :], min(k, len(exact)))
+            best_scores, best_rows = best_scores[0], best_rows[order][positions[0]]
+        return best_scores[:k], self.ids[best_rows[:k]]
+
+    def search_batch(self, queries, k=5, nprobe=None, rerank=None):
+        """
+        Run search for each query.
+
+        Args:
+            queries (numpy.ndarray): (queries, dim) query vectors
+            k (int): Results per query (default: 5)
+            nprobe (int, optional): Clusters to scan (default: the index's nprobe)
+            rerank (int, optional): Candidates re-scored exactly per query
+
+        Returns:
+            tuple: (scores, ids), both (queries, min(k, len(index))); when the
+                probed clusters hold fewer vectors, rows are padded with
+                id -1 and score -inf
+        """
+        k = min(k, len(self))
+        all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        all_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        for i, query in enumerate(queries):
+            scores, ids = self.search(query, k, nprobe, rerank)
+            all_scores[i, :len(ids)] = scores
+            all_ids[i, :len(ids)] = ids
+        return all_scores, all_ids
+
+    def save(self, path):
+        """
+        Save the index as an .npz file. Attached re-rank vectors are not
+        saved; attach them again after loading.
+
+        Args:
+            path (str): Output path
+
+        Raises:
+            ValueError: If the index is untrained
+        """
+        if not self.is_trained:
+            raise ValueError("Cannot save an untrained index")
+        np.savez(path, centroids=self.centroids, codebooks=self.codebooks, codes=self.codes,
+                 ids=self.ids, lists=self.lists, params=np.array([self.nprobe]))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index written by save.
+
+        Args:
+            path (str): Path to the .npz file
+
+        Returns:
+            IVFPQIndex: The loaded index
+        """
+        with np.load(path) as data:
+            nlist, dim = data['centroids'].shape
+            index = cls(dim, nlist, data['codebooks'].shape[0], int(data['params'][0]))
+            index.centroids = data['centroids']
+            index.codebooks = data['codebooks']
+            index.codes = data['codes']
+            index.ids = data['ids']
+            index.lists = data['lists']
+        return index
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Chunk Loader
+Read chunk files written by rag_pipeline.py or chunk.py back as ChunkRecords,
+so later stages can reuse them instead of extracting and chunking again.
+Records are produced lazily: the text format is parsed as a stream, JSONL
+line by line, and Parquet/Arrow files are memory-mapped and read one record
+batch at a time.
+"""
+
+import sys
+import os
+import re
+import json
+import time
+
+# Add parent directory to path to import from scripts
+sys.path.insert(0, os.path.dirname(__file__))
+
+from chunk_records import ChunkRecord
+from chunk_output import OUTPUT_FORMATS, OUTPUT_EXTENSIONS, DEFAULT_BATCH_ROWS
+from cli_options import pop_option
+
+_CHUNK_HEADER = re.compile(r"=== Chunk (\d+)/(\d+) ===\n")
+_LENGTH_LINE = re.compile(r"Length: (\d+) characters\n")
+_DIVIDER_LINE = "-" * 50 + "\n"
+_SKIPPED_HEADER = "=== Skipped pages ===\n"
+
+
+def detect_format(path):
+    """
+    Guess a chunk file's format from its extension.
+
+    Args:
+        path (str): Path to the chunk file
+
+    Returns:
+        str: One of OUTPUT_FORMATS; unknown extensions are read as "text"
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for output_format, known in OUTPUT_EXTENSIONS.items():
+        if extension == known:
+            return output_format
+    return "text"
+
+
+def iter_text_chunks(path):
+    """
+    Parse the decorated text format one chunk at a time.
+    Each chunk's text is read as exactly its recorded length, so chunks that
+    contain blank lines or header-like lines are read back unchanged. The
+    text format has no offsets or pages, so those fields are None.
+
+    Args:
+        path (str): Path to a text chunk file
+
+    Yields:
+        ChunkRecord: Chunks in file order
+
+    Raises:
+        ValueError: If the file does not follow the text chunk format
+    """
+    # newline='' keeps "\r\n" inside chunks, so lengths match what was written
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        line = f.readline()
+        while line and line != _SKIPPED_HEADER:
+            header = _CHUNK_HEADER.fullmatch(line)
+            length = _LENGTH_LINE.fullmatch(f.readline())
+            if not header or not length or f.readline() != _DIVIDER_LINE:
+                raise ValueError(f"Malformed chunk header in {path}: {line!r}")
+
+            text = f.read(int(length.group(1)))
+            # Chunks end with the text's line break and an empty "\n" line,
+            # then a line break before the next header unless at the end
+            trailer = f.read(3)
+            if len(text) != int(length.group(1)) or trailer not in ("\n\n", "\n\n\n"):
+                raise ValueError(f"Truncated chunk {header.group(1)} in {path}")
+
+            yield ChunkRecord(text, None, None, None, None)
+            line = f.readline()
+
+
+def iter_jsonl_chunks(path):
+    """
+    Read a JSONL chunk file line by line.
+
+    Args:
+        path (str): Path to a .jsonl chunk file
+
+    Yields:
+        ChunkRecord: Chunks in file order
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                yield ChunkRecord(row['text'], row['start'], row['end'],
+                                  row['page_start'], row['page_end'])
+
+
+def open_chunk_table(path, output_format=None):
+    """
+    Memory-map a Parquet or Arrow chunk file as a pyarrow Table.
+    Arrow IPC files are mapped without copying; Parquet column chunks are
+    decoded from the mapped file. Requires pyarrow.
+
+    Args:
+        path (str): Path to a .parquet or .arrow chunk file
+        output_format (str, optional): "parquet" or "arrow" (default: from the extension)
+
+    Returns:
+        pyarrow.Table: Columns id, text, start, end, page_start and page_end
+
+    Raises:
+        ImportError: If pyarrow is not installed
+        ValueError: If the format is not columnar
+    """
+    output_format = output_format or detect_format(path)
+    if output_format not in ("parquet", "arrow"):
+        raise ValueError(f"Only parquet and arrow files can be opened as a table, not {output_format}")
+    # Imported here so the text and JSONL formats don't require pyarrow
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError(f"Reading {output_format} chunk files requires pyarrow: pip install pyarrow")
+
+    if output_format == "arrow":
+        return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    import pyarrow.parquet as pq
+    return pq.read_table(path, memory_map=True)
+
+
+def _iter_batches(path, output_format, batch_rows):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError(f"Reading {output_format} chunk files requires pyarrow: pip install pyarrow")
+    if output_format == "arrow":
+        reader = pa.ipc.open_file(pa.memory_map(path, 'r'))
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+    else:
+        import pyarrow.parquet as pq
+        yield from pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_rows)
+
+
+def iter_arrow_chunks(path, output_format=None, batch_rows=DEFAULT_BATCH_ROWS):
+    """
+    Read a memory-mapped Parquet or Arrow chunk file one batch at a time.
+    Only the current batch is converted to Python objects.
+
+    Args:
+        path (str): Path to a .parquet or .arrow chunk file
+        output_format (str, optional): "parquet" or "arrow" (default: from the extension)
+        batch_rows (int): Rows per batch when reading Parquet (default: 4096)
+
+    Yields:
+        ChunkRecord: Chunks in file order
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    output_format = output_format or detect_format(path)
+    fields = ('text', 'start', 'end', 'page_start', 'page_end')
+    for batch in _iter_batches(path, output_format, batch_rows):
+        columns = [batch.column(name).to_pylist() for name in fields]
+        for row in zip(*columns):
+            yield ChunkRecord(*row)
+
+
+def load_chunks(path, output_format=None):
+    """
+    Lazily load chunk records from a file written by the pipeline.
+
+    Args:
+        path (str): Path to a chunk file
+        output_format (str, optional): One of OUTPUT_FORMATS (default: from the extension)
+
+    Returns:
+        iterator: ChunkRecord instances in file order; text files give
+            None for offsets and pages
+
+    Raises:
+        FileNotFoundError: If the chunk file doesn't exist
+        ValueError: If output_format is unknown
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Chunk file '{path}' not found.")
+
+    output_format = output_format or detect_format(path)
+    if output_format == "text":
+        return iter_text_chunks(path)
+    if output_format == "jsonl":
+        return iter_jsonl_chunks(path)
+    if output_format in ("parquet", "arrow"):
+        return iter_arrow_chunks(path, output_format)
+    raise ValueError(f"Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+
+
+def main():
+    """Main function to handle command-line usage."""
+    args = sys.argv[1:]
+    try:
+        output_format = pop_option(args, "--format")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if len(args) < 1:
+        print("Usage: python load_chunks.py <chunk_file> [--format text|jsonl|parquet|arrow]")
+        print("Example: python load_chunks.py output/chunks_1700000000.txt")
+        print("Example: python load_chunks.py chunks.parquet")
+        print("\nThe format is taken from the file extension unless --format is given.")
+        sys.exit(1)
+
+    if output_format and output_format not in OUTPUT_FORMATS:
+        print(f"Error: Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+
+    chunk_path = args[0]
+    start_time = time.time()
+    try:
+        total_chunks = 0
+        total_chars = 0
+        pages = set()
+        for chunk in load_chunks(chunk_path, output_format):
+            total_chunks += 1
+            total_chars += len(chunk.text)
+            if chunk.page_start is not None:
+                pages.update(chunk.pages)
+
+        print(f"Loaded {total_chunks} chunks from: {chunk_path}")
+        print(f"Total characters: {total_chars}")
+        if pages:
+            print(f"Pages: {min(pages)}-{max(pages)}")
+        print(f"Total time taken: {time.time() - start_time:.2f} seconds")
+
+    except Exception as e:
+        print(f"Error loading chunks: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+PDF Source Helpers
+Lets extraction entry points accept either a filesystem path or the PDF
+content itself (bytes, bytearray, memoryview or mmap), so blobs can be
+extracted without writing them to a temporary file first.
+"""
+
+import os
+import mmap
+import hashlib
+
+import fitz  # PyMuPDF
+
+# In-memory source types accepted in place of a path
+IN_MEMORY_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+def is_in_memory(source):
+    """
+    Check whether a PDF source is in-memory content rather than a path.
+
+    Args:
+        source: Path to the PDF file or its content
+
+    Returns:
+        bool: True for bytes, bytearray, memoryview or mmap sources
+    """
+    return isinstance(source, IN_MEMORY_TYPES)
+
+
+def check_source(source):
+    """
+    Validate a PDF source before opening it.
+
+    Args:
+        source: Path to the PDF file or its content
+
+    Raises:
+        FileNotFoundError: If source is a path that doesn't exist
+    """
+    if not is_in_memory(source) and not os.path.exists(source):
+        raise FileNotFoundError(f"PDF file '{source}' not found.")
+
+
+def source_buffer(source):
+    """
+    Get a zero-copy buffer over in-memory PDF content.
+
+    Args:
+        source: In-memory PDF content
+
+    Returns:
+        bytes or memoryview: Buffer accepted by fitz.open(stream=...)
+    """
+    # fitz rejects mmap objects directly but accepts a memoryview over them
+    if isinstance(source, mmap.mmap):
+        return memoryview(source)
+    return source
+
+
+def open_document(source):
+    """
+    Open a PDF source with PyMuPDF.
+
+    Args:
+        source: Path to the PDF file or its content
+
+    Returns:
+        fitz.Document: The opened document
+    """
+    if is_in_memory(source):
+        return fitz.open(stream=source_buffer(source), filetype="pdf")
+    return fitz.open(source)
+
+
+def hash_source(source, block_size=1024 * 1024):
+    """
+    Compute the SHA-256 hash of a PDF source's bytes.
+
+    Args:
+        source: Path to the PDF file or its content
+        block_size (int): Number of bytes read per step for paths (default: 1 MB)
+
+    Returns:
+        str: Hex digest of the PDF content
+    """
+    digest = hashlib.sha256()
+    if is_in_memory(source):
+        digest.update(source_buffer(source))
+        return digest.hexdigest()
+
+    with open(source, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def describe_source(source):
+    """
+    Describe a PDF source for messages.
+
+    Args:
+        source: Path to the PDF file or its content
+
+    Returns:
+        str: The path, or a short description of in-memory content
+    """
+    if is_in_memory(source):
+        return f"<{type(source).__name__} of {len(source)} bytes>"
+    return str(source)
@@ -9,114 +9,614 @@ import sys
 import os
 import time
 import tempfile
+import glob
+import json
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor
 
 # Add parent directory to path to import from scripts
 sys.path.insert(0, os.path.dirname(__file__))
 
-from extract_pdf import read_pdf_content
-from chunk import chunk_text_content
+from extract_pdf import (PDFSession, load_page_state, save_page_state, extract_pages_incremental,
+                         iter_stripped_pages)
+from backends import DEFAULT_BACKEND, get_backend, available_backends
+from supervised_extract import DEFAULT_PAGE_TIMEOUT, iter_pdf_pages_supervised
+from chunk import CHUNK_ENGINES, make_chunker, iter_chunk_spans
+from chunk_records import ChunkRecord, PageIndex
+from token_length import available_tokenizers
+from dedup import drop_near_duplicates
+from chunk_output import OUTPUT_FORMATS, OUTPUT_EXTENSIONS, write_chunk_output
+from embed import DEFAULT_ENCODER, DEFAULT_BATCH_SIZE, BatchEmbedder, available_encoders, save_embeddings
+from cli_options import pop_option, pop_flag
+from extraction_cache import ExtractionCache
 
 
-def preprocess(pdf_path, chunk_size=500, chunk_overlap=100):
+def iter_preprocess(pdf_path, chunk_size=500, chunk_overlap=100, workers=1, cache=None,
+                    backend=DEFAULT_BACKEND, page_timeout=None, memory_limit_mb=None, stats=None,
+                    chunker=None, strip_headers=False, dedup_threshold=None):
+    """
+    Preprocess PDF incrementally: chunk pages as they are extracted.
+    Pages are streamed through chunk.iter_chunk_spans, so only a bounded window
+    of text is held in memory (the whole text with a tokenizer-sized chunker).
+    Chunks still span page boundaries: they are exactly the chunks of the
+    concatenated page texts, the same as
+    chunk_text_content(read_pdf_content(pdf_path)) for the same settings.
+    
+    Args:
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
+        chunk_size (int): Maximum size of each chunk (default: 500)
+        chunk_overlap (int): Overlap between chunks (default: 100)
+        workers (int): Number of worker processes for page extraction (default: 1)
+        cache (ExtractionCache, optional): Cache of previously extracted pages
+        backend (str): Name of the extraction backend (default: "pymupdf"),
+            see backends.available_backends()
+        page_timeout (float, optional): Seconds allowed per page. When this or
+            memory_limit_mb is set, pages are extracted with PyMuPDF in a
+            supervised worker process (see supervised_extract) and pages that
+            exceed the budget are skipped; backend, workers and cache are not used.
+        memory_limit_mb (int, optional): Memory ceiling for the supervised worker in MB
+        stats (dict, optional): Receives a "skipped_pages" list of
+            {"page": page_number, "reason": str} entries, and "duplicate_chunks"
+            when dedup_threshold is set
+        chunker (Chunker or NativeChunker, optional): Reusable chunker; when given, its settings
+            are used instead of chunk_size and chunk_overlap
+        strip_headers (bool): Remove running headers and footers before chunking,
+            learned from the first pages (see extract_pdf.iter_stripped_pages)
+        dedup_threshold (float, optional): Drop chunks whose estimated similarity
+            to an earlier chunk reaches this value (see dedup.drop_near_duplicates)
+    
+    Yields:
+        ChunkRecord: Chunks in document order with their offsets and pages
+    
+    Raises:
+        FileNotFoundError: If PDF file doesn't exist
+        Exception: For other processing errors
+    """
+    if page_timeout or memory_limit_mb:
+        pages = iter_pdf_pages_supervised(pdf_path, page_timeout or DEFAULT_PAGE_TIMEOUT,
+                                          memory_limit_mb, stats)
+    else:
+        pages = get_backend(backend)(pdf_path, workers, cache)
+    if strip_headers:
+        pages = iter_stripped_pages(pages)
+    if chunker is None:
+        chunker = make_chunker(chunk_size, chunk_overlap)
+    
+    # Page start offsets are recorded as pages stream past, so each chunk's
+    # pages are found by binary search over them
+    page_index = PageIndex()
+    records = (page_index.record(chunk, start, end)
+               for chunk, start, end in iter_chunk_spans(page_index.track(pages), chunker))
+    
+    # Drop repeated boilerplate such as headers, footers and disclaimers
+    if dedup_threshold:
+        records = drop_near_duplicates(records, dedup_threshold, stats, key=attrgetter('text'))
+    yield from records
+
+
+def preprocess_incremental(pdf_path, state_path, chunk_size=500, chunk_overlap=100, chunker=None):
+    """
+    Preprocess PDF, re-extracting and re-chunking only changed pages.
+    Each page is chunked on its own and its chunk offsets are stored with the
+    page fingerprint in the state file, so unchanged pages are spliced back
+    in from the previous run without re-chunking their text.
+    
+    Args:
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
+        state_path (str): Page state file, created on the first run
+        chunk_size (int): Maximum size of each chunk (default: 500)
+        chunk_overlap (int): Overlap between chunks (default: 100)
+        chunker (Chunker or NativeChunker, optional): Reusable chunker; when given, its settings
+            are used instead of chunk_size and chunk_overlap
+    
+    Returns:
+        tuple: (chunks, changed_pages) where chunks is a list of ChunkRecord
+            and changed_pages lists the 1-based page numbers re-processed
+    
+    Raises:
+        FileNotFoundError: If PDF file doesn't exist
+        Exception: For other processing errors
+    """
+    if chunker is None:
+        chunker = make_chunker(chunk_size, chunk_overlap)
+    settings = {'chunk_size': chunker.chunk_size, 'chunk_overlap': chunker.chunk_overlap,
+                'tokenizer': chunker.tokenizer}
+    
+    state = load_page_state(state_path) or {}
+    previous_pages = state.get('pages')
+    
+    # Stored chunks are only valid for the chunk settings they were built with
+    if previous_pages and any(state.get(key) != value for key, value in settings.items()):
+        previous_pages = [{'fingerprint': page['fingerprint'], 'text': page['text']}
+                          for page in previous_pages]
+    
+    with PDFSession(pdf_path) as session:
+        pages, changed_pages = extract_pages_incremental(session, previous_pages)
+    
+    chunks = []
+    offset = 0
+    for page_number, page in enumerate(pages, start=1):
+        text = page['text']
+        if 'chunk_spans' not in page:
+            # States written before offsets were stored hold chunk strings instead
+            page.pop('chunks', None)
+            page['chunk_spans'] = [list(span) for span in chunker.split_offsets(text).spans()]
+        for start, end in page['chunk_spans']:
+            chunks.append(ChunkRecord(text[start:end], offset + start, offset + end,
+                                      page_number, page_number))
+        offset += len(text)
+    
+    save_page_state(state_path, {'pages': pages, **settings})
+    return chunks, changed_pages
+
+
+def preprocess(pdf_path, chunk_size=500, chunk_overlap=100, workers=1, cache=None,
+               state_path=None, backend=DEFAULT_BACKEND, page_timeout=None,
+               memory_limit_mb=None, stats=None, chunker=None, dedup_threshold=None,
+               strip_headers=False):
     """
     Preprocess PDF: extract content and chunk it.
     This function is designed to be imported and used in other modules.
+    The chunks are those of chunking the concatenated page texts at once,
+    except with state_path, where each page is chunked on its own.
     
     Args:
-        pdf_path (str): Path to the PDF file
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
         chunk_size (int): Maximum size of each chunk (default: 500)
         chunk_overlap (int): Overlap between chunks (default: 100)
+        workers (int): Number of worker processes for page extraction (default: 1)
+        cache (ExtractionCache, optional): Cache of previously extracted pages
+        state_path (str, optional): Page state file. When given, only pages that
+            changed since the last run are re-extracted and re-chunked (see
+            preprocess_incremental); workers, cache and backend are not used.
+        backend (str): Name of the extraction backend (default: "pymupdf"),
+            see backends.available_backends()
+        page_timeout (float, optional): Seconds allowed per page. When this or
+            memory_limit_mb is set, pages are extracted with PyMuPDF in a
+            supervised worker process (see supervised_extract) and pages that
+            exceed the budget are skipped; backend, workers and cache are not used.
+        memory_limit_mb (int, optional): Memory ceiling for the supervised worker in MB
+        stats (dict, optional): Receives a "skipped_pages" list of
+            {"page": page_number, "reason": str} entries, and "duplicate_chunks"
+            when dedup_threshold is set
+        chunker (Chunker or NativeChunker, optional): Reusable chunker; when given, its settings
+            are used instead of chunk_size and chunk_overlap
+        dedup_threshold (float, optional): Drop chunks whose estimated similarity
+            to an earlier chunk reaches this value (see dedup.drop_near_duplicates)
+        strip_headers (bool): Remove running headers and footers before chunking;
+            not used with state_path (default: False)
     
     Returns:
-        list: List of text chunks (strings)
+        list: List of ChunkRecord, each chunk with its character offsets into
+            the document text (pages concatenated) and its page range
     
     Raises:
         FileNotFoundError: If PDF file doesn't exist
         Exception: For other processing errors
     """
-    # Read PDF content
-    content = read_pdf_content(pdf_path)
-    
-    # Chunk the content
-    chunks = chunk_text_content(content, chunk_size, chunk_overlap)
+    if state_path:
+        chunks, _ = preprocess_incremental(pdf_path, state_path, chunk_size, chunk_overlap,
+                                           chunker)
+        if dedup_threshold:
+            chunks = drop_near_duplicates(chunks, dedup_threshold, stats, key=attrgetter('text'))
+        return list(chunks)
     
-    return chunks
+    # Read PDF content page by page and chunk it as pages arrive
+    return list(iter_preprocess(pdf_path, chunk_size, chunk_overlap, workers, cache, backend,
+                                page_timeout, memory_limit_mb, stats, chunker, strip_headers,
+                                dedup_threshold))
 
 
-def process_pdf(input_path, output_path, chunk_size=500, chunk_overlap=100):
+def process_pdf(input_path, output_path, chunk_size=500, chunk_overlap=100, workers=1,
+                cache=None, state_path=None, backend=DEFAULT_BACKEND, page_timeout=None,
+                memory_limit_mb=None, chunk_engine="langchain", tokenizer=None,
+                dedup_threshold=None, strip_headers=False, output_format="text",
+                embeddings_path=None, encoder=DEFAULT_ENCODER, embed_batch_size=DEFAULT_BATCH_SIZE,
+                embed_budget=None, embed_cache_dir=None):
     """
-    Process PDF: extract content and chunk it.
+    Process PDF: extract content, chunk it and optionally embed the chunks.
     
     Args:
         input_path (str): Path to input PDF file
-        output_path (str): Path to output text file with chunks
+        output_path (str): Path to output file with chunks
         chunk_size (int): Maximum size of each chunk (default: 500)
         chunk_overlap (int): Overlap between chunks (default: 100)
+        workers (int): Number of worker processes for page extraction (default: 1)
+        cache (ExtractionCache, optional): Cache of previously extracted pages
+        state_path (str, optional): Page state file for incremental processing
+        backend (str): Name of the extraction backend (default: "pymupdf")
+        page_timeout (float, optional): Seconds allowed per page; slower pages are skipped
+        memory_limit_mb (int, optional): Memory ceiling for page extraction in MB
+        chunk_engine (str): Chunking engine, "langchain" or "native" (default: "langchain")
+        tokenizer (str, optional): Measure chunk_size and chunk_overlap in tokens
+            of this tokenizer instead of characters (langchain engine only)
+        dedup_threshold (float, optional): Similarity at which near-duplicate chunks are dropped
+        strip_headers (bool): Remove running headers and footers before chunking
+            (not with state_path)
+        output_format (str): "text", or "jsonl", "parquet" or "arrow" to stream
+            rows with id, text, offsets and pages as chunks are produced (default: "text")
+        embeddings_path (str, optional): Save chunk embeddings to this .npy file;
+            row i belongs to chunk id i + 1
+        encoder (str): Registered encoder name (default: "hashing")
+        embed_batch_size (int): Maximum chunks per encoder call (default: 64)
+        embed_budget (int, optional): Maximum characters per embedding batch,
+            or tokens when tokenizer is set
+        embed_cache_dir (str, optional): Embedding cache directory; only chunks
+            whose text was not embedded before are encoded
     
     Returns:
-        list: List of text chunks
+        int: Number of chunks written, or None if processing failed. Chunks
+            are streamed to output_path rather than collected, so they are
+            no longer returned; read them back with load_chunks.load_chunks,
+            or call preprocess for an in-memory list
     """
     start_time = time.time()
     print(f"Starting PDF processing at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
     print(f"Input: {input_path}")
     print(f"Output: {output_path}\n")
     
+    stats = {}
     try:
-        # Use the reusable preprocess function to get chunks
+        chunker = make_chunker(chunk_size, chunk_overlap, chunk_engine, tokenizer)
+        unit = "tokens" if tokenizer else "characters"
+        
+        # Use the reusable preprocess functions to get chunks
         print("Step 1: Extracting PDF content...")
         print("Step 2: Chunking content...")
-        chunks = preprocess(input_path, chunk_size, chunk_overlap)
+        if state_path:
+            chunks, changed_pages = preprocess_incremental(input_path, state_path,
+                                                           chunk_size, chunk_overlap, chunker)
+            print(f"Re-processed {len(changed_pages)} changed pages")
+            if dedup_threshold:
+                chunks = drop_near_duplicates(chunks, dedup_threshold, stats,
+                                              key=attrgetter('text'))
+        else:
+            # Chunks are produced as pages are extracted and streamed to the output
+            chunks = iter_preprocess(input_path, chunk_size, chunk_overlap, workers, cache,
+                                     backend, page_timeout, memory_limit_mb, stats, chunker,
+                                     strip_headers, dedup_threshold)
         
-        total_chunks = len(chunks)
-        print(f"Created {total_chunks} chunks")
-        print(f"Chunk size: {chunk_size} characters")
-        print(f"Chunk overlap: {chunk_overlap} characters\n")
+        # Chunks are embedded in batches as they pass on to the output file
+        embedder = None
+        if embeddings_path:
+            embedder = BatchEmbedder(encoder, embed_batch_size, embed_budget, tokenizer,
+                                     embed_cache_dir)
+            chunks = embedder.tap(chunks)
         
         # Step 3: Save chunks to output file
         print("Step 3: Saving chunks to output file...")
-        output_lines = []
-        for i, chunk in enumerate(chunks):
-            chunk_header = f"=== Chunk {i + 1}/{total_chunks} ==="
-            chunk_length = f"Length: {len(chunk)} characters"
-            
-            output_lines.append(chunk_header)
-            output_lines.append(chunk_length)
-            output_lines.append("-" * 50)
-            output_lines.append(chunk)
-            output_lines.append("\n")
+        total_chunks = write_chunk_output(chunks, output_path, output_format, stats)
+        print(f"Chunks saved to: {output_path}")
         
-        full_output = "\n".join(output_lines)
+        if embedder:
+            save_embeddings(embedder.finish(), embeddings_path)
+            embed_stats = embedder.stats
+            print(f"Embedded {embed_stats['chunks']} chunks with {embedder.encoder.encoder_id} in "
+                  f"{embed_stats['batches']} batches of up to {embed_batch_size} "
+                  f"({embed_stats['chunks_per_sec']:.1f} chunks/sec)")
+            if embed_stats['hit_ratio'] is not None:
+                print(f"Embedding cache: {embed_stats['cache_hits']} hits, "
+                      f"{embed_stats['cache_misses']} misses ({embed_stats['hit_ratio']:.1%} hit ratio)")
+            print(f"Embeddings saved to: {embeddings_path}")
+        print()
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(full_output)
+        skipped_pages = stats.get('skipped_pages', [])
+        if skipped_pages:
+            print(f"Skipped {len(skipped_pages)} pages:")
+            for skipped in skipped_pages:
+                print(f"  Page {skipped['page']}: {skipped['reason']}")
         
-        print(f"Chunks saved to: {output_path}")
+        if dedup_threshold:
+            print(f"Dropped {stats.get('duplicate_chunks', 0)} near-duplicate chunks")
+        
+        print(f"Created {total_chunks} chunks")
+        print(f"Chunk size: {chunk_size} {unit}")
+        print(f"Chunk overlap: {chunk_overlap} {unit}")
         
         end_time = time.time()
         elapsed_time = end_time - start_time
         print(f"\nProcessing completed at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))}")
         print(f"Total time taken: {elapsed_time:.2f} seconds")
         
-        return chunks
+        return total_chunks
     
     except Exception as e:
         print(f"Error processing PDF: {e}")
         return None
 
 
+def find_pdfs(pattern):
+    """
+    Find the PDFs named by a directory or glob pattern.
+    
+    Args:
+        pattern (str): Directory (searched for *.pdf, non-recursively) or glob
+            pattern such as "docs/**/*.pdf"
+    
+    Returns:
+        list: Sorted PDF paths
+    """
+    if os.path.isdir(pattern):
+        return sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                      if name.lower().endswith('.pdf'))
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+def _batch_output_paths(input_paths, output_dir, extension=".txt"):
+    """Map each input PDF to a per-document output file, keeping names unique."""
+    output_paths = []
+    used_names = set()
+    for input_path in input_paths:
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        name = f"{stem}.chunks{extension}"
+        suffix = 1
+        while name in used_names:
+            suffix += 1
+            name = f"{stem}_{suffix}.chunks{extension}"
+        used_names.add(name)
+        output_paths.append(os.path.join(output_dir, name))
+    return output_paths
+
+
+# Chunker reused by every document a batch pool worker processes
+_batch_chunker = None
+
+
+def _init_batch_worker(chunk_size, chunk_overlap, chunk_engine, tokenizer):
+    """Pool initializer: build the worker's chunker once."""
+    global _batch_chunker
+    _batch_chunker = make_chunker(chunk_size, chunk_overlap, chunk_engine, tokenizer)
+
+
+def _process_batch_item(task):
+    """
+    Preprocess one PDF of a batch in a pool worker and write its output.
+    Errors are returned rather than raised so one bad file doesn't stop the batch.
+    """
+    input_path, output_path, chunk_size, chunk_overlap, output_format, options = task
+    started = time.perf_counter()
+    stats = {}
+    try:
+        chunks = iter_preprocess(input_path, chunk_size, chunk_overlap, stats=stats,
+                                 chunker=_batch_chunker, **options)
+        total_chunks = write_chunk_output(chunks, output_path, output_format, stats)
+        error = None
+    except Exception as e:
+        error = str(e)
+        total_chunks = 0
+    
+    return {
+        'input': input_path,
+        'output': output_path if error is None else None,
+        'chunks': total_chunks,
+        'skipped_pages': len(stats.get('skipped_pages', [])),
+        'duplicate_chunks': stats.get('duplicate_chunks', 0),
+        'seconds': round(time.perf_counter() - started, 4),
+        'error': error,
+    }
+
+
+def process_batch(input_paths, output_dir, chunk_size=500, chunk_overlap=100, jobs=None,
+                  cache=None, backend=DEFAULT_BACKEND, page_timeout=None, memory_limit_mb=None,
+                  chunk_engine="langchain", tokenizer=None, dedup_threshold=None,
+                  strip_headers=False, output_format="text"):
+    """
+    Process many PDFs in one long-lived process with a bounded worker pool.
+    Pool workers are reused across documents, so Python startup, imports and
+    splitter setup are paid once per worker rather than once per PDF.
+    Each PDF gets its own output file and a summary.json is written to output_dir.
+    
+    Args:
+        input_paths (list): PDF files to process
+        output_dir (str): Directory for per-document outputs and the summary
+        chunk_size (int): Maximum size of each chunk (default: 500)
+        chunk_overlap (int): Overlap between chunks (default: 100)
+        jobs (int, optional): Number of worker processes (default: CPU count)
+        cache (ExtractionCache, optional): Cache of previously extracted pages
+        backend (str): Name of the extraction backend (default: "pymupdf")
+        page_timeout (float, optional): Seconds allowed per page; slower pages are skipped
+        memory_limit_mb (int, optional): Memory ceiling for page extraction in MB
+        chunk_engine (str): Chunking engine, "langchain" or "native" (default: "langchain")
+        tokenizer (str, optional): Measure chunk sizes in tokens of this tokenizer
+        dedup_threshold (float, optional): Similarity at which near-duplicate chunks are dropped
+        strip_headers (bool): Remove running headers and footers before chunking
+        output_format (str): Per-document output format, see chunk_output.OUTPUT_FORMATS
+            (default: "text")
+    
+    Returns:
+        dict: Summary with per-file timings, totals and documents_per_minute
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(input_paths) or 1))
+    options = {'cache': cache, 'backend': backend, 'page_timeout': page_timeout,
+               'memory_limit_mb': memory_limit_mb, 'dedup_threshold': dedup_threshold,
+               'strip_headers': strip_headers}
+    output_paths = _batch_output_paths(input_paths, output_dir, OUTPUT_EXTENSIONS[output_format])
+    tasks = [(input_path, output_path, chunk_size, chunk_overlap, output_format, options)
+             for input_path, output_path in zip(input_paths, output_paths)]
+    
+    started = time.perf_counter()
+    files = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                             initargs=(chunk_size, chunk_overlap, chunk_engine, tokenizer)) as executor:
+        for i, result in enumerate(executor.map(_process_batch_item, tasks)):
+            status = f"{result['chunks']} chunks" if result['error'] is None else f"ERROR: {result['error']}"
+            print(f"[{i + 1}/{len(tasks)}] {result['input']}: {status} ({result['seconds']:.2f}s)")
+            files.append(result)
+    elapsed = time.perf_counter() - started
+    
+    failed = sum(1 for result in files if result['error'] is not None)
+    summary = {
+        'documents': len(files),
+        'succeeded': len(files) - failed,
+        'failed': failed,
+        'total_chunks': sum(result['chunks'] for result in files),
+        'duplicate_chunks': sum(result['duplicate_chunks'] for result in files),
+        'jobs': jobs,
+        'total_seconds': round(elapsed, 4),
+        'documents_per_minute': round(len(files) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        'files': files,
+    }
+    
+    with open(os.path.join(output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    
+    return summary
+
+
+def run_batch(pattern, args, jobs, cache, **options):
+    """Handle the --batch command-line mode; options are passed to process_batch."""
+    input_paths = find_pdfs(pattern)
+    if not input_paths:
+        print(f"Error: No PDF files found for '{pattern}'.")
+        sys.exit(1)
+    
+    if len(args) > 0 and not args[0].isdigit():
+        output_dir = args[0]
+        chunk_size = int(args[1]) if len(args) > 1 else 500
+        chunk_overlap = int(args[2]) if len(args) > 2 else 100
+    else:
+        epoch_time = int(time.time())
+        output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output',
+                                  f'batch_{epoch_time}')
+        chunk_size = int(args[0]) if len(args) > 0 else 500
+        chunk_overlap = int(args[1]) if len(args) > 1 else 100
+    
+    start_time = time.time()
+    print(f"Starting batch processing at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
+    print(f"Input: {len(input_paths)} PDFs from {pattern}")
+    print(f"Output: {output_dir}\n")
+    
+    summary = process_batch(input_paths, output_dir, chunk_size, chunk_overlap, jobs, cache,
+                            **options)
+    
+    print(f"\nProcessed {summary['succeeded']}/{summary['documents']} PDFs "
+          f"({summary['failed']} failed) into {summary['total_chunks']} chunks")
+    if summary['duplicate_chunks']:
+        print(f"Dropped {summary['duplicate_chunks']} near-duplicate chunks")
+    print(f"Workers: {summary['jobs']}")
+    print(f"Throughput: {summary['documents_per_minute']:.2f} documents/minute")
+    print(f"Summary saved to: {os.path.join(output_dir, 'summary.json')}")
+    print(f"Total time taken: {summary['total_seconds']:.2f} seconds")
+
+
 def main():
     """Main function to handle command-line usage."""
-    if len(sys.argv) < 2:
-        print("Usage: python rag_pipeline.py <input_pdf> [output_file] [chunk_size] [chunk_overlap]")
+    args = sys.argv[1:]
+    try:
+        workers = pop_option(args, "--workers", None, int)
+        cache_dir = pop_option(args, "--cache-dir")
+        cache_max_mb = pop_option(args, "--cache-max-mb", 512, int)
+        backend = pop_option(args, "--backend", DEFAULT_BACKEND)
+        page_timeout = pop_option(args, "--page-timeout", None, float)
+        memory_limit_mb = pop_option(args, "--memory-limit-mb", None, int)
+        batch_pattern = pop_option(args, "--batch")
+        jobs = pop_option(args, "--jobs", None, int)
+        chunk_engine = pop_option(args, "--chunk-engine", "langchain")
+        tokenizer = pop_option(args, "--tokenizer")
+        dedup_threshold = pop_option(args, "--dedup-threshold", None, float)
+        output_format = pop_option(args, "--format", "text")
+        embeddings_path = pop_option(args, "--embed")
+        encoder = pop_option(args, "--encoder", DEFAULT_ENCODER)
+        embed_batch_size = pop_option(args, "--embed-batch-size", DEFAULT_BATCH_SIZE, int)
+        embed_budget = pop_option(args, "--embed-budget", None, int)
+        embed_cache_dir = pop_option(args, "--embed-cache-dir")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    incremental = pop_flag(args, "--incremental")
+    strip_headers = pop_flag(args, "--strip-headers")
+    
+    if backend not in available_backends():
+        print(f"Error: Unknown backend '{backend}'. Available: {', '.join(available_backends())}")
+        sys.exit(1)
+    if chunk_engine not in CHUNK_ENGINES:
+        print(f"Error: Unknown chunking engine '{chunk_engine}'. Available: {', '.join(CHUNK_ENGINES)}")
+        sys.exit(1)
+    if tokenizer and tokenizer not in available_tokenizers():
+        print(f"Error: Unknown tokenizer '{tokenizer}'. Available: {', '.join(available_tokenizers())}")
+        sys.exit(1)
+    if tokenizer and chunk_engine != "langchain":
+        print("Error: --tokenizer requires the langchain chunking engine")
+        sys.exit(1)
+    if output_format not in OUTPUT_FORMATS:
+        print(f"Error: Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+        sys.exit(1)
+    if encoder not in available_encoders():
+        print(f"Error: Unknown encoder '{encoder}'. Available: {', '.join(available_encoders())}")
+        sys.exit(1)
+    if embed_batch_size < 1:
+        print(f"Error: --embed-batch-size must be at least 1, got {embed_batch_size}")
+        sys.exit(1)
+    if embeddings_path and batch_pattern:
+        print("Error: --embed is not supported with --batch; embed each output with embed.py")
+        sys.exit(1)
+    if batch_pattern and (workers is not None or incremental):
+        # Batch mode parallelizes across documents with --jobs and keeps no page state
+        print("Error: --workers and --incremental are not supported with --batch; use --jobs")
+        sys.exit(1)
+    if strip_headers and incremental:
+        print("Error: --strip-headers cannot be combined with --incremental")
+        sys.exit(1)
+    if dedup_threshold is not None and not 0 < dedup_threshold <= 1:
+        print(f"Error: --dedup-threshold must be between 0 and 1, got {dedup_threshold}")
+        sys.exit(1)
+    
+    # Reuse previous extractions of unchanged PDFs
+    cache = ExtractionCache(cache_dir, cache_max_mb * 1024 * 1024) if cache_dir else None
+    
+    if batch_pattern:
+        run_batch(batch_pattern, args, jobs, cache, backend=backend, page_timeout=page_timeout,
+                  memory_limit_mb=memory_limit_mb, chunk_engine=chunk_engine, tokenizer=tokenizer,
+                  dedup_threshold=dedup_threshold, strip_headers=strip_headers,
+                  output_format=output_format)
+        return
+    
+    if len(args) < 1:
+        print("Usage: python rag_pipeline.py <input_pdf> [output_file] [chunk_size] [chunk_overlap] [--workers N]")
+        print("       [--cache-dir DIR] [--cache-max-mb MB] [--incremental] [--backend NAME]")
+        print("       [--page-timeout SECONDS] [--memory-limit-mb MB] [--chunk-engine NAME] [--tokenizer NAME]")
+        print("       [--dedup-threshold SIMILARITY] [--strip-headers] [--format text|jsonl|parquet|arrow]")
+        print("       [--embed VECTORS.npy] [--encoder NAME] [--embed-batch-size N] [--embed-budget N]")
+        print("       [--embed-cache-dir DIR]")
+        print("       python rag_pipeline.py --batch <pdf_dir|glob> [output_dir] [chunk_size] [chunk_overlap]")
+        print("       [--jobs N] (plus the options above except --workers and --incremental)")
         print("Example: python rag_pipeline.py input.pdf output.txt 500 100")
         print("Example: python rag_pipeline.py input.pdf  (uses default output directory)")
+        print("Example: python rag_pipeline.py input.pdf output.txt --workers 4")
+        print("Example: python rag_pipeline.py input.pdf chunks.parquet --format parquet")
+        print("Example: python rag_pipeline.py input.pdf output.txt --embed vectors.npy --embed-batch-size 128")
+        print("Example: python rag_pipeline.py --batch 'manuals/*.pdf' output/manuals --jobs 4")
         print("\nDefault values:")
-        print("  output_file: output/chunks_<epoch_time>.txt")
+        print("  output_file: output/chunks_<epoch_time>.txt (extension follows --format)")
         print("  chunk_size: 500 characters")
         print("  chunk_overlap: 100 characters")
+        print("  workers: 1 (serial page extraction)")
+        print("  cache-dir: none (no extraction cache)")
+        print("  cache-max-mb: 512")
+        print(f"  backend: {DEFAULT_BACKEND} (available: {', '.join(available_backends())})")
+        print("  page-timeout / memory-limit-mb: none (pages are not supervised)")
+        print(f"  chunk-engine: langchain (available: {', '.join(CHUNK_ENGINES)})")
+        print(f"  tokenizer: none, sizes are in characters (available: {', '.join(available_tokenizers())})")
+        print("  format: text (decorated dump); jsonl, parquet and arrow stream rows with")
+        print("          id, text, start/end offsets and page_start/page_end")
+        print("  dedup-threshold: none (keep near-duplicate chunks), e.g. 0.85 drops repeated boilerplate")
+        print("  embed: none (chunks are not embedded)")
+        print(f"  encoder: {DEFAULT_ENCODER} (available: {', '.join(available_encoders())})")
+        print(f"  embed-batch-size: {DEFAULT_BATCH_SIZE} chunks per encoder call")
+        print("  embed-budget: none; otherwise maximum characters (tokens with --tokenizer) per batch")
+        print("  embed-cache-dir: none (every chunk is encoded)")
+        print("  batch output_dir: output/batch_<epoch_time>")
+        print("  jobs: number of CPUs")
+        print("\n--incremental keeps page fingerprints and chunks in a .pages.json file next to")
+        print("the output and re-processes only pages that changed since the last run.")
+        print("--strip-headers removes running headers, footers and page numbers before chunking.")
         sys.exit(1)
     
-    input_path = sys.argv[1]
+    input_path = args[0]
     
     # Check if input PDF exists
     if not os.path.exists(input_path):
@@ -124,23 +624,30 @@ def main():
         sys.exit(1)
     
     # Determine output path
-    if len(sys.argv) > 2 and not sys.argv[2].isdigit():
-        output_path = sys.argv[2]
-        chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 500
-        chunk_overlap = int(sys.argv[4]) if len(sys.argv) > 4 else 100
+    if len(args) > 1 and not args[1].isdigit():
+        output_path = args[1]
+        state_path = f"{output_path}.pages.json"
+        chunk_size = int(args[2]) if len(args) > 2 else 500
+        chunk_overlap = int(args[3]) if len(args) > 3 else 100
     else:
         # Use default output directory with epoch time
         output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output')
         os.makedirs(output_dir, exist_ok=True)
         
         epoch_time = int(time.time())
-        output_path = os.path.join(output_dir, f'chunks_{epoch_time}.txt')
+        output_path = os.path.join(output_dir, f'chunks_{epoch_time}{OUTPUT_EXTENSIONS[output_format]}')
+        
+        # Output names change every run, so key page state on the input name
+        state_path = os.path.join(output_dir, f'{os.path.basename(input_path)}.pages.json')
         
-        chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
-        chunk_overlap = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+        chunk_size = int(args[1]) if len(args) > 1 else 500
+        chunk_overlap = int(args[2]) if len(args) > 2 else 100
     
     # Process the PDF
-    process_pdf(input_path, output_path, chunk_size, chunk_overlap)
+    process_pdf(input_path, output_path, chunk_size, chunk_overlap, workers or 1, cache,
+                state_path if incremental else None, backend, page_timeout, memory_limit_mb,
+                chunk_engine, tokenizer, dedup_threshold, strip_headers, output_format,
+                embeddings_path, encoder, embed_batch_size, embed_budget, embed_cache_dir)
 
 
 if __name__ == "__main__":
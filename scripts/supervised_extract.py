@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Supervised PDF Extraction
+Extracts pages in a separate worker process with a per-page time budget and
+memory ceiling, so one pathological page can't stall a whole run. Pages that
+exceed the budget are skipped and recorded instead of blocking the batch.
+"""
+
+import resource
+import multiprocessing
+
+from pdf_source import check_source, is_in_memory, open_document, source_buffer
+
+# Default time budget for extracting a single page, in seconds
+DEFAULT_PAGE_TIMEOUT = 30.0
+
+# Time allowed for a (re)started worker to import PyMuPDF and open the PDF
+WORKER_STARTUP_TIMEOUT = 60.0
+
+
+def _page_worker(source, start_page, conn, memory_limit_mb):
+    """
+    Worker process: extract pages from start_page onwards and send each one back.
+    Messages are (kind, page_index, payload) tuples where kind is "count"
+    (payload is the page count), "page" (payload is the text) or "error"
+    (payload describes why the page failed).
+    """
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    try:
+        doc = open_document(source)
+        conn.send(("count", None, len(doc)))
+    except Exception as e:
+        conn.send(("error", None, f"cannot open PDF: {e}"))
+        conn.close()
+        return
+
+    for page_index in range(start_page, len(doc)):
+        try:
+            conn.send(("page", page_index, doc[page_index].get_text()))
+        except MemoryError:
+            conn.send(("error", page_index, "memory limit exceeded"))
+        except Exception as e:
+            conn.send(("error", page_index, str(e)))
+
+    doc.close()
+    conn.close()
+
+
+def iter_pdf_pages_supervised(pdf_path, page_timeout=DEFAULT_PAGE_TIMEOUT, memory_limit_mb=None,
+                              stats=None):
+    """
+    Yield PDF pages extracted in a supervised worker process.
+    If a page takes longer than page_timeout, fails, or kills the worker
+    (e.g. by hitting the memory ceiling), it is yielded with empty text and
+    recorded as skipped; the worker is restarted at the following page.
+
+    Args:
+        pdf_path (str or bytes-like): Path to the PDF file, or the PDF content
+            itself as bytes, bytearray, memoryview or mmap
+        page_timeout (float): Seconds allowed per page (default: 30)
+        memory_limit_mb (int, optional): Address space limit for the worker
+            process in MB, including the interpreter and PyMuPDF itself
+        stats (dict, optional): Receives a "skipped_pages" list of
+            {"page": page_number, "reason": str} entries
+
+    Yields:
+        tuple: (page_number, text) for each page in order, page_number is 1-based
+
+    Raises:
+        FileNotFoundError: If PDF file doesn't exist
+        Exception: If the worker cannot open the PDF
+    """
+    check_source(pdf_path)
+
+    # mmap and memoryview sources can't be sent to another process
+    source = bytes(source_buffer(pdf_path)) if is_in_memory(pdf_path) else pdf_path
+    skipped_pages = stats.setdefault('skipped_pages', []) if stats is not None else []
+    context = multiprocessing.get_context('spawn')
+
+    next_page = 0
+    total_pages = None
+    while total_pages is None or next_page < total_pages:
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        process = context.Process(target=_page_worker,
+                                  args=(source, next_page, child_conn, memory_limit_mb),
+                                  daemon=True)
+        process.start()
+        child_conn.close()
+
+        try:
+            # The worker reports the page count once it has opened the PDF
+            if not parent_conn.poll(WORKER_STARTUP_TIMEOUT):
+                raise Exception("extraction worker did not start")
+            try:
+                kind, _, payload = parent_conn.recv()
+            except EOFError:
+                raise Exception("extraction worker exited while opening the PDF")
+            if kind == "error":
+                raise Exception(payload)
+            total_pages = payload
+
+            while next_page < total_pages:
+                reason = None
+                if not parent_conn.poll(page_timeout):
+                    reason = f"timed out after {page_timeout:g} seconds"
+                else:
+                    try:
+                        kind, page_index, payload = parent_conn.recv()
+                    except EOFError:
+                        reason = "worker crashed (memory limit exceeded?)"
+
+                if reason is not None:
+                    # Give up on this page and restart the worker after it
+                    skipped_pages.append({'page': next_page + 1, 'reason': reason})
+                    yield next_page + 1, ""
+                    next_page += 1
+                    break
+
+                if kind == "page":
+                    yield page_index + 1, payload
+                else:
+                    skipped_pages.append({'page': page_index + 1, 'reason': payload})
+                    yield page_index + 1, ""
+                next_page = page_index + 1
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join()
+            parent_conn.close()
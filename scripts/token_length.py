@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Token Length Functions
+Registry of local tokenizers for sizing chunks in tokens instead of
+characters, and memoized length functions built on them.
+"""
+
+import re
+from functools import lru_cache
+
+# Fragments remembered per tokenizer; the recursive splitter measures the same
+# splits and merged windows again and again while building chunks
+DEFAULT_CACHE_SIZE = 65536
+
+_TOKENIZERS = {}
+
+# Words and individual punctuation marks, roughly how subword tokenizers
+# count ordinary prose
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def register_tokenizer(name):
+    """
+    Register a tokenizer under a name.
+    The decorated function is called with no arguments and must return a
+    count(text) callable giving the number of tokens in text.
+
+    Args:
+        name (str): Name used to select the tokenizer
+
+    Returns:
+        callable: Decorator that registers and returns the function
+    """
+    def decorator(fn):
+        _TOKENIZERS[name] = fn
+        return fn
+    return decorator
+
+
+def available_tokenizers():
+    """
+    List registered tokenizer names.
+
+    Returns:
+        list: Sorted tokenizer names
+    """
+    return sorted(_TOKENIZERS)
+
+
+def get_token_counter(name):
+    """
+    Load a registered tokenizer.
+
+    Args:
+        name (str): Tokenizer name
+
+    Returns:
+        callable: count(text) returning the number of tokens in text
+
+    Raises:
+        ValueError: If no tokenizer is registered under that name
+        ImportError: If the tokenizer's optional dependency is not installed
+    """
+    try:
+        factory = _TOKENIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown tokenizer '{name}'. "
+                         f"Available: {', '.join(available_tokenizers())}")
+    return factory()
+
+
+@lru_cache(maxsize=None)
+def get_length_function(name, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Get a memoized token length function for a tokenizer.
+    One function is shared per (name, cache_size), so chunkers built with the
+    same tokenizer share its cache and the cached text splitter.
+
+    Args:
+        name (str): Tokenizer name
+        cache_size (int): Number of fragments to remember (default: 65536)
+
+    Returns:
+        callable: length(text) with an lru_cache; see cache_info()
+
+    Raises:
+        ValueError: If no tokenizer is registered under that name
+        ImportError: If the tokenizer's optional dependency is not installed
+    """
+    return lru_cache(maxsize=cache_size)(get_token_counter(name))
+
+
+@register_tokenizer("words")
+def _words_tokenizer():
+    """Dependency-free count of words and punctuation marks."""
+    def count(text):
+        return sum(1 for _ in _WORD_PATTERN.finditer(text))
+    return count
+
+
+@register_tokenizer("tiktoken")
+def _tiktoken_tokenizer():
+    """OpenAI's cl100k_base BPE via tiktoken (optional dependency)."""
+    # Imported here so the other tokenizers don't require tiktoken
+    try:
+        import tiktoken
+    except ImportError:
+        raise ImportError("The 'tiktoken' tokenizer requires tiktoken: pip install tiktoken")
+    encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count(text):
+        return len(encoding.encode(text, disallowed_special=()))
+    return count
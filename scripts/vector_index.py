@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Exact Vector Search
+Brute-force cosine similarity search over chunk embeddings. Vectors are kept
+L2-normalized in one float32 matrix, so a query is a single matrix product
+followed by a partial sort of the scores. This is the reference the
+approximate indexes are measured against.
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add parent directory to path to import from scripts
+sys.path.insert(0, os.path.dirname(__file__))
+
+from cli_options import pop_option
+
+# Queries scored per matrix product in search_batch; bounds the score matrix
+# to QUERY_BLOCK x len(index) floats
+QUERY_BLOCK = 256
+
+
+def normalize_rows(vectors):
+    """
+    Scale vectors to unit length for cosine similarity.
+
+    Args:
+        vectors (numpy.ndarray): (n, dim) or (dim,) array
+
+    Returns:
+        numpy.ndarray: float32 array of unit vectors; zero vectors stay zero.
+            The input is returned as is if it is already normalized float32
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    if np.allclose(norms[norms > 0], 1.0, atol=1e-4):
+        return vectors
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def top_k(scores, k):
+    """
+    Pick the k highest scores of each row.
+
+    Args:
+        scores (numpy.ndarray): (queries, n) similarity scores
+        k (int): Results per row, at most n
+
+    Returns:
+        tuple: (scores, positions), both (queries, k), best first
+    """
+    if k < scores.shape[1]:
+        # Partition first so only k scores per row are sorted
+        positions = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        positions = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    best = np.take_along_axis(scores, positions, axis=1)
+    order = np.argsort(-best, axis=1, kind='stable')
+    return np.take_along_axis(best, order, axis=1), np.take_along_axis(positions, order, axis=1)
+
+
+class VectorIndex:
+    """
+    Exact cosine similarity index.
+    Each vector has an id; by default ids follow the embedding rows, so id
+    i + 1 is chunk id i + 1 of the chunk file the embeddings came from.
+    """
+
+    def __init__(self, dim):
+        """
+        Create an empty index.
+
+        Args:
+            dim (int): Vector dimensions
+        """
+        self.dim = dim
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_embeddings(cls, path, mmap=True):
+        """
+        Build an index over an embeddings file from embed.save_embeddings.
+
+        Args:
+            path (str): Path to the .npy file
+            mmap (bool): Memory-map already normalized vectors instead of
+                loading them (default: True)
+
+        Returns:
+            VectorIndex: Index with ids 1..n
+        """
+        vectors = np.load(path, mmap_mode='r' if mmap else None)
+        index = cls(vectors.shape[1])
+        index.add(vectors)
+        return index
+
+    def add(self, vectors, ids=None):
+        """
+        Add vectors to the index.
+
+        Args:
+            vectors (numpy.ndarray): (n, dim) vectors; normalized on the way in
+            ids (iterable, optional): One id per vector (default: continue
+                from the largest id so far, starting at 1)
+
+        Returns:
+            numpy.ndarray: Ids of the added vectors
+
+        Raises:
+            ValueError: If the dimensions or the number of ids don't match
+        """
+        vectors = normalize_rows(vectors)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of shape (n, {self.dim}), got {vectors.shape}")
+        if ids is None:
+            start = int(self.ids.max()) + 1 if len(self.ids) else 1
+            ids = np.arange(start, start + len(vectors), dtype=np.int64)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            if len(ids) != len(vectors):
+                raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+
+        if len(self.ids):
+            self.vectors = np.concatenate([self.vectors, vectors])
+            self.ids = np.concatenate([self.ids, ids])
+        else:
+            # Keep a memory-mapped input mapped rather than copying it
+            self.vectors = vectors
+            self.ids = ids
+        return ids
+
+    def search(self, query, k=5):
+        """
+        Find the vectors most similar to one query.
+
+        Args:
+            query (numpy.ndarray): (dim,) query vector
+            k (int): Number of results (default: 5)
+
+        Returns:
+            tuple: (scores, ids), at most k each, most similar first
+        """
+        scores, ids = self.search_batch(np.asarray(query)[np.newaxis, :], k)
+        return scores[0], ids[0]
+
+    def search_batch(self, queries, k=5):
+        """
+        Find the most similar vectors for many queries with one matrix
+        product per block of queries.
+
+        Args:
+            queries (numpy.ndarray): (queries, dim) query vectors
+            k (int): Results per query (default: 5)
+
+        Returns:
+            tuple: (scores, ids), both (queries, min(k, len(index))), most
+                similar first
+        """
+        queries = normalize_rows(queries)
+        k = min(k, len(self))
+        all_scores = np.empty((len(queries), k), dtype=np.float32)
+        all_ids = np.empty((len(queries), k), dtype=np.int64)
+        if k == 0:
+            return all_scores, all_ids
+
+        for start in range(0, len(queries), QUERY_BLOCK):
+            block = slice(start, start + QUERY_BLOCK)
+            scores, positions = top_k(queries[block] @ self.vectors.T, k)
+            all_scores[block] = scores
+            all_ids[block] = self.ids[positions]
+        return all_scores, all_ids
+
+    def save(self, path):
+        """
+        Save the index as an .npz file.
+
+        Args:
+            path (str): Output path
+        """
+        np.savez(path, vectors=self.vectors, ids=self.ids)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index written by save.
+
+        Args:
+            path (str): Path to the .npz file
+
+        Returns:
+            VectorIndex: The loaded index
+        """
+        with np.load(path) as data:
+            index = cls(data['vectors'].shape[1])
+            index.vectors = data['vectors']
+            index.ids = data['ids']
+        return index
+
+
+def main():
+    """Main function to handle command-line usage."""
+    args = sys.argv[1:]
+    try:
+        k = pop_option(args, "--k", 5, int)
+        encoder_name = pop_option(args, "--encoder", "hashing")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if len(args) < 3:
+        print("Usage: python vector_index.py <vectors.npy> <chunk_file> <query> [--k N] [--encoder NAME]")
+        print("Example: python vector_index.py vectors.npy chunks.parquet \"How do I reset the device?\"")
+        print("\nThe vectors must come from embed.py or rag_pipeline.py --embed for the same")
+        print("chunk file, using the same encoder.")
+        sys.exit(1)
+
+    # Imported here so the index itself only depends on numpy
+    from embed import get_encoder
+    from load_chunks import load_chunks
+
+    vectors_path, chunk_path, query = args[0], args[1], " ".join(args[2:])
+    try:
+        index = VectorIndex.from_embeddings(vectors_path)
+        encoder = get_encoder(encoder_name)
+
+        start_time = time.perf_counter()
+        scores, ids = index.search(encoder.encode([query])[0], k)
+        elapsed = time.perf_counter() - start_time
+
+        # Chunk ids are 1-based positions in the chunk file
+        wanted = {int(chunk_id): rank for rank, chunk_id in enumerate(ids)}
+        texts = [None] * len(ids)
+        for chunk_id, chunk in enumerate(load_chunks(chunk_path), 1):
+            if chunk_id in wanted:
+                texts[wanted[chunk_id]] = chunk.text
+
+        print(f"Top {len(ids)} of {len(index)} chunks for: {query} ({elapsed * 1000:.2f} ms)\n")
+        for rank, (score, chunk_id, text) in enumerate(zip(scores, ids, texts), 1):
+            print(f"=== {rank}. Chunk {chunk_id} (score {score:.4f}) ===")
+            print(text)
+            print()
+
+    except Exception as e:
+        print(f"Error searching chunks: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
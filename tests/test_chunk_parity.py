@@ -0,0 +1,61 @@
+"""
+NativeChunker must produce exactly the chunks of the LangChain splitter it
+replaces, for any text and any chunk_size / chunk_overlap.
+"""
+
+import logging
+import random
+
+import pytest
+
+from benchmark_chunking import generate_text
+from chunk import Chunker, NativeChunker
+
+# Random (text, chunk_size, chunk_overlap) cases per seed
+CASES_PER_SEED = 250
+
+
+@pytest.fixture(autouse=True)
+def quiet_splitter():
+    # Tiny chunk sizes make LangChain warn about oversized chunks on every case
+    logging.getLogger("langchain_text_splitters").setLevel(logging.ERROR)
+
+
+def assert_same_chunks(text, chunk_size, chunk_overlap):
+    expected = Chunker(chunk_size, chunk_overlap).split(text)
+    native = NativeChunker(chunk_size, chunk_overlap)
+    assert native.split(text) == expected
+    spans = native.split_offsets(text)
+    assert list(spans) == expected
+    assert [text[start:end] for start, end in spans.spans()] == expected
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_texts(seed):
+    rng = random.Random(seed)
+    for _ in range(CASES_PER_SEED):
+        text = generate_text(rng, rng.randint(0, 600))
+        chunk_size = rng.randint(1, 200)
+        assert_same_chunks(text, chunk_size, rng.randint(0, chunk_size))
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    " ",
+    "\n\n\n",
+    "word",
+    "a\n\nb\nc d",
+    "x" * 1000,
+    "short words then " + "y" * 120 + " more words",
+    "　full　width　spaces　",
+    "line one\r\nline two\r\n\r\nparagraph two",
+    "trailing separators \n\n \n ",
+], ids=repr)
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(1, 0), (5, 5), (10, 3), (50, 0), (500, 100)])
+def test_edge_cases(text, chunk_size, chunk_overlap):
+    assert_same_chunks(text, chunk_size, chunk_overlap)
+
+
+def test_default_settings_on_long_text():
+    text = generate_text(random.Random(1), 50000, long_word_rate=0.0005)
+    assert_same_chunks(text, 500, 100)
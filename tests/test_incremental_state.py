@@ -0,0 +1,60 @@
+"""
+Incremental extraction must tell apart pages whose content streams are
+identical but which draw different XObjects.
+"""
+
+import fitz  # PyMuPDF
+import pytest
+
+from extract_pdf import PDFSession, extract_pages_incremental
+
+NUM_PAGES = 3
+
+
+def _shared_forms_pdf(path):
+    """Pages placed with show_pdf_page: each is "q /fzFrm0 Do Q" over its own form."""
+    source = fitz.open()
+    for page_num in range(NUM_PAGES):
+        source.new_page().insert_text((72, 72), f"Unique body text for source page {page_num + 1}")
+    doc = fitz.open()
+    for page_num in range(NUM_PAGES):
+        page = doc.new_page()
+        page.show_pdf_page(page.rect, source, page_num)
+    doc.save(path)
+    doc.close()
+    source.close()
+
+
+def _shared_images_pdf(path):
+    """Pages that each show their own image through an identical content stream."""
+    doc = fitz.open()
+    for page_num in range(NUM_PAGES):
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+        pixmap.set_rect(pixmap.irect, (40 * page_num, 80, 120))
+        doc.new_page().insert_image(fitz.Rect(72, 72, 144, 144), pixmap=pixmap)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture(params=[_shared_forms_pdf, _shared_images_pdf], ids=["forms", "images"])
+def shared_stream_pdf(request, tmp_path):
+    path = str(tmp_path / "shared.pdf")
+    request.param(path)
+    return path
+
+
+def test_pages_get_distinct_fingerprints(shared_stream_pdf):
+    with PDFSession(shared_stream_pdf) as session:
+        contents = {session.doc[page_index].read_contents() for page_index in range(session.page_count)}
+        fingerprints = [session.page_fingerprint(page_index) for page_index in range(session.page_count)]
+    assert len(contents) == 1
+    assert len(set(fingerprints)) == NUM_PAGES
+
+
+def test_second_run_returns_each_page_text(shared_stream_pdf):
+    with PDFSession(shared_stream_pdf) as session:
+        fresh = [session.doc[page_index].get_text() for page_index in range(session.page_count)]
+        first, _ = extract_pages_incremental(session)
+        second, changed_pages = extract_pages_incremental(session, first)
+    assert [page['text'] for page in second] == fresh
+    assert changed_pages == []
@@ -0,0 +1,43 @@
+"""
+Chunking pages as they are extracted must give the same chunks as chunking
+the whole extracted text at once.
+"""
+
+import random
+import textwrap
+
+import fitz  # PyMuPDF
+import pytest
+
+from benchmark_chunking import generate_text
+from chunk import chunk_text_content
+from extract_pdf import read_pdf_content
+from rag_pipeline import preprocess
+
+NUM_DOCUMENTS = 6
+
+
+def _random_pdf(path, rng):
+    """Pages of random words wrapped into lines, some pages nearly empty."""
+    doc = fitz.open()
+    for _ in range(rng.randint(1, 8)):
+        text = generate_text(rng, rng.choice([3, 200, 900]), rng.choice([0.0, 0.02]))
+        lines = [line for paragraph in text.split("\n") for line in textwrap.wrap(paragraph, 120)]
+        doc.new_page().insert_text((36, 36), "\n".join(lines[:100]), fontsize=6)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture(params=range(NUM_DOCUMENTS))
+def generated_pdf(request, tmp_path):
+    path = str(tmp_path / f"doc{request.param}.pdf")
+    _random_pdf(path, random.Random(request.param))
+    return path
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(50, 10), (200, 50), (500, 100)])
+def test_matches_whole_text_chunking(generated_pdf, chunk_size, chunk_overlap):
+    text = read_pdf_content(generated_pdf)
+    chunks = preprocess(generated_pdf, chunk_size, chunk_overlap)
+    assert [chunk.text for chunk in chunks] == chunk_text_content(text, chunk_size, chunk_overlap)
+    assert all(text[chunk.start:chunk.end] == chunk.text for chunk in chunks)
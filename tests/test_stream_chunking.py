@@ -0,0 +1,83 @@
+"""
+Chunking a text streamed in pieces must give exactly the chunks and offsets
+of chunking the whole text at once, wherever the pieces are cut.
+"""
+
+import logging
+import random
+
+import pytest
+
+from benchmark_chunking import generate_text
+from chunk import Chunker, NativeChunker, iter_chunk_spans
+
+# Random (text, settings, piece cuts) cases per seed
+CASES_PER_SEED = 200
+
+# Separator lists with multi-character separators sharing characters, and
+# without the final "" fallback
+SEPARATOR_SETS = [
+    ("\n\n", "\n", " ", ""),
+    ("\n\n", "\n", " "),
+    ("ab", "b", " ", ""),
+    (". ", "\n", ""),
+]
+
+
+@pytest.fixture(autouse=True)
+def quiet_splitter():
+    # Tiny chunk sizes make LangChain warn about oversized chunks on every case
+    logging.getLogger("langchain_text_splitters").setLevel(logging.ERROR)
+
+
+def random_pieces(rng, text):
+    cuts = sorted(rng.randint(0, len(text)) for _ in range(rng.randint(0, 12)))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+def assert_same_as_whole(text, pieces, chunker):
+    expected = [(text[start:end], start, end)
+                for start, end in chunker.split_offsets(text).spans()]
+    assert list(iter_chunk_spans(pieces, chunker)) == expected
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_random_texts_and_pieces(seed):
+    rng = random.Random(seed)
+    for _ in range(CASES_PER_SEED):
+        text = generate_text(rng, rng.randint(0, 800), rng.choice([0.0, 0.01, 0.2]))
+        chunk_size = rng.randint(1, 120)
+        chunker = NativeChunker(chunk_size, rng.randint(0, chunk_size))
+        assert_same_as_whole(text, random_pieces(rng, text), chunker)
+
+
+@pytest.mark.parametrize("separators", SEPARATOR_SETS, ids=repr)
+def test_custom_separators(separators):
+    rng = random.Random(7)
+    alphabet = ["a", "b", "ab", " ", ". ", "\n", "\n\n", "\t"]
+    for _ in range(CASES_PER_SEED):
+        text = "".join(rng.choice(alphabet) * rng.randint(1, 8) for _ in range(rng.randint(0, 60)))
+        chunk_size = rng.randint(1, 30)
+        chunker = NativeChunker(chunk_size, rng.randint(0, chunk_size), separators)
+        assert_same_as_whole(text, random_pieces(rng, text), chunker)
+
+
+@pytest.mark.parametrize("step", [1, 3, 500, 4096])
+def test_fixed_blocks_with_default_settings(step):
+    text = generate_text(random.Random(step), 20000, long_word_rate=0.001)
+    pieces = [text[i:i + step] for i in range(0, len(text), step)]
+    assert_same_as_whole(text, pieces, NativeChunker(500, 100))
+
+
+def test_langchain_chunker_streams_the_same_chunks():
+    text = generate_text(random.Random(3), 5000)
+    pieces = random_pieces(random.Random(4), text)
+    chunker = Chunker(300, 50)
+    assert [chunk for chunk, _, _ in iter_chunk_spans(pieces, chunker)] == chunker.split(text)
+
+
+def test_token_chunker_streams_the_same_chunks():
+    text = generate_text(random.Random(5), 3000)
+    pieces = random_pieces(random.Random(6), text)
+    chunker = Chunker(64, 16, tokenizer="words")
+    assert [chunk for chunk, _, _ in iter_chunk_spans(pieces, chunker)] == chunker.split(text)